@@ -0,0 +1,107 @@
+import sys
+import time
+import asyncio
+import argparse
+from app.database import close_database
+from app.repository.index_registry import IndexRegistry
+from app.repository.conversation_repository import ConversationRepository
+from app.utils.hashing import PasswordHasher
+
+
+async def ensure_indexes(args):
+    result = await IndexRegistry.apply()
+    for name in result["ensured"]:
+        print("ok     ", name)
+    for name in result["failed"]:
+        print("failed ", name)
+    return 1 if result["failed"] else 0
+
+
+async def report_indexes(args):
+    report = await IndexRegistry.report()
+    problems = 0
+    for collection, entry in report.items():
+        for name in entry["missing"]:
+            print(f"missing    {collection}.{name}")
+        for name in entry["undeclared"]:
+            print(f"undeclared {collection}.{name}")
+        for name in entry["unused"]:
+            print(f"unused     {collection}.{name}")
+        problems += len(entry["missing"])
+    return 1 if problems else 0
+
+
+async def rebuild_conversations(args):
+    count = await ConversationRepository.rebuild()
+    print(f"rebuilt {count} conversations")
+    return 0
+
+
+async def measure_loop_lag(work, interval=0.01):
+    """Runs work() while a ticker records how late each wake-up is; returns (elapsed, lags)."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(time.perf_counter() - expected, 0.0))
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await task
+    return elapsed, sorted(lags) or [0.0]
+
+
+async def bench_hashing(args):
+    PasswordHasher.ROUNDS = args.rounds
+    stored = PasswordHasher.hash_sync("correct horse battery staple")
+
+    async def inline():
+        for _ in range(args.logins):
+            PasswordHasher.verify_sync("correct horse battery staple", stored)
+            await asyncio.sleep(0)
+
+    async def pooled():
+        await asyncio.gather(*(PasswordHasher.verify("correct horse battery staple", stored) for _ in range(args.logins)))
+
+    print(f"{args.logins} concurrent logins, bcrypt rounds {args.rounds}, {PasswordHasher.MAX_WORKERS} hash workers")
+    for label, work in (("event loop", inline), ("thread pool", pooled)):
+        elapsed, lags = await measure_loop_lag(work)
+        p99 = lags[min(int(len(lags) * 0.99), len(lags) - 1)]
+        print(f"{label:12} {elapsed:7.2f}s  {args.logins / elapsed:7.1f} logins/s  "
+              f"loop lag p50 {lags[len(lags) // 2] * 1000:7.1f}ms  p99 {p99 * 1000:7.1f}ms  max {lags[-1] * 1000:7.1f}ms")
+    PasswordHasher.shutdown()
+    return 0
+
+
+COMMANDS = {
+    "ensure-indexes": ensure_indexes,
+    "index-report": report_indexes,
+    "rebuild-conversations": rebuild_conversations,
+    "bench-hashing": bench_hashing,
+}
+
+
+async def run(args):
+    try:
+        return await COMMANDS[args.command](args)
+    finally:
+        await close_database()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="MatchWise maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--logins", type=int, default=50, help="bench-hashing: concurrent logins to simulate")
+    parser.add_argument("--rounds", type=int, default=PasswordHasher.ROUNDS, help="bench-hashing: bcrypt cost factor")
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Response, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Response, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+from gridfs.errors import NoFile
 from typing import Optional, List
 from app.services.application_service import ApplicationService
 from app.services.job_service import JobService
 from app.utils.response import api_response
+from app.utils.pagination import InvalidCursor, page_headers
+from app.utils.projection import InvalidFields
+from app.utils.resume_parser import ResumeTooLargeError
+from app.services.resume_storage import ResumeStorageConflictError
+from app.utils.http_range import parse_range, content_type_for, content_disposition, http_date, is_not_modified, RangeNotSatisfiable
 from bson import ObjectId
 import json
 from app.middleware.auth_middleware import require_auth
@@ -47,6 +54,10 @@ async def create_application(
         raise
     except json.JSONDecodeError:
         raise HTTPException(400, "Invalid JSON format for answers")
+    except ResumeTooLargeError as e:
+        raise HTTPException(413, str(e))
+    except ResumeStorageConflictError as e:
+        raise HTTPException(409, str(e))
     except Exception as e:
         raise HTTPException(500, f"Error creating application: {str(e)}")
 
@@ -68,6 +79,23 @@ async def get_application(application_id: str):
         raise HTTPException(500, f"Error fetching application: {str(e)}")
 
 
+@router.get("/{application_id}/match-status/", dependencies=[Depends(require_auth())])
+async def get_match_status(application_id: str):
+    try:
+        if not ObjectId.is_valid(application_id):
+            raise HTTPException(400, "Invalid application ID")
+
+        status = await ApplicationService.get_match_status(application_id)
+        if not status:
+            raise HTTPException(404, "Application not found")
+
+        return api_response(200, "Match status retrieved", status)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Error fetching match status: {str(e)}")
+
+
 @router.patch("/{application_id}/", dependencies=[Depends(require_auth())])
 async def update_application_status(application_id: str, payload: dict):
     try:
@@ -95,23 +123,86 @@ async def update_application_status(application_id: str, payload: dict):
 
 
 @router.get("/resume/{file_id}/", dependencies=[Depends(require_auth())])
-async def get_resume(file_id: str):
+async def get_resume(file_id: str, request: Request):
     try:
         if not ObjectId.is_valid(file_id):
             raise HTTPException(400, "Invalid file ID")
 
-        data, filename, content_type = await ApplicationService.get_resume(file_id)
+        grid_out = await ApplicationService.open_resume(file_id)
+    except HTTPException:
+        raise
+    except NoFile:
+        raise HTTPException(404, "Resume not found")
+    except Exception as e:
+        raise HTTPException(500, f"Error fetching resume: {str(e)}")
+
+    return resume_response(grid_out, file_id, grid_out.filename, request)
 
-        return Response(
-            content=data,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+
+@router.get("/{application_id}/resume/", dependencies=[Depends(require_auth())])
+async def get_application_resume(application_id: str, request: Request):
+    try:
+        if not ObjectId.is_valid(application_id):
+            raise HTTPException(400, "Invalid application ID")
+
+        grid_out, filename = await ApplicationService.open_application_resume(application_id)
+        if not grid_out:
+            raise HTTPException(404, "Resume not found")
+    except HTTPException:
+        raise
+    except NoFile:
+        raise HTTPException(404, "Resume not found")
     except Exception as e:
         raise HTTPException(500, f"Error fetching resume: {str(e)}")
 
+    return resume_response(grid_out, str(grid_out._id), filename, request)
+
+
+def resume_response(grid_out, file_id: str, filename: str, request: Request):
+    size = grid_out.length
+    etag = f'"{(grid_out.metadata or {}).get("sha256") or file_id}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=3600",
+        "Content-Disposition": content_disposition(filename or "resume")
+    }
+    if grid_out.upload_date:
+        headers["Last-Modified"] = http_date(grid_out.upload_date)
+
+    if is_not_modified(
+        request.headers.get("If-None-Match"),
+        request.headers.get("If-Modified-Since"),
+        etag,
+        grid_out.upload_date
+    ):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(max(0, end - start + 1))
+
+    return StreamingResponse(
+        ApplicationService.iter_resume(grid_out, start, end),
+        status_code=status_code,
+        media_type=content_type_for(filename or grid_out.filename),
+        headers=headers
+    )
+
 
 @router.post("/{application_id}/notes/", dependencies=[Depends(require_auth(["recruiter"]))])
 async def add_note(application_id: str, payload: dict):
@@ -138,24 +229,45 @@ async def add_note(application_id: str, payload: dict):
         raise HTTPException(500, f"Error adding note: {str(e)}")
 
 
+@router.get("/{application_id}/notes/", dependencies=[Depends(require_auth(["recruiter"]))])
+async def get_notes(application_id: str, offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1)):
+    try:
+        if not ObjectId.is_valid(application_id):
+            raise HTTPException(400, "Invalid application ID")
+
+        notes = await ApplicationService.get_notes(application_id, offset, limit)
+        if notes is None:
+            raise HTTPException(404, "Application not found")
+
+        return api_response(200, "Notes retrieved", notes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Error fetching notes: {str(e)}")
+
+
 @router.get("/job/{job_id}/", dependencies=[Depends(require_auth(["recruiter"]))])
-async def get_job_applications(job_id: str):
+async def get_job_applications(job_id: str, cursor: Optional[str] = None, limit: Optional[int] = Query(None, ge=1), fields: Optional[str] = None):
     try:
         if not ObjectId.is_valid(job_id):
             raise HTTPException(400, "Invalid job ID")
 
-        applications = await ApplicationService.get_applications_by_job(job_id)
-        return api_response(200, "Applications retrieved", applications)
+        applications = await ApplicationService.get_applications_by_job(job_id, limit, cursor, fields)
+        return api_response(200, "Applications retrieved", applications, headers=page_headers(applications))
     except HTTPException:
         raise
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"Error fetching applications: {str(e)}")
 
 
 @router.get("/jobseeker/{jobseeker_id}/", dependencies=[Depends(require_auth(["jobseeker"]))])
-async def get_applications_by_jobseeker(jobseeker_id: str):
+async def get_applications_by_jobseeker(jobseeker_id: str, cursor: Optional[str] = None, limit: Optional[int] = Query(None, ge=1), fields: Optional[str] = None):
     try:
-        applications = await ApplicationService.get_applications_by_jobseeker(jobseeker_id)
-        return api_response(200, "Applications retrieved", applications)
+        applications = await ApplicationService.get_applications_by_jobseeker(jobseeker_id, limit, cursor, fields)
+        return api_response(200, "Applications retrieved", applications, headers=page_headers(applications))
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"Error fetching applications: {str(e)}")
\ No newline at end of file
@@ -1,14 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from app.schemas.auth_schema import LoginRequest
 from app.services.user_service import UserService
 from app.utils.response import api_response
+from app.utils.hashing import PasswordHasherBusyError
 from app.utils.jwt_utils import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/login")
 async def login(credentials: LoginRequest):
-    result = await UserService.login(credentials.email, credentials.password)
+    try:
+        result = await UserService.login(credentials.email, credentials.password)
+    except PasswordHasherBusyError as e:
+        raise HTTPException(503, str(e))
 
     if not result:
         return api_response(401, "Invalid email or password", None)
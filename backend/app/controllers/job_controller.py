@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
 from app.schemas.job_schema import JobCreateRequest, JobUpdateStatusRequest, FilterRequest
 from app.services.job_service import JobService
 from app.services.user_service import UserService
 from app.utils.response import api_response
+from app.utils.pagination import InvalidCursor, page_headers
+from app.utils.projection import InvalidFields
 from app.middleware.auth_middleware import require_auth
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -24,10 +27,18 @@ async def update_job_status(payload: JobUpdateStatusRequest):
 
     return api_response(200, "Job status updated successfully", updated_job)
 
+@router.get("/autocomplete", dependencies=[Depends(require_auth())])
+async def autocomplete_jobs(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=25)):
+    suggestions = await JobService.autocomplete(q, limit)
+    return api_response(200, "Job suggestions", suggestions)
+
 @router.get("/{recruiter_id}", dependencies=[Depends(require_auth(["recruiter"]))])
-async def get_jobs_by_recruiter(recruiter_id: str):
-    jobs = await JobService.get_jobs_by_recruiter(recruiter_id)
-    return api_response(200, "Jobs retrieved successfully", jobs)
+async def get_jobs_by_recruiter(recruiter_id: str, cursor: Optional[str] = None, limit: Optional[int] = Query(None, ge=1), fields: Optional[str] = None):
+    try:
+        jobs = await JobService.get_jobs_by_recruiter(recruiter_id, limit, cursor, fields)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return api_response(200, "Jobs retrieved successfully", jobs, headers=page_headers(jobs))
 
 @router.get("/job/{job_id}", dependencies=[Depends(require_auth())])
 async def get_job_by_id(job_id: str):
@@ -38,14 +49,29 @@ async def get_job_by_id(job_id: str):
     return api_response(200, "Job retrieved successfully", job)
 
 @router.post("/search", dependencies=[Depends(require_auth())])
-async def search_jobs(filters: FilterRequest):
-    result = await JobService.search_jobs(filters)
+async def search_jobs(filters: FilterRequest, fields: Optional[str] = None):
+    try:
+        result = await JobService.search_jobs(filters, fields)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return api_response(200, "Job search results", result)
 
 @router.get("/{job_id}/top-candidates", dependencies=[Depends(require_auth(["recruiter"]))])
-async def top_candidates(job_id: str):
+async def top_candidates(
+    job_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    status: Optional[str] = None,
+    fields: Optional[str] = None
+):
     try:
-        candidates = await JobService.get_top_candidates(job_id)
-        return api_response(200, "Top candidates retrieved", candidates)
+        ranking = await JobService.get_top_candidates(job_id, limit, min_score, status and status.upper(), fields)
+        if ranking is None:
+            raise HTTPException(404, "Job not found")
+        return api_response(200, "Top candidates retrieved", ranking)
+    except HTTPException:
+        raise
+    except InvalidFields as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"Error ranking candidates: {str(e)}")
\ No newline at end of file
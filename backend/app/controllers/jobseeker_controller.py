@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from app.schemas.auth_schema import JobSeekerRegisterRequest, JobSeekerUpdateRequest
 from app.services.user_service import UserService
 from app.utils.response import api_response
+from app.utils.hashing import PasswordHasherBusyError
 from bson import ObjectId
 from app.middleware.auth_middleware import require_auth
 
@@ -15,6 +16,8 @@ async def register_jobseeker(payload: JobSeekerRegisterRequest):
         return api_response(201, "JobSeeker registered successfully", user)
     except ValueError as e:
         raise HTTPException(400, str(e))
+    except PasswordHasherBusyError as e:
+        raise HTTPException(503, str(e))
 
 
 @router.get("/{jobseeker_id}", dependencies=[Depends(require_auth())])
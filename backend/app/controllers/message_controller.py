@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException, Body, Depends
-from app.schemas.message_schema import MessageSchema
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Body, Depends, Query, WebSocket, WebSocketDisconnect, status
+from app.schemas.message_schema import MessageSchema, BulkMessageSchema
 from app.services.message_service import MessageService
 from app.utils.response import api_response
-from app.middleware.auth_middleware import require_auth
+from app.utils.pagination import InvalidCursor, page_headers
+from app.middleware.auth_middleware import require_auth, authenticate_websocket
+from app.services.connection_registry import ConnectionRegistry
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
@@ -14,11 +18,27 @@ async def send_message(payload: MessageSchema):
     except Exception as e:
         raise HTTPException(500, f"Error sending message: {str(e)}")
 
+@router.post("/bulk", dependencies=[Depends(require_auth(["recruiter"]))])
+async def send_bulk_messages(payload: BulkMessageSchema):
+    try:
+        outcome = await MessageService.send_bulk(payload.dict())
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        raise HTTPException(500, f"Error sending messages: {str(e)}")
+
+    if outcome["failed"]:
+        return api_response(207, "Some messages could not be sent", outcome)
+    return api_response(201, "Messages sent", outcome)
+
 @router.get("/{user1}/{user2}", dependencies=[Depends(require_auth())])
-async def get_conversation(user1: str, user2: str):
+async def get_conversation(user1: str, user2: str, before: Optional[str] = None, after: Optional[str] = None,
+                           limit: Optional[int] = Query(None, ge=1)):
     try:
-        msgs = await MessageService.get_conversation(user1, user2)
-        return api_response(200, "Conversation retrieved", msgs)
+        msgs = await MessageService.get_conversation(user1, user2, limit, before, after)
+        return api_response(200, "Conversation retrieved", msgs, headers=page_headers(msgs))
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         raise HTTPException(500, f"Error retrieving conversation: {str(e)}")
 
@@ -44,4 +64,32 @@ async def mark_as_read(payload: dict = Body(...)):
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(500, f"Error marking messages as read: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Error marking messages as read: {str(e)}")
+
+@router.websocket("/ws")
+async def message_socket(websocket: WebSocket):
+    user = authenticate_websocket(websocket)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    user_id = user["user_id"]
+    await websocket.accept()
+    ConnectionRegistry.connect(user_id, websocket)
+    try:
+        while True:
+            try:
+                incoming = json.loads(await websocket.receive_text())
+            except (ValueError, KeyError):
+                # Not JSON, or a binary frame, which has no text to decode
+                await websocket.send_json({"type": "error", "message": "Frames must be JSON text"})
+                continue
+            if not isinstance(incoming, dict):
+                await websocket.send_json({"type": "error", "message": "Frames must be JSON objects"})
+                continue
+            if incoming.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ConnectionRegistry.disconnect(user_id, websocket)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from app.services.match_cache import MatchCache
+from app.services.job_cache import JobCache
+from app.services.message_backplane import MessageEvents
+from app.services.llm_service import LLMService
+from app.utils.hashing import PasswordHasher
+from app.utils.response import api_response
+from app.middleware.auth_middleware import require_auth
+
+router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+
+@router.get("/match-cache", dependencies=[Depends(require_auth())])
+async def match_cache_stats():
+    return api_response(200, "Match cache statistics", MatchCache.stats())
+
+@router.get("/job-cache", dependencies=[Depends(require_auth())])
+async def job_cache_stats():
+    return api_response(200, "Job cache statistics", JobCache.stats())
+
+@router.get("/realtime", dependencies=[Depends(require_auth())])
+async def realtime_stats():
+    return api_response(200, "Real-time messaging statistics", MessageEvents.stats())
+
+@router.get("/hashing", dependencies=[Depends(require_auth())])
+async def hashing_stats():
+    return api_response(200, "Password hashing statistics", PasswordHasher.stats())
+
+@router.get("/providers", dependencies=[Depends(require_auth())])
+async def provider_health():
+    return api_response(200, "Provider health", LLMService.instance().health())
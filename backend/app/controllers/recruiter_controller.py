@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.services.user_service import UserService
 from app.utils.response import api_response
+from app.utils.hashing import PasswordHasherBusyError
 from app.schemas.note_schema import ApplicationNoteSchema
 from app.services.application_service import ApplicationService
 from app.schemas.auth_schema import RecruiterRegisterRequest
@@ -15,6 +16,8 @@ async def register_recruiter(payload: RecruiterRegisterRequest):
         return api_response(201, "Recruiter registered successfully", user)
     except ValueError as e:
         raise HTTPException(400, str(e))
+    except PasswordHasherBusyError as e:
+        raise HTTPException(503, str(e))
 
 @router.post("/applications/{application_id}/notes", dependencies=[Depends(require_auth(["recruiter"]))])
 async def add_note(application_id: str, payload: dict):
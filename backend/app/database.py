@@ -1,11 +1,14 @@
 import os
+import asyncio
+import importlib.util
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
+from pymongo.read_preferences import SecondaryPreferred, Nearest
 from dotenv import load_dotenv
 from pathlib import Path
 
 
-BASE_DIR = Path(__file__).resolve().parent.parent  
+BASE_DIR = Path(__file__).resolve().parent.parent
 ENV_PATH = BASE_DIR / ".env"
 
 load_dotenv(ENV_PATH)
@@ -13,21 +16,113 @@ load_dotenv(ENV_PATH)
 MONGODB_URL = os.getenv("MONGO_DB_URI")
 DATABASE_NAME = os.getenv("DATABASE_NAME")
 
+MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+APP_NAME = os.getenv("MONGO_APP_NAME", "matchwise-api")
+
+# Reads flagged stale_ok may be served by a secondary lagging at most this far
+STALE_READS_ENABLED = os.getenv("MONGO_STALE_READS_ENABLED", "true").lower() == "true"
+STALE_READ_MODE = os.getenv("MONGO_STALE_READ_MODE", "secondaryPreferred")
+STALE_READ_MODES = {"secondaryPreferred": SecondaryPreferred, "nearest": Nearest}
+# The smallest maxStalenessSeconds pymongo accepts
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def max_staleness_seconds(requested: int):
+    if requested < MIN_MAX_STALENESS_SECONDS:
+        print(f"MONGO_MAX_STALENESS_SECONDS={requested} is below the {MIN_MAX_STALENESS_SECONDS}s "
+              f"minimum MongoDB allows; using {MIN_MAX_STALENESS_SECONDS}s")
+        return MIN_MAX_STALENESS_SECONDS
+    return requested
+
+
+MAX_STALENESS_SECONDS = max_staleness_seconds(int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90")))
+
+# Compressors that need an optional package are only offered when it is installed
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": None}
+
 async_client = None
 database = None
 
+
+def available_compressors(requested: str = COMPRESSORS):
+    names = []
+    for name in (n.strip() for n in requested.split(",")):
+        if name not in COMPRESSOR_MODULES:
+            continue
+        module = COMPRESSOR_MODULES[name]
+        if module is None or importlib.util.find_spec(module) is not None:
+            names.append(name)
+    return names
+
+
+def client_options():
+    options = {
+        "maxPoolSize": MAX_POOL_SIZE,
+        "minPoolSize": MIN_POOL_SIZE,
+        "maxIdleTimeMS": MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": SOCKET_TIMEOUT_MS,
+        "waitQueueTimeoutMS": WAIT_QUEUE_TIMEOUT_MS,
+        "readPreference": READ_PREFERENCE,
+        "appname": APP_NAME,
+    }
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+
 async def get_database():
     global async_client, database
     if async_client is None:
-        async_client = AsyncIOMotorClient(MONGODB_URL)
+        async_client = AsyncIOMotorClient(MONGODB_URL, **client_options())
         database = async_client[DATABASE_NAME]
     return database
 
+
+def stale_read_preference():
+    mode = STALE_READ_MODES.get(STALE_READ_MODE, SecondaryPreferred)
+    return mode(max_staleness=MAX_STALENESS_SECONDS)
+
+
+async def get_collection(name: str, stale_ok: bool = False):
+    """
+    Returns a collection handle for one query. Writes and read-your-writes
+    paths use the default (primary) handle; list and search reads that
+    tolerate replication lag pass stale_ok=True to go to a secondary.
+    """
+    db = await get_database()
+    if not stale_ok or not STALE_READS_ENABLED:
+        return db[name]
+    return db.get_collection(name, read_preference=stale_read_preference())
+
+
+async def connect_database():
+    """
+    Creates the client at startup and opens MIN_POOL_SIZE connections with
+    concurrent pings, so the first requests after a deploy find a warm pool.
+    """
+    db = await get_database()
+    try:
+        await asyncio.gather(*(db.command("ping") for _ in range(max(MIN_POOL_SIZE, 1))))
+        print(f"Connected to MongoDB database {DATABASE_NAME} (pool {MIN_POOL_SIZE}-{MAX_POOL_SIZE})")
+    except Exception as e:
+        print("Could not warm MongoDB connection pool:", e)
+    return db
+
+
 async def close_database():
-    global async_client
+    global async_client, database
     if async_client:
         async_client.close()
         async_client = None
-
-print("Connected to MongoDB at", MONGODB_URL)
-print("Using database:", DATABASE_NAME)
\ No newline at end of file
+        database = None
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,11 +9,45 @@ from app.controllers.job_controller import router as job_router
 from app.controllers.application_controller import router as application_router
 from app.controllers.user_controller import router as user_router
 from app.controllers.message_controller import router as message_router
+from app.controllers.monitoring_controller import router as monitoring_router
 from app.utils.response import api_response
+from app.database import connect_database, close_database
+from app.utils.http_client import HttpClientPool
+from app.services.match_worker import MatchWorker
+from app.utils.resume_parser import ResumeParser
+from app.utils.hashing import PasswordHasher
+from app.services.job_service import JobService
+from app.services.message_service import MessageService
+from app.services.job_cache import JobCache
+from app.services.message_backplane import MessageEvents
+from app.repository.index_registry import IndexRegistry
+from app.middleware.request_cache_middleware import RequestCacheMiddleware
 
-app = FastAPI(title="MatchWise", version="1.0.0")
 
-app.add_middleware( CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"], )
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_database()
+    await HttpClientPool.startup()
+    await IndexRegistry.ensure()
+    await JobService.ensure_search_support()
+    await MessageService.ensure_conversations()
+    await JobCache.start()
+    await MessageEvents.start()
+    await MatchWorker.start()
+    yield
+    await MatchWorker.stop()
+    await JobCache.stop()
+    await MessageEvents.stop()
+    ResumeParser.shutdown()
+    PasswordHasher.shutdown()
+    await HttpClientPool.shutdown()
+    await close_database()
+
+
+app = FastAPI(title="MatchWise", version="1.0.0", lifespan=lifespan)
+
+app.add_middleware(RequestCacheMiddleware)
+app.add_middleware( CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"], expose_headers=["X-Next-Cursor", "X-Prev-Cursor"], )
 
 app.include_router(job_router)
 app.include_router(auth_router)
@@ -21,6 +56,7 @@ app.include_router(jobseeker_router)
 app.include_router(application_router)
 app.include_router(user_router)
 app.include_router(message_router)
+app.include_router(monitoring_router)
 
 @app.get("/")
 async def root():
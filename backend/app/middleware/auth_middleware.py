@@ -1,5 +1,5 @@
 import os
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, WebSocket
 from app.utils.jwt_utils import verify_token
 
 def require_auth(allowed_roles: list = None):
@@ -28,4 +28,22 @@ def require_auth(allowed_roles: list = None):
         request.state.user = payload
         return payload
     
-    return auth_dependency
\ No newline at end of file
+    return auth_dependency
+
+
+def authenticate_websocket(websocket: WebSocket):
+    """
+    Browsers cannot set headers on a WebSocket handshake, so the token
+    comes in the ?token= query parameter. Returns None when it is invalid.
+    """
+    if os.getenv("TESTING") == "true":
+        return {
+            "user_id": websocket.query_params.get("user_id", "test_user_123"),
+            "email": "test@example.com",
+            "role": "recruiter"
+        }
+
+    token = websocket.query_params.get("token")
+    if not token:
+        return None
+    return verify_token(token)
@@ -0,0 +1,21 @@
+from app.utils.request_cache import RequestCache
+
+
+class RequestCacheMiddleware:
+    """
+    Opens a fresh RequestCache for every HTTP request. Written as plain ASGI
+    so the endpoint runs in the same context the cache was set in.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = RequestCache.begin()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            RequestCache.end(token)
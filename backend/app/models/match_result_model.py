@@ -4,8 +4,13 @@ from datetime import datetime
 class MatchResult:
     """
     Represents AI-based compatibility evaluation stored inside Application.
+    Matches run in the background, so the stored dict carries a status.
     """
 
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
     def __init__(
         self,
         score: float,
@@ -36,3 +41,31 @@ class MatchResult:
             "model": self.model,
             "generated_at": self.generated_at,
         }
+
+    @classmethod
+    def pending(cls):
+        return {
+            "status": cls.PENDING,
+            "score": None,
+            "matched_skills": [],
+            "missing_skills": [],
+            "transferable_skills": [],
+            "explanation": None,
+            "provider": None,
+            "model": None,
+            "generated_at": None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        result = cls(
+            score=data["score"],
+            matched_skills=data["matched_skills"],
+            missing_skills=data["missing_skills"],
+            transferable_skills=data["transferable_skills"],
+            explanation=data["explanation"],
+            provider=data["provider"],
+            model=data["model"],
+        )
+        result.generated_at = data.get("generated_at") or result.generated_at
+        return result
@@ -1,9 +1,27 @@
 from bson import ObjectId
-from app.database import get_database
+from datetime import datetime
+from pymongo import ReturnDocument
+from app.database import get_database, get_collection
+from app.utils.pagination import with_cursor, sort_spec
+from app.utils.projection import include
 from typing import Optional, Dict, Any, List
 
 class ApplicationRepository:
-    
+
+    # List views never need the resume body, answers or recruiter notes
+    SUMMARY_PROJECTION = include(
+        "job_id", "jobseeker_id", "application_status", "resume_file_id", "resume_filename",
+        "match_result.score", "match_result.status", "created_at", "updated_at"
+    )
+    DETAIL_PROJECTION = {"resume_text": 0}
+    MATCH_PROJECTION = {"match_result": 1}
+    RESUME_PROJECTION = {"resume_file_id": 1, "resume_filename": 1}
+    FIELDS = {
+        "job_id", "jobseeker_id", "application_status", "resume_file_id", "resume_filename",
+        "questions", "answers", "notes", "match_result", "match_result.score",
+        "match_result.status", "created_at", "updated_at"
+    }
+
     @staticmethod
     async def insert_one(application_data: Dict[str, Any]) -> Any:
         db = await get_database()
@@ -11,11 +29,11 @@ class ApplicationRepository:
         return result.inserted_id
     
     @staticmethod
-    async def find_by_id(application_id: str) -> Optional[Dict[str, Any]]:
+    async def find_by_id(application_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         db = await get_database()
         if not ObjectId.is_valid(application_id):
             return None
-        return await db.applications.find_one({"_id": ObjectId(application_id)})
+        return await db.applications.find_one({"_id": ObjectId(application_id)}, projection)
     
     @staticmethod
     async def update_by_id(application_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -30,17 +48,157 @@ class ApplicationRepository:
         return result
     
     @staticmethod
-    async def find_by_job_id(job_id: str) -> List[Dict[str, Any]]:
+    async def find_by_job_id(job_id: str, limit: int = 0, cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         db = await get_database()
-        cursor = db.applications.find({"job_id": job_id})
-        return [app async for app in cursor]
+        query = with_cursor({"job_id": job_id}, "created_at", -1, cursor)
+        projection = projection or ApplicationRepository.SUMMARY_PROJECTION
+        docs = db.applications.find(query, projection).sort(sort_spec("created_at", -1)).limit(limit)
+        return [app async for app in docs]
     
     @staticmethod
-    async def find_by_jobseeker_id(jobseeker_id: str) -> List[Dict[str, Any]]:
+    async def find_by_jobseeker_id(jobseeker_id: str, limit: int = 0, cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         db = await get_database()
-        cursor = db.applications.find({"jobseeker_id": jobseeker_id}).sort("created_at", -1)
-        return [app async for app in cursor]
+        query = with_cursor({"jobseeker_id": jobseeker_id}, "created_at", -1, cursor)
+        projection = projection or ApplicationRepository.SUMMARY_PROJECTION
+        docs = db.applications.find(query, projection).sort(sort_spec("created_at", -1)).limit(limit)
+        return [app async for app in docs]
     
+    @staticmethod
+    async def rank_by_job_id(job_id: str, limit: int, boundaries: List[float], min_score: Optional[float] = None,
+                             status: Optional[str] = None, projection: Optional[Dict[str, Any]] = None,
+                             stale_ok: bool = False) -> Dict[str, Any]:
+        """
+        Returns the top candidates (all of them when limit is 0) together
+        with the score distribution in one round trip. The histogram and summary cover every scored
+        application matching the status filter, not just the top slice.
+        """
+        match = {"job_id": job_id}
+        if status:
+            match["application_status"] = status
+
+        top = []
+        if min_score is not None:
+            top.append({"$match": {"match_result.score": {"$gte": min_score}}})
+        top.append({"$sort": {"match_result.score": -1, "created_at": -1, "_id": -1}})
+        if limit:
+            top.append({"$limit": limit})
+        top.append({"$project": projection or ApplicationRepository.SUMMARY_PROJECTION})
+        scored = {"$match": {"match_result.score": {"$type": "number"}}}
+
+        pipeline = [
+            {"$match": match},
+            {"$facet": {
+                "candidates": top,
+                "histogram": [
+                    scored,
+                    {"$bucket": {
+                        "groupBy": "$match_result.score",
+                        "boundaries": boundaries,
+                        "default": "out_of_range",
+                        "output": {"count": {"$sum": 1}}
+                    }}
+                ],
+                "summary": [
+                    scored,
+                    {"$group": {
+                        "_id": None,
+                        "scored": {"$sum": 1},
+                        "mean": {"$avg": "$match_result.score"},
+                        "min": {"$min": "$match_result.score"},
+                        "max": {"$max": "$match_result.score"}
+                    }}
+                ],
+                "total": [{"$count": "count"}]
+            }}
+        ]
+        applications = await get_collection("applications", stale_ok)
+        result = await applications.aggregate(pipeline).to_list(1)
+        return result[0] if result else {"candidates": [], "histogram": [], "summary": [], "total": []}
+
+    @staticmethod
+    async def find_submitted(job_id: str, jobseeker_id: str) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        return await db.applications.find_one(
+            {"job_id": job_id, "jobseeker_id": jobseeker_id, "application_status": {"$ne": "PENDING"}},
+            {"_id": 1}
+        )
+
+    @staticmethod
+    async def upsert_pending(job_id: str, jobseeker_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Writes the application over a PENDING one for the same job and
+        jobseeker, or inserts it. Returns the replaced document, or None
+        when a new one was inserted under fields["_id"]. If a non-PENDING
+        application exists, the upsert's insert violates the unique
+        (job_id, jobseeker_id) index and DuplicateKeyError is raised.
+        """
+        db = await get_database()
+        fields = dict(fields)
+        new_id = fields.pop("_id")
+        return await db.applications.find_one_and_update(
+            {"job_id": job_id, "jobseeker_id": jobseeker_id, "application_status": "PENDING"},
+            {"$set": fields, "$setOnInsert": {"_id": new_id}},
+            projection={"resume_file_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+
+    @staticmethod
+    async def push_note(application_id: str, note: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        if not ObjectId.is_valid(application_id):
+            return None
+        return await db.applications.find_one_and_update(
+            {"_id": ObjectId(application_id)},
+            {"$push": {"notes": note}, "$set": {"updated_at": datetime.utcnow()}},
+            projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def pull_note(application_id: str, note_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        if not ObjectId.is_valid(application_id):
+            return None
+        return await db.applications.find_one_and_update(
+            {"_id": ObjectId(application_id), "notes.note_id": note_id},
+            {"$pull": {"notes": {"note_id": note_id}}, "$set": {"updated_at": datetime.utcnow()}},
+            projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def set_note(application_id: str, note_id: str, text: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        if not ObjectId.is_valid(application_id):
+            return None
+        now = datetime.utcnow()
+        return await db.applications.find_one_and_update(
+            {"_id": ObjectId(application_id), "notes.note_id": note_id},
+            {"$set": {"notes.$.note": text, "notes.$.updated_at": now, "updated_at": now}},
+            projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def find_notes(application_id: str, offset: int, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Returns one page of notes, newest first, plus the total count,
+        without loading the rest of the application.
+        """
+        db = await get_database()
+        if not ObjectId.is_valid(application_id):
+            return None
+        result = await db.applications.aggregate([
+            {"$match": {"_id": ObjectId(application_id)}},
+            {"$project": {
+                "_id": 0,
+                "total": {"$size": {"$ifNull": ["$notes", []]}},
+                "notes": {"$slice": [{"$reverseArray": {"$ifNull": ["$notes", []]}}, offset, limit]}
+            }}
+        ]).to_list(1)
+        return result[0] if result else None
+
     @staticmethod
     async def find_one(query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         db = await get_database()
@@ -0,0 +1,135 @@
+from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from app.database import get_database, get_collection
+from typing import Dict, Any, List, Optional
+
+class ConversationRepository:
+    """
+    One summary document per pair of users, kept current by the message
+    writes: participants, the last message and an unread counter per
+    participant (unread.<user_id>). Inbox listings read it through the
+    conversations_participant_last index instead of scanning messages.
+    """
+
+    @staticmethod
+    def conversation_id(user1: str, user2: str) -> str:
+        return ":".join(sorted((user1, user2)))
+
+    @staticmethod
+    def record_message(message: Dict[str, Any]) -> Dict[str, Any]:
+        sender_id, receiver_id = message["sender_id"], message["receiver_id"]
+        return {
+            "filter": {"_id": ConversationRepository.conversation_id(sender_id, receiver_id)},
+            "update": {
+                "$set": {
+                    "participants": sorted((sender_id, receiver_id)),
+                    "last_message": message["content"],
+                    "last_sender_id": sender_id,
+                    "last_message_at": message["created_at"]
+                },
+                "$inc": {f"unread.{receiver_id}": 1, f"unread.{sender_id}": 0}
+            }
+        }
+
+    @staticmethod
+    async def record(message: Dict[str, Any]) -> None:
+        db = await get_database()
+        op = ConversationRepository.record_message(message)
+        await db.conversations.update_one(op["filter"], op["update"], upsert=True)
+
+    @staticmethod
+    async def record_many(messages: List[Dict[str, Any]]) -> int:
+        """Applies the summary updates for a batch in one bulk write; returns how many failed."""
+        db = await get_database()
+        ops = [UpdateOne(op["filter"], op["update"], upsert=True) for op in map(ConversationRepository.record_message, messages)]
+        try:
+            await db.conversations.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            return len(e.details.get("writeErrors", []))
+        return 0
+
+    @staticmethod
+    async def mark_read(reader_id: str, other_id: str, count: int) -> Optional[Dict[str, Any]]:
+        """
+        Decrements by the number of messages actually flipped so concurrent
+        sends are not lost, floored at zero for messages the summary never
+        counted (sent before it existed, or whose summary write failed).
+        Pipeline updates need MongoDB 4.2+; the reader's counter is looked
+        up through $objectToArray, as $getField would need 5.0.
+        """
+        entries = {"$objectToArray": {"$ifNull": ["$unread", {}]}}
+        mine = {"$filter": {"input": entries, "cond": {"$eq": ["$$this.k", reader_id]}}}
+        current = {"$ifNull": [{"$arrayElemAt": [{"$map": {"input": mine, "in": "$$this.v"}}, 0]}, 0]}
+        remaining = {"$max": [0, {"$subtract": [current, count]}]}
+        db = await get_database()
+        return await db.conversations.find_one_and_update(
+            {"_id": ConversationRepository.conversation_id(reader_id, other_id)},
+            [{"$set": {"unread": {"$mergeObjects": [
+                {"$ifNull": ["$unread", {}]},
+                {"$arrayToObject": [[{"k": reader_id, "v": remaining}]]}
+            ]}}}],
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def find_for_user(user_id: str, stale_ok: bool = False) -> List[Dict[str, Any]]:
+        conversations = await get_collection("conversations", stale_ok)
+        cursor = conversations.find({"participants": user_id}).sort([("last_message_at", -1), ("_id", -1)])
+        return [c async for c in cursor]
+
+    @staticmethod
+    async def is_empty() -> bool:
+        db = await get_database()
+        return await db.conversations.find_one({}, {"_id": 1}) is None
+
+    @staticmethod
+    async def rebuild() -> int:
+        """
+        Recomputes every summary from the messages collection and swaps the
+        result in with $out. Messages sent while it runs may be missed, so
+        run it during a quiet period.
+        """
+        in_order = {"$lt": ["$sender_id", "$receiver_id"]}
+        pipeline = [
+            {"$sort": {"created_at": 1}},
+            {
+                "$group": {
+                    "_id": {
+                        "$cond": [
+                            in_order,
+                            {"$concat": ["$sender_id", ":", "$receiver_id"]},
+                            {"$concat": ["$receiver_id", ":", "$sender_id"]}
+                        ]
+                    },
+                    "participants": {"$first": {"$cond": [in_order, ["$sender_id", "$receiver_id"], ["$receiver_id", "$sender_id"]]}},
+                    "last_message": {"$last": "$content"},
+                    "last_sender_id": {"$last": "$sender_id"},
+                    "last_message_at": {"$last": "$created_at"},
+                    "unread_by": {"$push": {"$cond": [{"$eq": ["$isOpened", False]}, "$receiver_id", "$$REMOVE"]}}
+                }
+            },
+            {
+                "$set": {
+                    "unread": {
+                        "$arrayToObject": {
+                            "$map": {
+                                "input": "$participants",
+                                "as": "p",
+                                "in": {
+                                    "k": "$$p",
+                                    "v": {"$size": {"$filter": {"input": "$unread_by", "cond": {"$eq": ["$$this", "$$p"]}}}}
+                                }
+                            }
+                        }
+                    },
+                    "rebuilt_at": datetime.utcnow()
+                }
+            },
+            {"$unset": "unread_by"},
+            {"$out": "conversations"}
+        ]
+
+        db = await get_database()
+        await db.messages.aggregate(pipeline, allowDiskUse=True).to_list(None)
+        return await db.conversations.count_documents({})
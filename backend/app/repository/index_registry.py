@@ -0,0 +1,114 @@
+import os
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+from app.database import get_database
+from typing import Dict, Any, List
+
+
+class IndexRegistry:
+    """
+    Declares every index the repositories rely on, keyed by collection.
+    apply() is safe to run on every startup: existing indexes with the same
+    name and spec are left alone, and a conflicting or failing index is
+    reported without stopping the others from being built.
+    """
+
+    ENABLED = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
+
+    INDEXES: Dict[str, List[IndexModel]] = {
+        "users": [
+            IndexModel([("email", ASCENDING)], name="users_email_unique", unique=True),
+            IndexModel([("role", ASCENDING), ("_id", ASCENDING)], name="users_role"),
+        ],
+        "jobs": [
+            IndexModel([("recruiter_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="jobs_recruiter_created"),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="jobs_status_created"),
+            IndexModel([("status", ASCENDING), ("search_terms", ASCENDING)], name="jobs_search_terms"),
+            IndexModel(
+                [("title", TEXT), ("skills_required", TEXT), ("description", TEXT)],
+                weights={"title": 10, "skills_required": 5, "description": 1},
+                name="jobs_text_search"
+            ),
+        ],
+        "applications": [
+            IndexModel([("job_id", ASCENDING), ("jobseeker_id", ASCENDING)], name="applications_job_jobseeker_unique", unique=True),
+            IndexModel([("job_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="applications_job_created"),
+            IndexModel([("job_id", ASCENDING), ("match_result.score", DESCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="applications_job_ranking"),
+            IndexModel([("jobseeker_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="applications_jobseeker_created"),
+        ],
+        "messages": [
+            IndexModel([("sender_id", ASCENDING), ("receiver_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="messages_pair_created_id"),
+            IndexModel([("receiver_id", ASCENDING), ("created_at", DESCENDING)], name="messages_receiver_created"),
+        ],
+        "conversations": [
+            IndexModel([("participants", ASCENDING), ("last_message_at", DESCENDING), ("_id", DESCENDING)], name="conversations_participant_last"),
+        ],
+        "message_events": [
+            IndexModel([("created_at", ASCENDING)], name="message_events_ttl", expireAfterSeconds=3600),
+        ],
+        "match_jobs": [
+            IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="match_jobs_status_run_at"),
+            IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)], name="match_jobs_status_lease"),
+            IndexModel([("application_id", ASCENDING), ("created_at", DESCENDING)], name="match_jobs_application"),
+        ],
+        "match_cache": [
+            IndexModel([("expires_at", ASCENDING)], name="match_cache_ttl", expireAfterSeconds=0),
+        ],
+        "resume_blobs": [
+            IndexModel([("file_id", ASCENDING)], name="resume_blobs_file_id"),
+        ],
+    }
+
+    @staticmethod
+    async def apply() -> Dict[str, List[str]]:
+        db = await get_database()
+        created = []
+        failed = []
+
+        for collection, indexes in IndexRegistry.INDEXES.items():
+            for index in indexes:
+                name = index.document["name"]
+                try:
+                    await db[collection].create_indexes([index])
+                    created.append(f"{collection}.{name}")
+                except OperationFailure as e:
+                    failed.append(f"{collection}.{name}")
+                    print(f"Could not build index {collection}.{name}:", e)
+
+        return {"ensured": created, "failed": failed}
+
+    @staticmethod
+    async def ensure() -> None:
+        if not IndexRegistry.ENABLED:
+            return
+        try:
+            result = await IndexRegistry.apply()
+            print(f"Ensured {len(result['ensured'])} indexes, {len(result['failed'])} failed")
+        except Exception as e:
+            print("Could not provision indexes:", e)
+
+    @staticmethod
+    async def report() -> Dict[str, Any]:
+        """
+        Compares the registry with what the server has. Unused indexes are
+        the ones $indexStats has seen no operations on since the server
+        last restarted.
+        """
+        db = await get_database()
+        report = {}
+
+        for collection, indexes in IndexRegistry.INDEXES.items():
+            declared = {index.document["name"] for index in indexes}
+            stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(None)
+            existing = {stat["name"]: stat for stat in stats}
+
+            report[collection] = {
+                "missing": sorted(declared - existing.keys()),
+                "undeclared": sorted(name for name in existing if name not in declared and name != "_id_"),
+                "unused": sorted(
+                    name for name, stat in existing.items()
+                    if name != "_id_" and stat.get("accesses", {}).get("ops", 0) == 0
+                )
+            }
+
+        return report
@@ -1,9 +1,21 @@
 from bson import ObjectId
-from app.database import get_database
+from app.database import get_database, get_collection
+from app.utils.pagination import with_cursor, keyset_filter, sort_spec
+from app.utils.projection import include
 from typing import Optional, Dict, Any, List
 
 class JobRepository:
-    
+
+    # Cards and tables never render the description or screening questions
+    SUMMARY_PROJECTION = include(
+        "recruiter_id", "title", "salary", "location", "type", "start_date", "end_date",
+        "skills_required", "status", "created_at", "updated_at"
+    )
+    FIELDS = {
+        "recruiter_id", "title", "description", "salary", "location", "type", "start_date",
+        "end_date", "skills_required", "status", "questions", "created_at", "updated_at"
+    }
+
     @staticmethod
     async def insert_one(job_data: Dict[str, Any]) -> Any:
         db = await get_database()
@@ -30,18 +42,58 @@ class JobRepository:
         return result
     
     @staticmethod
-    async def find_by_recruiter(recruiter_id: str) -> List[Dict[str, Any]]:
+    async def find_by_recruiter(recruiter_id: str, limit: int = 0, cursor: Optional[str] = None, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         db = await get_database()
-        cursor = db.jobs.find({"recruiter_id": recruiter_id}).sort("created_at", -1)
-        return [job async for job in cursor]
+        query = with_cursor({"recruiter_id": recruiter_id}, "created_at", -1, cursor)
+        projection = projection or JobRepository.SUMMARY_PROJECTION
+        docs = db.jobs.find(query, projection).sort(sort_spec("created_at", -1)).limit(limit)
+        return [job async for job in docs]
     
     @staticmethod
-    async def find_with_filters(query: Dict[str, Any], skip: int = 0, limit: int = 0) -> List[Dict[str, Any]]:
+    async def find_with_filters(query: Dict[str, Any], skip: int = 0, limit: int = 0, cursor: Optional[str] = None,
+                                projection: Optional[Dict[str, Any]] = None, stale_ok: bool = False) -> List[Dict[str, Any]]:
+        jobs = await get_collection("jobs", stale_ok)
+        query = with_cursor(query, "created_at", -1, cursor)
+        projection = projection or JobRepository.SUMMARY_PROJECTION
+        docs = jobs.find(query, projection).skip(skip).limit(limit).sort(sort_spec("created_at", -1))
+        return [job async for job in docs]
+
+    @staticmethod
+    async def text_search(query: Dict[str, Any], limit: int = 0, cursor: Optional[str] = None,
+                          projection: Optional[Dict[str, Any]] = None, stale_ok: bool = False) -> List[Dict[str, Any]]:
+        """
+        textScore cannot be filtered on in find(), so relevance paging runs
+        as an aggregation that materialises the score first.
+        """
+        jobs = await get_collection("jobs", stale_ok)
+        pipeline = [
+            {"$match": query},
+            {"$addFields": {"relevance": {"$meta": "textScore"}}}
+        ]
+        if cursor:
+            pipeline.append({"$match": keyset_filter("relevance", -1, cursor)})
+        pipeline.append({"$sort": dict(sort_spec("relevance", -1))})
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": {**(projection or JobRepository.SUMMARY_PROJECTION), "relevance": 1}})
+        return await jobs.aggregate(pipeline).to_list(None)
+
+    @staticmethod
+    async def find_by_term_prefix(prefix_regex: str, limit: int, stale_ok: bool = False) -> List[Dict[str, Any]]:
+        jobs = await get_collection("jobs", stale_ok)
+        cursor = jobs.find(
+            {"status": "OPEN", "search_terms": {"$regex": prefix_regex}},
+            {"title": 1}
+        ).limit(limit)
+        return [job async for job in cursor]
+
+    @staticmethod
+    async def find_missing_search_terms() -> List[Dict[str, Any]]:
         db = await get_database()
-        cursor = db.jobs.find(query).skip(skip).limit(limit).sort("created_at", -1)
+        cursor = db.jobs.find({"search_terms": {"$exists": False}}, {"title": 1, "skills_required": 1})
         return [job async for job in cursor]
     
     @staticmethod
-    async def count_with_filters(query: Dict[str, Any]) -> int:
-        db = await get_database()
-        return await db.jobs.count_documents(query)
\ No newline at end of file
+    async def count_with_filters(query: Dict[str, Any], stale_ok: bool = False) -> int:
+        jobs = await get_collection("jobs", stale_ok)
+        return await jobs.count_documents(query)
\ No newline at end of file
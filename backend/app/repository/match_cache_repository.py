@@ -0,0 +1,25 @@
+from datetime import datetime
+from app.database import get_database
+from typing import Optional, Dict, Any
+
+class MatchCacheRepository:
+
+    @staticmethod
+    async def find_by_key(key: str) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        return await db.match_cache.find_one({
+            "_id": key,
+            "expires_at": {"$gt": datetime.utcnow()}
+        })
+
+    @staticmethod
+    async def upsert(key: str, result: Dict[str, Any], expires_at: datetime) -> None:
+        db = await get_database()
+        await db.match_cache.update_one(
+            {"_id": key},
+            {
+                "$set": {"result": result, "expires_at": expires_at},
+                "$setOnInsert": {"created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from app.database import get_database
+from typing import Optional, Dict, Any
+
+class MatchJobRepository:
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+    @staticmethod
+    async def enqueue(application_id: str) -> Any:
+        db = await get_database()
+        now = datetime.utcnow()
+        result = await db.match_jobs.insert_one({
+            "application_id": application_id,
+            "status": MatchJobRepository.QUEUED,
+            "attempts": 0,
+            "run_at": now,
+            "lease_until": None,
+            "worker_id": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now
+        })
+        return result.inserted_id
+
+    @staticmethod
+    async def supersede(application_id: str) -> int:
+        """
+        Retires the queued and running jobs of an application whose resume
+        was replaced, so only the job queued next writes its match result.
+        A running job loses its lease and its worker leaves it alone.
+        """
+        db = await get_database()
+        result = await db.match_jobs.update_many(
+            {"application_id": application_id, "status": {"$in": [MatchJobRepository.QUEUED, MatchJobRepository.RUNNING]}},
+            {"$set": {"status": MatchJobRepository.SUPERSEDED, "lease_until": None, "updated_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    @staticmethod
+    async def claim(worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        Atomically takes the oldest runnable job. Jobs left RUNNING by a
+        crashed or restarted worker become claimable once their lease expires.
+        """
+        db = await get_database()
+        now = datetime.utcnow()
+        return await db.match_jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": MatchJobRepository.QUEUED, "run_at": {"$lte": now}},
+                    {"status": MatchJobRepository.RUNNING, "lease_until": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": MatchJobRepository.RUNNING,
+                    "worker_id": worker_id,
+                    "lease_until": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    def lease_filter(job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Matches the job only while the caller still holds the claim it was
+        given. Every claim bumps attempts, so a worker whose lease expired
+        and was re-claimed (even by itself) no longer matches.
+        """
+        return {
+            "_id": job["_id"],
+            "status": MatchJobRepository.RUNNING,
+            "worker_id": job.get("worker_id"),
+            "attempts": job["attempts"]
+        }
+
+    @staticmethod
+    async def settle(job: Dict[str, Any], fields: Dict[str, Any]) -> bool:
+        """Applies a final or retry state; returns False if the lease was lost."""
+        db = await get_database()
+        result = await db.match_jobs.update_one(
+            MatchJobRepository.lease_filter(job),
+            {"$set": {**fields, "lease_until": None, "updated_at": datetime.utcnow()}}
+        )
+        return result.matched_count > 0
+
+    @staticmethod
+    async def complete(job: Dict[str, Any]) -> bool:
+        return await MatchJobRepository.settle(job, {"status": MatchJobRepository.DONE})
+
+    @staticmethod
+    async def retry(job: Dict[str, Any], error: str, run_at: datetime) -> bool:
+        return await MatchJobRepository.settle(job, {
+            "status": MatchJobRepository.QUEUED,
+            "run_at": run_at,
+            "last_error": error
+        })
+
+    @staticmethod
+    async def fail(job: Dict[str, Any], error: str) -> bool:
+        return await MatchJobRepository.settle(job, {
+            "status": MatchJobRepository.FAILED,
+            "last_error": error
+        })
+
+    @staticmethod
+    async def find_latest_by_application_id(application_id: str) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        return await db.match_jobs.find_one(
+            {"application_id": application_id},
+            sort=[("created_at", -1)]
+        )
@@ -1,6 +1,8 @@
 from bson import ObjectId
-from app.database import get_database
-from typing import Dict, Any, List
+from pymongo.errors import BulkWriteError
+from app.database import get_database, get_collection
+from app.utils.pagination import with_cursor, sort_spec
+from typing import Dict, Any, List, Optional
 
 class MessageRepository:
     
@@ -11,20 +13,41 @@ class MessageRepository:
         return result.inserted_id
     
     @staticmethod
-    async def find_conversation(user1: str, user2: str) -> List[Dict[str, Any]]:
+    async def insert_many(messages: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Inserts the batch unordered so one bad document does not stop the
+        rest. Returns the error message for each failed position.
+        """
         db = await get_database()
-        cursor = db.messages.find({
+        try:
+            await db.messages.insert_many(messages, ordered=False)
+        except BulkWriteError as e:
+            return {error["index"]: error.get("errmsg", "write failed") for error in e.details.get("writeErrors", [])}
+        return {}
+
+    @staticmethod
+    async def find_conversation(user1: str, user2: str, limit: int, before: Optional[str] = None,
+                                after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Reads up to limit messages (all of them when limit is 0) from one
+        side of a cursor: newest first by default or before `before`,
+        oldest first after `after`.
+        """
+        db = await get_database()
+        direction = 1 if after else -1
+        query = with_cursor({
             "$or": [
                 {"sender_id": user1, "receiver_id": user2},
                 {"sender_id": user2, "receiver_id": user1}
             ]
-        }).sort("created_at", 1)
+        }, "created_at", direction, after or before)
+        cursor = db.messages.find(query).sort(sort_spec("created_at", direction)).limit(limit)
         return [message async for message in cursor]
     
     @staticmethod
-    async def aggregate(pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        db = await get_database()
-        result = await db.messages.aggregate(pipeline).to_list(None)
+    async def aggregate(pipeline: List[Dict[str, Any]], stale_ok: bool = False) -> List[Dict[str, Any]]:
+        messages = await get_collection("messages", stale_ok)
+        result = await messages.aggregate(pipeline).to_list(None)
         return result
     
     @staticmethod
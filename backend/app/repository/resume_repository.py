@@ -0,0 +1,53 @@
+from datetime import datetime
+from pymongo import ReturnDocument
+from app.database import get_database
+from typing import Optional, Dict, Any
+
+class ResumeRepository:
+
+    @staticmethod
+    async def acquire(sha256: str) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        return await db.resume_blobs.find_one_and_update(
+            {"_id": sha256},
+            {"$inc": {"ref_count": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def insert(sha256: str, file_id: str, size: int) -> Dict[str, Any]:
+        db = await get_database()
+        blob = {
+            "_id": sha256,
+            "file_id": file_id,
+            "size": size,
+            "ref_count": 1,
+            "resume_text": None,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        await db.resume_blobs.insert_one(blob)
+        return blob
+
+    @staticmethod
+    async def release(file_id: str) -> Optional[Dict[str, Any]]:
+        db = await get_database()
+        return await db.resume_blobs.find_one_and_update(
+            {"file_id": file_id},
+            {"$inc": {"ref_count": -1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def delete_if_unreferenced(sha256: str) -> bool:
+        db = await get_database()
+        result = await db.resume_blobs.delete_one({"_id": sha256, "ref_count": {"$lte": 0}})
+        return result.deleted_count == 1
+
+    @staticmethod
+    async def set_text(sha256: str, resume_text: str) -> None:
+        db = await get_database()
+        await db.resume_blobs.update_one(
+            {"_id": sha256},
+            {"$set": {"resume_text": resume_text, "updated_at": datetime.utcnow()}}
+        )
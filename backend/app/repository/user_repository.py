@@ -1,21 +1,36 @@
 from bson import ObjectId
-from app.database import get_database
+from app.database import get_database, get_collection
+from app.utils.pagination import with_cursor, sort_spec
+from app.utils.projection import include
 from typing import Optional, Dict, Any
 
 class UserRepository:
-    
+
+    # Anything read for display leaves the password hash on the server
+    PROFILE_PROJECTION = {"password": 0}
+    SUMMARY_PROJECTION = include("name", "email", "phone", "role", "skills", "createdAt")
+    FIELDS = {"name", "email", "phone", "role", "skills", "experience", "education", "createdAt"}
+
     @staticmethod
     async def find_by_email(email: str) -> Optional[Dict[str, Any]]:
         db = await get_database()
         return await db.users.find_one({"email": email})
     
     @staticmethod
-    async def find_by_id(user_id: str) -> Optional[Dict[str, Any]]:
+    async def find_by_id(user_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         db = await get_database()
         if not ObjectId.is_valid(user_id):
             return None
-        return await db.users.find_one({"_id": ObjectId(user_id)})
+        return await db.users.find_one({"_id": ObjectId(user_id)}, projection)
     
+    @staticmethod
+    async def find_by_ids(user_ids, projection: Optional[Dict[str, Any]] = None, stale_ok: bool = False):
+        ids = [ObjectId(i) for i in set(user_ids) if ObjectId.is_valid(i)]
+        if not ids:
+            return []
+        users = await get_collection("users", stale_ok)
+        return [user async for user in users.find({"_id": {"$in": ids}}, projection)]
+
     @staticmethod
     async def insert_one(user_data: Dict[str, Any]) -> Any:
         db = await get_database()
@@ -35,18 +50,21 @@ class UserRepository:
         return result
     
     @staticmethod
-    async def find_jobseekers(filters: Dict[str, Any] = None, skip: int = 0, limit: int = 0):
-        db = await get_database()
+    async def find_jobseekers(filters: Dict[str, Any] = None, limit: int = 0, cursor: Optional[str] = None,
+                              projection: Optional[Dict[str, Any]] = None, stale_ok: bool = False):
+        users = await get_collection("users", stale_ok)
         query = {"role": "jobseeker"}
         if filters:
             query.update(filters)
-        cursor = db.users.find(query).skip(skip).limit(limit)
-        return [user async for user in cursor]
+        query = with_cursor(query, "_id", 1, cursor)
+        projection = projection or UserRepository.SUMMARY_PROJECTION
+        docs = users.find(query, projection).sort(sort_spec("_id", 1)).limit(limit)
+        return [user async for user in docs]
     
     @staticmethod
-    async def count_jobseekers(filters: Dict[str, Any] = None) -> int:
-        db = await get_database()
+    async def count_jobseekers(filters: Dict[str, Any] = None, stale_ok: bool = False) -> int:
+        users = await get_collection("users", stale_ok)
         query = {"role": "jobseeker"}
         if filters:
             query.update(filters)
-        return await db.users.count_documents(query)
\ No newline at end of file
+        return await users.count_documents(query)
\ No newline at end of file
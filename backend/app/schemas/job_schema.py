@@ -15,6 +15,10 @@ class JobStatus(str, Enum):
     HIRING = "HIRING"
     EXPIRED = "EXPIRED"
 
+class SearchMode(str, Enum):
+    TEXT = "text"
+    REGEX = "regex"
+
 class JobQuestion(BaseModel):
     questionNo: int
     question: str
@@ -57,4 +61,8 @@ class FilterRequest(BaseModel):
     keyword: Optional[str] = None
     location: Optional[str] = None
     type: Optional[str] = None
-    skills: Optional[List[str]] = None
\ No newline at end of file
+    skills: Optional[List[str]] = None
+    # Substring matching keeps partial words working; callers opt in to $text
+    search_mode: SearchMode = SearchMode.REGEX
+    cursor: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1)
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 
 class MessageSchema(BaseModel):
     sender_id: str
@@ -8,4 +8,19 @@ class MessageSchema(BaseModel):
     message_type: str = "text"
     job_context: Optional[str] = None
     application_id: Optional[str] = None
-    isOpened: bool = False
\ No newline at end of file
+    isOpened: bool = False
+
+
+class BulkRecipientSchema(BaseModel):
+    receiver_id: str
+    variables: Dict[str, str] = {}
+
+
+class BulkMessageSchema(BaseModel):
+    sender_id: str
+    recipients: List[BulkRecipientSchema] = Field(..., min_length=1)
+    # string.Template syntax, e.g. "Hi $name, thanks for applying to $job"
+    content: str
+    message_type: str = "text"
+    job_context: Optional[str] = None
+    application_id: Optional[str] = None
@@ -1,93 +1,141 @@
 from motor.motor_asyncio import AsyncIOMotorGridFSBucket
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from app.database import get_database
-from app.utils.mongo import sanitize_document
+from app.utils.mongo import sanitize_document, expose_document
 from app.services.matching_strategy import LLMMatchingStrategy
 from app.repository.application_repository import ApplicationRepository
 from app.services.job_service import JobService
-import tempfile
-from pdfminer.high_level import extract_text
-import docx
+from app.services.match_worker import MatchWorker
+from app.repository.match_job_repository import MatchJobRepository
+from app.models.match_result_model import MatchResult
+from app.utils.resume_parser import ResumeParser
+from app.services.resume_storage import ResumeStorage
+from app.repository.resume_repository import ResumeRepository
+from app.utils.pagination import Page, clamp_limit, requested_limit, fetch_limit, build_page
+from app.utils.projection import parse_fields
 
 
 class ApplicationService:
 
     @staticmethod
     async def extract_text_from_resume(file_bytes: bytes, filename: str):
-        if filename.lower().endswith(".pdf"):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(file_bytes)
-                tmp.flush()
-                return extract_text(tmp.name)
-
-        if filename.lower().endswith(".docx"):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                tmp.write(file_bytes)
-                tmp.flush()
-                doc = docx.Document(tmp.name)
-                return "\n".join([p.text for p in doc.paragraphs])
-
-        return ""
+        return await ResumeParser.extract(file_bytes, filename)
 
     @staticmethod
     async def create_application(job_id, jobseeker_id, job_questions, answers, application_status, resume_file):
-        db = await get_database()
-        fs = AsyncIOMotorGridFSBucket(db)
-
-        existing = await ApplicationRepository.find_one({
-            "job_id": job_id,
-            "jobseeker_id": jobseeker_id,
-            "application_status": {"$ne": "PENDING"}
-        })
-        if existing:
-            return {"error": True, "message": "You have already applied to this job"}
-
-        pending_existing = await ApplicationRepository.find_one({
-            "job_id": job_id,
-            "jobseeker_id": jobseeker_id,
-            "application_status": "PENDING"
-        })
-        if pending_existing:
-            db = await get_database()
-            await db.applications.delete_one({"_id": pending_existing["_id"]})
-            if pending_existing.get("resume_file_id"):
-                try:
-                    await fs.delete(ObjectId(pending_existing["resume_file_id"]))
-                except:
-                    pass
-
         resume_bytes = await resume_file.read()
-        file_id = await fs.upload_from_stream(resume_file.filename, resume_bytes)
-        resume_text = await ApplicationService.extract_text_from_resume(resume_bytes, resume_file.filename)
+        # Reject before storing so an oversized file never reaches the match queue
+        ResumeParser.check_size(resume_bytes)
 
-        job = await JobService.get_job_by_id(job_id)
-        job_description = job["description"]
+        # The unique index also rejects this, but only if it could be built
+        if await ApplicationRepository.find_submitted(job_id, jobseeker_id):
+            return {"error": True, "message": "You have already applied to this job"}
 
-        match_result = await LLMMatchingStrategy.generate_match(resume_text, job_description)
+        blob = await ResumeStorage.store(resume_bytes, resume_file.filename)
 
+        now = datetime.utcnow()
         data = {
+            "_id": ObjectId(),
             "job_id": job_id,
             "jobseeker_id": jobseeker_id,
             "questions": job_questions,
             "answers": answers,
-            "match_result": match_result.to_dict(),
+            "match_result": MatchResult.pending(),
             "application_status": application_status,
-            "resume_file_id": str(file_id),
-            "resume_text": resume_text,
+            "resume_file_id": blob["file_id"],
+            "resume_sha256": blob["_id"],
+            "resume_filename": resume_file.filename,
+            "resume_text": blob.get("resume_text"),
             "notes": [],
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": now,
+            "updated_at": now
         }
 
-        inserted_id = await ApplicationRepository.insert_one(data)
-        data["_id"] = inserted_id
+        try:
+            replaced = await ApplicationRepository.upsert_pending(job_id, jobseeker_id, data)
+        except DuplicateKeyError:
+            await ResumeStorage.release(blob["file_id"])
+            return {"error": True, "message": "You have already applied to this job"}
+        except Exception:
+            # Drop the reference taken above so the blob can still be collected
+            await ResumeStorage.release(blob["file_id"])
+            raise
+
+        if replaced:
+            data["_id"] = replaced["_id"]
+            await ResumeStorage.release(replaced.get("resume_file_id"))
+            await MatchJobRepository.supersede(str(data["_id"]))
+
+        await MatchJobRepository.enqueue(str(data["_id"]))
+        MatchWorker.notify()
 
         return sanitize_document(data)
 
     @staticmethod
-    async def get_application_by_id(application_id: str):
+    async def process_match(application_id: str):
+        """
+        Runs resume extraction and LLM matching for a queued application.
+        Called by MatchWorker, never on the request path.
+        """
         application = await ApplicationRepository.find_by_id(application_id)
+        if not application:
+            return
+
+        resume_text = application.get("resume_text")
+        if resume_text is None:
+            db = await get_database()
+            fs = AsyncIOMotorGridFSBucket(db)
+            stream = await fs.open_download_stream(ObjectId(application["resume_file_id"]))
+            resume_bytes = await stream.read()
+            filename = application.get("resume_filename") or stream.filename
+            resume_text = await ApplicationService.extract_text_from_resume(resume_bytes, filename)
+            if application.get("resume_sha256"):
+                await ResumeRepository.set_text(application["resume_sha256"], resume_text)
+
+        job = await JobService.get_job_by_id(application["job_id"])
+        if not job:
+            raise ValueError(f"Job {application['job_id']} not found")
+
+        match_result = await LLMMatchingStrategy.generate_match(resume_text, job["description"])
+        result = match_result.to_dict()
+        result["status"] = MatchResult.COMPLETED
+
+        await ApplicationRepository.update_by_id(application_id, {
+            "resume_text": resume_text,
+            "match_result": result,
+            "updated_at": datetime.utcnow()
+        })
+
+    @staticmethod
+    async def mark_match_failed(application_id: str, error: str):
+        await ApplicationRepository.update_by_id(application_id, {
+            "match_result.status": MatchResult.FAILED,
+            "match_result.explanation": f"Matching failed: {error}",
+            "updated_at": datetime.utcnow()
+        })
+
+    @staticmethod
+    async def get_match_status(application_id: str):
+        application = await ApplicationRepository.find_by_id(application_id, ApplicationRepository.MATCH_PROJECTION)
+        if not application:
+            return None
+
+        match_result = application.get("match_result") or {}
+        job = await MatchJobRepository.find_latest_by_application_id(application_id)
+
+        return sanitize_document({
+            "application_id": application_id,
+            "status": match_result.get("status", MatchResult.COMPLETED),
+            "attempts": job["attempts"] if job else 0,
+            "last_error": job.get("last_error") if job else None,
+            "match_result": match_result
+        })
+
+    @staticmethod
+    async def get_application_by_id(application_id: str):
+        application = await ApplicationRepository.find_by_id(application_id, ApplicationRepository.DETAIL_PROJECTION)
         if application:
             return sanitize_document(application)
         return None
@@ -105,85 +153,85 @@ class ApplicationService:
         return None
 
     @staticmethod
-    async def get_resume(file_id: str):
-        db = await get_database()
-        fs = AsyncIOMotorGridFSBucket(db)
+    async def open_resume(file_id: str):
+        fs = await ResumeStorage.bucket()
+        return await fs.open_download_stream(ObjectId(file_id))
 
-        oid = ObjectId(file_id)
-        stream = await fs.open_download_stream(oid)
-        data = await stream.read()
+    @staticmethod
+    async def open_application_resume(application_id: str):
+        """
+        Opens an application's resume together with the name it was uploaded
+        under, which the shared GridFS file does not carry.
+        """
+        application = await ApplicationRepository.find_by_id(application_id, ApplicationRepository.RESUME_PROJECTION)
+        if not application or not application.get("resume_file_id"):
+            return None, None
+        grid_out = await ApplicationService.open_resume(application["resume_file_id"])
+        return grid_out, application.get("resume_filename") or grid_out.filename
 
-        filename = stream.filename
-        content_type = "application/pdf" if filename.lower().endswith(".pdf") else "application/octet-stream"
+    @staticmethod
+    async def iter_resume(grid_out, start: int, end: int):
+        """
+        Yields the inclusive byte range [start, end] one GridFS chunk at a time.
+        """
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            yield chunk
 
-        return data, filename, content_type
+    @staticmethod
+    async def get_applications_by_jobseeker(jobseeker_id: str, limit: int = None, cursor: str = None, fields: str = None):
+        limit = requested_limit(limit, cursor)
+        projection = parse_fields(fields, ApplicationRepository.FIELDS, required=("created_at",))
+        applications = await ApplicationRepository.find_by_jobseeker_id(jobseeker_id, fetch_limit(limit), cursor, projection)
+        applications, next_cursor = build_page(applications, limit, "created_at")
+        return Page(expose_document(applications), next_cursor)
 
     @staticmethod
-    async def get_applications_by_jobseeker(jobseeker_id: str):
-        applications = await ApplicationRepository.find_by_jobseeker_id(jobseeker_id)
-        return [sanitize_document(application) for application in applications]
+    async def get_applications_by_job(job_id: str, limit: int = None, cursor: str = None, fields: str = None):
+        limit = requested_limit(limit, cursor)
+        projection = parse_fields(fields, ApplicationRepository.FIELDS, required=("created_at",))
+        applications = await ApplicationRepository.find_by_job_id(job_id, fetch_limit(limit), cursor, projection)
+        applications, next_cursor = build_page(applications, limit, "created_at")
+        return Page(expose_document(applications), next_cursor)
 
     @staticmethod
     async def add_note(application_id, note: dict):
-        note_id = str(ObjectId())
         note_data = {
-            "note_id": note_id,
+            "note_id": str(ObjectId()),
             "recruiter_id": note.get("recruiter_id"),
             "note": note.get("note"),
             "created_at": datetime.utcnow()
         }
 
-        application = await ApplicationRepository.find_by_id(application_id)
-        if not application:
-            return None
-
-        notes = application.get("notes", [])
-        notes.append(note_data)
-
-        update_data = {
-            "notes": notes,
-            "updated_at": datetime.utcnow()
-        }
-
-        result = await ApplicationRepository.update_by_id(application_id, update_data)
+        result = await ApplicationRepository.push_note(application_id, note_data, ApplicationRepository.DETAIL_PROJECTION)
         return sanitize_document(result) if result else None
 
     @staticmethod
     async def delete_note(application_id: str, note_id: str):
-        application = await ApplicationRepository.find_by_id(application_id)
-        if not application:
-            return None
-
-        notes = application.get("notes", [])
-        notes = [n for n in notes if n.get("note_id") != note_id]
-
-        update_data = {
-            "notes": notes,
-            "updated_at": datetime.utcnow()
-        }
-
-        result = await ApplicationRepository.update_by_id(application_id, update_data)
+        result = await ApplicationRepository.pull_note(application_id, note_id, ApplicationRepository.DETAIL_PROJECTION)
         return sanitize_document(result) if result else None
 
     @staticmethod
     async def update_note(application_id: str, note_id: str, new_note: str):
-        application = await ApplicationRepository.find_by_id(application_id)
-        if not application:
-            return None
+        result = await ApplicationRepository.set_note(application_id, note_id, new_note, ApplicationRepository.DETAIL_PROJECTION)
+        return sanitize_document(result) if result else None
 
-        notes = application.get("notes", [])
-        for note in notes:
-            if note.get("note_id") == note_id:
-                note["note"] = new_note
-                note["updated_at"] = datetime.utcnow()
-                break
-        else:
+    @staticmethod
+    async def get_notes(application_id: str, offset: int = 0, limit: int = None):
+        limit = clamp_limit(limit)
+        page = await ApplicationRepository.find_notes(application_id, offset, limit)
+        if page is None:
             return None
 
-        update_data = {
-            "notes": notes,
-            "updated_at": datetime.utcnow()
-        }
-
-        result = await ApplicationRepository.update_by_id(application_id, update_data)
-        return sanitize_document(result) if result else None
\ No newline at end of file
+        return {
+            "notes": sanitize_document(page)["notes"],
+            "total": page["total"],
+            "offset": offset,
+            "limit": limit
+        }
\ No newline at end of file
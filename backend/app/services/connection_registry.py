@@ -0,0 +1,69 @@
+import os
+import asyncio
+import orjson
+from collections import defaultdict
+from starlette.websockets import WebSocket
+from app.utils.mongo import json_default
+
+
+class ConnectionRegistry:
+    """
+    WebSocket connections open on this worker, keyed by user id.
+    A user may hold several sockets (tabs, devices); each event is sent to
+    all of them concurrently, and a socket that fails or stalls past
+    SEND_TIMEOUT is dropped rather than holding up the others.
+    """
+
+    SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+
+    _connections = defaultdict(set)
+    delivered = 0
+    dropped = 0
+
+    @staticmethod
+    def connect(user_id: str, websocket: WebSocket):
+        ConnectionRegistry._connections[user_id].add(websocket)
+
+    @staticmethod
+    def disconnect(user_id: str, websocket: WebSocket):
+        sockets = ConnectionRegistry._connections.get(user_id)
+        if not sockets:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            del ConnectionRegistry._connections[user_id]
+
+    @staticmethod
+    def is_connected(user_id: str) -> bool:
+        return bool(ConnectionRegistry._connections.get(user_id))
+
+    @staticmethod
+    async def send(user_id: str, websocket: WebSocket, payload: str):
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), ConnectionRegistry.SEND_TIMEOUT)
+            ConnectionRegistry.delivered += 1
+        except Exception:
+            ConnectionRegistry.dropped += 1
+            ConnectionRegistry.disconnect(user_id, websocket)
+
+    @staticmethod
+    async def deliver(recipients, event: dict):
+        targets = [
+            (user_id, websocket)
+            for user_id in set(recipients)
+            for websocket in list(ConnectionRegistry._connections.get(user_id, ()))
+        ]
+        if not targets:
+            return
+
+        payload = orjson.dumps(event, default=json_default).decode()
+        await asyncio.gather(*(ConnectionRegistry.send(user_id, ws, payload) for user_id, ws in targets))
+
+    @staticmethod
+    def stats():
+        return {
+            "users": len(ConnectionRegistry._connections),
+            "sockets": sum(len(s) for s in ConnectionRegistry._connections.values()),
+            "delivered": ConnectionRegistry.delivered,
+            "dropped": ConnectionRegistry.dropped
+        }
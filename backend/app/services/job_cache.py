@@ -0,0 +1,136 @@
+import os
+import asyncio
+import orjson
+from app.utils.ttl_cache import TTLCache
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+
+class JobCache:
+    """
+    Read-through cache for sanitized job documents.
+    Each worker keeps a small in-process LRU tier. When JOB_CACHE_REDIS_URL
+    is set and the redis package is installed, a shared Redis tier sits
+    behind it and invalidations are broadcast so every worker drops its
+    local copy. The in-process TTL bounds staleness if a broadcast is missed.
+    """
+
+    ENABLED = os.getenv("JOB_CACHE_ENABLED", "true").lower() == "true"
+    MAX_SIZE = int(os.getenv("JOB_CACHE_MAX_SIZE", "2000"))
+    TTL_SECONDS = int(os.getenv("JOB_CACHE_TTL_SECONDS", "60"))
+    REDIS_URL = os.getenv("JOB_CACHE_REDIS_URL")
+    REDIS_TTL_SECONDS = int(os.getenv("JOB_CACHE_REDIS_TTL_SECONDS", "600"))
+    KEY_PREFIX = "job:"
+    CHANNEL = "job-cache:invalidate"
+
+    _memory = TTLCache(MAX_SIZE, TTL_SECONDS)
+    _redis = None
+    _listener = None
+    shared_hits = 0
+
+    @staticmethod
+    def redis():
+        if JobCache._redis is None and JobCache.REDIS_URL and redis_asyncio is not None:
+            JobCache._redis = redis_asyncio.from_url(JobCache.REDIS_URL)
+        return JobCache._redis
+
+    @staticmethod
+    async def get(job_id: str):
+        if not JobCache.ENABLED:
+            return None
+
+        job = JobCache._memory.get(job_id)
+        if job is not None:
+            return dict(job)
+
+        client = JobCache.redis()
+        if client is None:
+            return None
+
+        try:
+            raw = await client.get(JobCache.KEY_PREFIX + job_id)
+        except Exception as e:
+            print("Job cache lookup failed:", e)
+            return None
+
+        if raw is None:
+            return None
+
+        JobCache.shared_hits += 1
+        job = orjson.loads(raw)
+        JobCache._memory.set(job_id, job)
+        return dict(job)
+
+    @staticmethod
+    async def set(job_id: str, job: dict):
+        if not JobCache.ENABLED:
+            return
+
+        JobCache._memory.set(job_id, dict(job))
+        client = JobCache.redis()
+        if client is None:
+            return
+
+        try:
+            await client.set(JobCache.KEY_PREFIX + job_id, orjson.dumps(job), ex=JobCache.REDIS_TTL_SECONDS)
+        except Exception as e:
+            print("Job cache write failed:", e)
+
+    @staticmethod
+    async def invalidate(job_id: str):
+        JobCache._memory.delete(job_id)
+        client = JobCache.redis()
+        if client is None:
+            return
+
+        try:
+            await client.delete(JobCache.KEY_PREFIX + job_id)
+            await client.publish(JobCache.CHANNEL, job_id)
+        except Exception as e:
+            print("Job cache invalidation failed:", e)
+
+    @staticmethod
+    async def start():
+        client = JobCache.redis()
+        if client is None or JobCache._listener is not None:
+            return
+
+        pubsub = client.pubsub()
+        await pubsub.subscribe(JobCache.CHANNEL)
+        JobCache._listener = asyncio.create_task(JobCache.listen(pubsub))
+
+    @staticmethod
+    async def listen(pubsub):
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = message["data"]
+                JobCache._memory.delete(data.decode() if isinstance(data, bytes) else data)
+        finally:
+            await pubsub.aclose()
+
+    @staticmethod
+    async def stop():
+        listener = JobCache._listener
+        JobCache._listener = None
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        client = JobCache._redis
+        JobCache._redis = None
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def stats():
+        return {
+            "enabled": JobCache.ENABLED,
+            "shared_tier": bool(JobCache.REDIS_URL) and redis_asyncio is not None,
+            "shared_hits": JobCache.shared_hits,
+            "memory": JobCache._memory.stats()
+        }
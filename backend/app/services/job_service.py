@@ -1,12 +1,32 @@
+import os
+import re
 from bson import ObjectId
 from datetime import datetime, date
-from app.utils.mongo import sanitize_document
+from app.utils.mongo import sanitize_document, expose_document
 from app.repository.job_repository import JobRepository
-from app.database import get_database
+from app.schemas.job_schema import SearchMode
+from app.repository.application_repository import ApplicationRepository
+from app.utils.pagination import Page, requested_limit, fetch_limit, build_page
+from app.utils.projection import parse_fields
+from app.utils import score_histogram
+from app.utils.request_cache import RequestCache
+from app.services.job_cache import JobCache
 
 
 class JobService:
 
+    MAX_QUERY_LENGTH = 100
+    TOP_CANDIDATES_MAX = int(os.getenv("TOP_CANDIDATES_MAX", "100"))
+
+    @staticmethod
+    def safe_pattern(value: str):
+        return re.escape(value.strip()[:JobService.MAX_QUERY_LENGTH])
+
+    @staticmethod
+    def search_terms_for(title: str, skills: list):
+        text = f"{title or ''} {' '.join(skills or [])}".lower()
+        return sorted(set(re.findall(r"\w+", text)))
+
     @staticmethod
     async def create_job(payload):
         def convert_date_to_datetime(d):
@@ -27,6 +47,7 @@ class JobService:
             "end_date": convert_date_to_datetime(payload.end_date),
             "skills_required": payload.skills_required,
             "questions": [q.dict() for q in payload.questions] if payload.questions else [],
+            "search_terms": JobService.search_terms_for(payload.title, payload.skills_required),
             "status": "OPEN",
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
@@ -45,56 +66,130 @@ class JobService:
         }
 
         result = await JobRepository.update_by_id(payload.job_id, update_data)
+        RequestCache.discard(("job", payload.job_id))
+        await JobCache.invalidate(payload.job_id)
         return sanitize_document(result) if result else None
 
     @staticmethod
-    async def get_jobs_by_recruiter(recruiter_id: str):
-        jobs = await JobRepository.find_by_recruiter(recruiter_id)
-        return [sanitize_document(job) for job in jobs]
+    async def get_jobs_by_recruiter(recruiter_id: str, limit: int = None, cursor: str = None, fields: str = None):
+        limit = requested_limit(limit, cursor)
+        projection = parse_fields(fields, JobRepository.FIELDS, required=("created_at",))
+        jobs = await JobRepository.find_by_recruiter(recruiter_id, fetch_limit(limit), cursor, projection)
+        jobs, next_cursor = build_page(jobs, limit, "created_at")
+        return Page(expose_document(jobs), next_cursor)
 
     @staticmethod
     async def get_job_by_id(job_id: str):
-        job = await JobRepository.find_by_id(job_id)
-        return sanitize_document(job) if job else None
+        async def load():
+            job = await JobCache.get(job_id)
+            if job is not None:
+                return job
+
+            doc = await JobRepository.find_by_id(job_id)
+            if not doc:
+                return None
+
+            job = sanitize_document(doc)
+            await JobCache.set(job_id, job)
+            return job
+
+        return await RequestCache.get_or_load(("job", job_id), load)
 
     @staticmethod
-    async def search_jobs(filter_data):
+    async def search_jobs(filter_data, fields: str = None):
         query = {"status": "OPEN"}
 
         if filter_data.location:
-            query["location"] = {"$regex": filter_data.location, "$options": "i"}
+            query["location"] = {"$regex": JobService.safe_pattern(filter_data.location), "$options": "i"}
 
         if filter_data.type:
             query["type"] = filter_data.type
 
         if filter_data.title:
-            query["title"] = {"$regex": filter_data.title, "$options": "i"}
+            query["title"] = {"$regex": JobService.safe_pattern(filter_data.title), "$options": "i"}
 
-        if filter_data.keyword:
+        keyword = (filter_data.keyword or "").strip()[:JobService.MAX_QUERY_LENGTH]
+        if keyword and filter_data.search_mode == SearchMode.REGEX:
+            pattern = re.escape(keyword)
             query["$or"] = [
-                {"title": {"$regex": filter_data.keyword, "$options": "i"}},
-                {"description": {"$regex": filter_data.keyword, "$options": "i"}},
+                {"title": {"$regex": pattern, "$options": "i"}},
+                {"description": {"$regex": pattern, "$options": "i"}},
             ]
+        elif keyword:
+            # $text understands "quoted phrases" and -negated terms natively
+            query["$text"] = {"$search": keyword}
 
         if filter_data.skills:
             query["skills_required"] = {"$in": filter_data.skills}
 
-        jobs = await JobRepository.find_with_filters(query)
-        return {"results": [sanitize_document(job) for job in jobs], "count": len(jobs)}
+        limit = requested_limit(filter_data.limit, filter_data.cursor)
+        projection = parse_fields(fields, JobRepository.FIELDS, required=("created_at",))
+        if "$text" in query:
+            jobs = await JobRepository.text_search(query, fetch_limit(limit), filter_data.cursor, projection, stale_ok=True)
+            jobs, next_cursor = build_page(jobs, limit, "relevance")
+        else:
+            jobs = await JobRepository.find_with_filters(
+                query, limit=fetch_limit(limit), cursor=filter_data.cursor, projection=projection, stale_ok=True
+            )
+            jobs, next_cursor = build_page(jobs, limit, "created_at")
+
+        return {
+            "results": expose_document(jobs),
+            "count": len(jobs),
+            "next_cursor": next_cursor
+        }
+
+    @staticmethod
+    async def autocomplete(prefix: str, limit: int = 10):
+        words = re.findall(r"\w+", (prefix or "").lower()[:JobService.MAX_QUERY_LENGTH])
+        if not words:
+            return []
+
+        # Anchored, case-sensitive prefix regexes can use the search_terms index
+        jobs = await JobRepository.find_by_term_prefix("^" + re.escape(words[-1]), limit, stale_ok=True)
+        return expose_document(jobs)
 
     @staticmethod
-    async def get_top_candidates(job_id: str):
-        db = await get_database()
+    async def ensure_search_support():
+        try:
+            for job in await JobRepository.find_missing_search_terms():
+                await JobRepository.update_by_id(str(job["_id"]), {
+                    "search_terms": JobService.search_terms_for(job.get("title"), job.get("skills_required"))
+                })
+                await JobCache.invalidate(str(job["_id"]))
+        except Exception as e:
+            print("Could not backfill job search terms:", e)
 
+    @staticmethod
+    async def get_top_candidates(job_id: str, limit: int = None, min_score: float = None,
+                                 status: str = None, fields: str = None):
         job = await JobService.get_job_by_id(job_id)
         if not job:
-            return []
+            return None
+
+        # Every candidate unless the caller asks for a top slice
+        limit = min(limit, JobService.TOP_CANDIDATES_MAX) if limit else 0
+        projection = parse_fields(fields, ApplicationRepository.FIELDS)
 
-        applications = []
-        cursor = db.applications.find({"job_id": job_id}).sort(
-            "match_result.score", -1
+        ranking = await ApplicationRepository.rank_by_job_id(
+            job_id, limit, score_histogram.BOUNDARIES, min_score, status, projection, stale_ok=True
         )
-        async for app in cursor:
-            applications.append(sanitize_document(app))
 
-        return applications
\ No newline at end of file
+        summary = ranking["summary"][0] if ranking["summary"] else {}
+        scored = summary.get("scored", 0)
+        histogram = score_histogram.fill_buckets(
+            [bucket for bucket in ranking["histogram"] if bucket["_id"] != "out_of_range"]
+        )
+
+        return {
+            "candidates": expose_document(ranking["candidates"]),
+            "total": ranking["total"][0]["count"] if ranking["total"] else 0,
+            "scored": scored,
+            "histogram": histogram,
+            "summary": {
+                "mean": round(summary["mean"], 2) if scored else None,
+                "min": summary.get("min"),
+                "max": summary.get("max"),
+                **score_histogram.percentiles(histogram, sum(bucket["count"] for bucket in histogram))
+            }
+        }
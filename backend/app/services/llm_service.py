@@ -1,23 +1,37 @@
 import os
+import json
+import time
+import asyncio
 from app.utils.openrouter_adapter import OpenRouterAdapter
 from app.utils.huggingface_adapter import HuggingFaceAdapter
 from app.utils.fallback_rulebased_adapter import RuleBasedFallbackAdapter
 from app.utils.provider_selector import ProviderSelector
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.failover_policy import FailoverPolicy
+from app.utils.latency_tracker import LatencyTracker
 
 class LLMService:
 
     _instance = None
 
+    ADAPTERS = {
+        "openrouter": OpenRouterAdapter,
+        "huggingface": HuggingFaceAdapter
+    }
+
     @staticmethod
     def instance():
         if LLMService._instance is None:
             LLMService()
         return LLMService._instance
 
-    def __init__(self):
+    def __init__(self, policy: FailoverPolicy = None):
         if LLMService._instance is not None:
             return
 
+        self.policy = policy or FailoverPolicy()
+        self.latency = LatencyTracker()
+
         or_keys_raw = [
             os.getenv("OR_KEY_1"),
             os.getenv("OR_KEY_2"),
@@ -32,9 +46,6 @@ class LLMService:
         self.or_keys = [k for k in or_keys_raw if k]
         self.hf_keys = [k for k in hf_keys_raw if k]
 
-        self.or_index = {"i": 0}
-        self.hf_index = {"i": 0}
-
         print("\n" + "="*60)
         print("🔧 LLM SERVICE INITIALIZATION")
         print("="*60)
@@ -49,58 +60,134 @@ class LLMService:
         self.fallback = RuleBasedFallbackAdapter()
         LLMService._instance = self
 
-    async def run_openrouter(self, prompt: str):
-        if not self.or_keys:
-            print("⚠️  No OpenRouter keys configured")
-            return None
-
-        print("\n=== Trying OpenRouter Providers ===")
-        for _ in range(len(self.or_keys)):
-            key = ProviderSelector.next_key(self.or_keys, self.or_index)
-            print(f" -> Trying OpenRouter key: {key[:15]}...{key[-5:]}")
-
-            adapter = OpenRouterAdapter(api_key=key)
-            out = await adapter.generate(prompt)
-
-            if out:
-                print(" ✓ OpenRouter succeeded")
-                return out
+    def health(self):
+        return {
+            "keys": ProviderSelector.snapshot(),
+            "latency": self.latency.snapshot(),
+            "policy": self.policy.to_dict()
+        }
 
-            print(" ✗ OpenRouter failed, trying next key...")
+    @staticmethod
+    def model_signature():
+        return f"openrouter:{OpenRouterAdapter.MODEL}|huggingface:{HuggingFaceAdapter.MODEL}"
 
-        print(" !!! All OpenRouter keys failed")
-        return None
+    def plan_attempts(self):
+        plan = [("openrouter", key) for key in ProviderSelector.rank_keys("openrouter", self.or_keys)]
+        plan += [("huggingface", key) for key in ProviderSelector.rank_keys("huggingface", self.hf_keys)]
+        return plan
 
-    async def run_huggingface(self, prompt: str):
-        if not self.hf_keys:
-            print("⚠️  No HuggingFace keys configured")
+    @staticmethod
+    def is_valid(text: str):
+        try:
+            parsed = json.loads(text)
+        except (TypeError, ValueError):
+            return False
+        return isinstance(parsed, dict) and "score" in parsed
+
+    def hedge_delay(self, provider: str):
+        if self.latency.count(provider) < self.policy.hedge_min_samples:
+            return self.policy.hedge_default_delay
+        delay = self.latency.percentile(provider, self.policy.hedge_percentile)
+        if delay is None:
+            # No samples yet (possible when hedge_min_samples is 0)
+            return self.policy.hedge_default_delay
+        return max(self.policy.hedge_min_delay, delay)
+
+    async def attempt(self, provider: str, key: str, prompt: str):
+        breaker = ProviderSelector.breaker(provider, key)
+        if not breaker.acquire():
+            print(f" -> Skipping {provider} key {key[:15]}...{key[-5:]}: circuit {breaker.state}")
+            return None
+        # Only the attempt that took the half-open trial may hand it back
+        probe = breaker.state == CircuitBreaker.HALF_OPEN
+
+        print(f" -> Trying {provider} key: {key[:15]}...{key[-5:]}")
+        adapter = self.ADAPTERS[provider](api_key=key)
+        started = time.monotonic()
+
+        try:
+            out = await asyncio.wait_for(adapter.generate(prompt), self.policy.attempt_timeout)
+        except asyncio.TimeoutError:
+            print(f" ✗ {provider} attempt exceeded {self.policy.attempt_timeout}s deadline")
+            breaker.record_failure(timed_out=True)
+            return None
+        except asyncio.CancelledError:
+            # A hedge that lost the race says nothing about the key: free the
+            # trial slot for the next caller without recording an outcome
+            if probe:
+                breaker.release()
+            raise
+        except Exception as e:
+            print(f" ✗ {provider} attempt raised:", e)
+            breaker.record_failure()
             return None
 
-        print("\n=== Trying HuggingFace Providers ===")
-        for _ in range(len(self.hf_keys)):
-            key = ProviderSelector.next_key(self.hf_keys, self.hf_index)
-            print(f" -> Trying HuggingFace key: {key[:15]}...{key[-5:]}")
-
-            adapter = HuggingFaceAdapter(api_key=key)
-            out = await adapter.generate(prompt)
-
-            if out:
-                print(" ✓ HuggingFace succeeded")
-                return out
+        if not out or not self.is_valid(out):
+            print(f" ✗ {provider} returned no valid JSON")
+            if adapter.last_status == 200:
+                # The key works, the model just answered badly
+                if probe:
+                    breaker.release()
+            else:
+                breaker.record_failure(adapter.last_status, adapter.timed_out, adapter.retry_after)
+            return None
 
-            print(" ✗ HuggingFace failed, trying next key...")
+        elapsed = time.monotonic() - started
+        breaker.record_success(elapsed)
+        self.latency.record(provider, elapsed)
+        print(f" ✓ {provider} succeeded")
+        return out
+
+    async def run_hedged(self, prompt: str):
+        """
+        Launches provider attempts in plan order. A new attempt is hedged in
+        whenever the in-flight ones are slower than the provider's latency
+        percentile or fail outright. The first valid response wins and the
+        losers are cancelled. Gives up once the SLA budget is spent.
+        """
+        plan = self.plan_attempts()
+        if not plan:
+            print("⚠️  No LLM provider keys configured")
+            return None
 
-        print(" !!! All HuggingFace keys failed")
-        return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.policy.sla_budget
+        pending = {}
+        next_idx = 0
+
+        try:
+            while True:
+                if next_idx < len(plan) and len(pending) < self.policy.max_parallel:
+                    provider, key = plan[next_idx]
+                    next_idx += 1
+                    task = asyncio.create_task(self.attempt(provider, key, prompt))
+                    pending[task] = provider
+
+                remaining = deadline - loop.time()
+                if not pending or remaining <= 0:
+                    return None
+
+                wait = remaining
+                if next_idx < len(plan) and len(pending) < self.policy.max_parallel:
+                    wait = min(remaining, self.hedge_delay(plan[next_idx - 1][0]))
+
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = pending.pop(task)
+                    out = task.result()
+                    if out:
+                        return provider, out
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
     async def generate_match(self, prompt: str, resume_text: str, job_text: str):
-        result = await self.run_openrouter(prompt)
-        if result:
-            return {"provider": "openrouter", "model": "openrouter-model", "text": result}
-
-        result = await self.run_huggingface(prompt)
-        if result:
-            return {"provider": "huggingface", "model": "huggingface-model", "text": result}
+        winner = await self.run_hedged(prompt)
+        if winner:
+            provider, text = winner
+            return {"provider": provider, "model": f"{provider}-model", "text": text}
 
         print("### Using local fallback strategy ###")
         fb = self.fallback.analyze(resume_text, job_text)
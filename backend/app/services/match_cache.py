@@ -0,0 +1,82 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from app.utils.ttl_cache import TTLCache
+from app.repository.match_cache_repository import MatchCacheRepository
+
+
+class MatchCache:
+    """
+    Content-addressed cache for LLM match results.
+    A bounded in-process LRU tier sits in front of the match_cache collection.
+    """
+
+    ENABLED = os.getenv("MATCH_CACHE_ENABLED", "true").lower() == "true"
+    MAX_SIZE = int(os.getenv("MATCH_CACHE_MAX_SIZE", "1000"))
+    TTL_SECONDS = int(os.getenv("MATCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+    _memory = TTLCache(MAX_SIZE, TTL_SECONDS)
+    persistent_hits = 0
+    misses = 0
+
+    @staticmethod
+    def normalize(text: str):
+        return " ".join((text or "").split())
+
+    @staticmethod
+    def make_key(resume_text: str, job_description: str, model: str, prompt_version: str):
+        material = json.dumps([
+            MatchCache.normalize(resume_text),
+            MatchCache.normalize(job_description),
+            model,
+            prompt_version
+        ])
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    @staticmethod
+    async def get(key: str):
+        if not MatchCache.ENABLED:
+            return None
+
+        result = MatchCache._memory.get(key)
+        if result is not None:
+            return result
+
+        try:
+            doc = await MatchCacheRepository.find_by_key(key)
+        except Exception as e:
+            print("Match cache lookup failed:", e)
+            doc = None
+
+        if doc:
+            MatchCache.persistent_hits += 1
+            MatchCache._memory.set(key, doc["result"])
+            return doc["result"]
+
+        MatchCache.misses += 1
+        return None
+
+    @staticmethod
+    async def set(key: str, result: dict):
+        if not MatchCache.ENABLED:
+            return
+
+        MatchCache._memory.set(key, result)
+        expires_at = datetime.utcnow() + timedelta(seconds=MatchCache.TTL_SECONDS)
+        try:
+            await MatchCacheRepository.upsert(key, result, expires_at)
+        except Exception as e:
+            print("Match cache write failed:", e)
+
+    @staticmethod
+    def stats():
+        memory = MatchCache._memory.stats()
+        return {
+            "enabled": MatchCache.ENABLED,
+            "hits": memory["hits"] + MatchCache.persistent_hits,
+            "misses": MatchCache.misses,
+            "evictions": memory["evictions"],
+            "memory": memory,
+            "persistent_hits": MatchCache.persistent_hits
+        }
@@ -0,0 +1,104 @@
+import os
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+from app.repository.match_job_repository import MatchJobRepository
+
+
+class MatchWorker:
+    """
+    Drains the match_jobs queue in the background.
+    A fixed number of loops bounds concurrency. Failed jobs are retried
+    with exponential backoff until MAX_ATTEMPTS is reached.
+    """
+
+    ENABLED = os.getenv("MATCH_WORKER_ENABLED", "true").lower() == "true"
+    CONCURRENCY = int(os.getenv("MATCH_WORKER_CONCURRENCY", "4"))
+    MAX_ATTEMPTS = int(os.getenv("MATCH_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY = float(os.getenv("MATCH_RETRY_BASE_DELAY", "10"))
+    LEASE_SECONDS = int(os.getenv("MATCH_JOB_LEASE_SECONDS", "300"))
+    POLL_INTERVAL = float(os.getenv("MATCH_WORKER_POLL_INTERVAL", "2"))
+
+    _tasks = []
+    _stopping = None
+    _wakeup = None
+
+    @staticmethod
+    async def start():
+        if not MatchWorker.ENABLED or MatchWorker._tasks:
+            return
+
+        MatchWorker._stopping = asyncio.Event()
+        MatchWorker._wakeup = asyncio.Event()
+        prefix = uuid.uuid4().hex[:8]
+        MatchWorker._tasks = [
+            asyncio.create_task(MatchWorker.run_loop(f"{prefix}-{i}"))
+            for i in range(MatchWorker.CONCURRENCY)
+        ]
+        print(f"Match worker started with {MatchWorker.CONCURRENCY} loops")
+
+    @staticmethod
+    async def stop():
+        if not MatchWorker._tasks:
+            return
+
+        MatchWorker._stopping.set()
+        MatchWorker._wakeup.set()
+        for task in MatchWorker._tasks:
+            task.cancel()
+        await asyncio.gather(*MatchWorker._tasks, return_exceptions=True)
+        MatchWorker._tasks = []
+
+    @staticmethod
+    def notify():
+        if MatchWorker._wakeup is not None:
+            MatchWorker._wakeup.set()
+
+    @staticmethod
+    async def run_loop(worker_id: str):
+        while not MatchWorker._stopping.is_set():
+            try:
+                job = await MatchJobRepository.claim(worker_id, MatchWorker.LEASE_SECONDS)
+            except Exception as e:
+                print("Match worker could not claim job:", e)
+                job = None
+
+            if job:
+                await MatchWorker.process(job)
+                continue
+
+            MatchWorker._wakeup.clear()
+            try:
+                await asyncio.wait_for(MatchWorker._wakeup.wait(), MatchWorker.POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def process(job: dict):
+        from app.services.application_service import ApplicationService
+
+        try:
+            await ApplicationService.process_match(job["application_id"])
+            if not await MatchJobRepository.complete(job):
+                MatchWorker.lease_lost(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            print(f"Match job {job['_id']} failed (attempt {job['attempts']}):", error)
+
+            if job["attempts"] >= MatchWorker.MAX_ATTEMPTS:
+                if await MatchJobRepository.fail(job, error):
+                    await ApplicationService.mark_match_failed(job["application_id"], error)
+                else:
+                    MatchWorker.lease_lost(job)
+                return
+
+            delay = MatchWorker.RETRY_BASE_DELAY * (2 ** (job["attempts"] - 1))
+            if not await MatchJobRepository.retry(job, error, datetime.utcnow() + timedelta(seconds=delay)):
+                MatchWorker.lease_lost(job)
+
+    @staticmethod
+    def lease_lost(job: dict):
+        # Another claim owns the job now; its outcome wins over ours
+        print(f"Match job {job['_id']} lease expired before it finished; leaving it to the new owner")
@@ -2,11 +2,32 @@ import json
 from app.services.llm_service import LLMService
 from app.utils.prompt_builder import PromptBuilder
 from app.models.match_result_model import MatchResult
+from app.services.match_cache import MatchCache
 
 class LLMMatchingStrategy:
 
     @staticmethod
     async def generate_match(resume_text: str, job_description: str):
+        cache_key = MatchCache.make_key(
+            resume_text,
+            job_description,
+            LLMService.model_signature(),
+            PromptBuilder.PROMPT_VERSION
+        )
+        cached = await MatchCache.get(cache_key)
+        if cached:
+            return MatchResult.from_dict(cached)
+
+        result = await LLMMatchingStrategy.run_llm(resume_text, job_description)
+
+        # Fallback scores are cheap to recompute and should not mask a later LLM answer
+        if result.provider != "local-fallback":
+            await MatchCache.set(cache_key, result.to_dict())
+
+        return result
+
+    @staticmethod
+    async def run_llm(resume_text: str, job_description: str):
         llm = LLMService.instance()
         prompt = PromptBuilder.build_match_prompt(resume_text, job_description)
 
@@ -0,0 +1,120 @@
+import os
+import asyncio
+from datetime import datetime
+from app.database import get_database
+from app.services.connection_registry import ConnectionRegistry
+
+
+class InProcessBackplane:
+    """
+    Delivers straight to this worker's sockets. Correct for a single worker.
+    Delivery runs in the background so a slow socket never delays the
+    request that produced the event.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._pending = set()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def publish(self, recipients, event: dict):
+        task = asyncio.create_task(ConnectionRegistry.deliver(recipients, event))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+class ChangeStreamBackplane:
+    """
+    Carries events between workers through the message_events collection.
+    publish() inserts an event document; every worker tails inserts with a
+    change stream and delivers to the recipients connected to it. Needs a
+    replica set; event documents expire through a TTL index.
+    """
+
+    name = "mongo"
+    RETRY_DELAY = float(os.getenv("MESSAGE_BACKPLANE_RETRY_DELAY", "2"))
+
+    def __init__(self):
+        self._task = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def publish(self, recipients, event: dict):
+        db = await get_database()
+        await db.message_events.insert_one({
+            "recipients": list(set(recipients)),
+            "event": event,
+            "created_at": datetime.utcnow()
+        })
+
+    async def listen(self):
+        resume_token = None
+        while True:
+            try:
+                db = await get_database()
+                pipeline = [{"$match": {"operationType": "insert"}}]
+                async with db.message_events.watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        doc = change["fullDocument"]
+                        await ConnectionRegistry.deliver(doc["recipients"], doc["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Message backplane stream interrupted:", e)
+                await asyncio.sleep(ChangeStreamBackplane.RETRY_DELAY)
+
+
+class MessageEvents:
+    """
+    Entry point services use to push real-time events. The backplane is
+    chosen with MESSAGE_BACKPLANE (memory or mongo).
+    """
+
+    BACKPLANES = {
+        "memory": InProcessBackplane,
+        "mongo": ChangeStreamBackplane
+    }
+    KIND = os.getenv("MESSAGE_BACKPLANE", "memory")
+
+    _backplane = None
+
+    @staticmethod
+    def backplane():
+        if MessageEvents._backplane is None:
+            MessageEvents._backplane = MessageEvents.BACKPLANES.get(MessageEvents.KIND, InProcessBackplane)()
+        return MessageEvents._backplane
+
+    @staticmethod
+    async def start():
+        await MessageEvents.backplane().start()
+
+    @staticmethod
+    async def stop():
+        await MessageEvents.backplane().stop()
+
+    @staticmethod
+    async def publish(recipients, event: dict):
+        """Real-time delivery is best effort; the stored message is the source of truth."""
+        try:
+            await MessageEvents.backplane().publish(recipients, event)
+        except Exception as e:
+            print("Could not publish message event:", e)
+
+    @staticmethod
+    def stats():
+        return {"backplane": MessageEvents.backplane().name, **ConnectionRegistry.stats()}
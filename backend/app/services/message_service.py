@@ -1,9 +1,20 @@
+import os
+import asyncio
+from string import Template
 from datetime import datetime
+from bson import ObjectId
 from app.utils.mongo import sanitize_document
+from app.utils.pagination import Page, InvalidCursor, requested_limit, fetch_limit, encode_cursor
 from app.repository.message_repository import MessageRepository
+from app.repository.conversation_repository import ConversationRepository
+from app.repository.user_repository import UserRepository
+from app.services.message_backplane import MessageEvents
 
 class MessageService:
 
+    AVATAR_COLORS = ["#3b82f6", "#ec4899", "#8b5cf6", "#f59e0b", "#10b981"]
+    BULK_MAX_RECIPIENTS = int(os.getenv("BULK_MESSAGE_MAX_RECIPIENTS", "200"))
+
     @staticmethod
     async def send_message(data: dict):
         data["created_at"] = datetime.utcnow()
@@ -12,104 +23,147 @@ class MessageService:
         inserted_id = await MessageRepository.insert_one(data)
         data["_id"] = inserted_id
 
-        return sanitize_document(data)
+        try:
+            await ConversationRepository.record(data)
+        except Exception as e:
+            # The message is stored; `python -m app.cli rebuild-conversations` repairs the summary
+            print("Could not update conversation summary:", e)
+
+        message = sanitize_document(data)
+        await MessageEvents.publish([data["sender_id"], data["receiver_id"]], {"type": "message", "message": message})
+        return message
 
     @staticmethod
-    async def get_conversation(user1: str, user2: str):
-        messages = await MessageRepository.find_conversation(user1, user2)
-        return [sanitize_document(m) for m in messages]
+    async def send_bulk(data: dict):
+        """
+        Renders the template for each recipient and writes every message
+        in one unordered insert. Failures are reported per recipient and
+        never roll back the messages that were stored.
+        """
+        recipients = data.pop("recipients")
+        if len(recipients) > MessageService.BULK_MAX_RECIPIENTS:
+            raise ValueError(f"At most {MessageService.BULK_MAX_RECIPIENTS} recipients per request")
+
+        template = Template(data.pop("content"))
+        created_at = datetime.utcnow()
+        results = []
+        messages = []
+        for recipient in recipients:
+            result = {"receiver_id": recipient["receiver_id"]}
+            results.append(result)
+            try:
+                content = template.substitute(recipient.get("variables") or {})
+            except (KeyError, ValueError) as e:
+                result.update(status="failed", error=f"Template error: {e}")
+                continue
+            message = {
+                **data,
+                "_id": ObjectId(),
+                "receiver_id": recipient["receiver_id"],
+                "content": content,
+                "created_at": created_at,
+                "isOpened": False
+            }
+            messages.append((result, message))
+
+        errors = await MessageRepository.insert_many([m for _, m in messages]) if messages else {}
+
+        sent = []
+        for position, (result, message) in enumerate(messages):
+            if position in errors:
+                result.update(status="failed", error=errors[position])
+            else:
+                result.update(status="sent", message_id=str(message["_id"]))
+                sent.append(message)
+
+        if sent:
+            try:
+                failed = await ConversationRepository.record_many(sent)
+                if failed:
+                    print(f"Could not update {failed} conversation summaries")
+            except Exception as e:
+                print("Could not update conversation summaries:", e)
+
+            await asyncio.gather(*(
+                MessageEvents.publish([m["sender_id"], m["receiver_id"]], {"type": "message", "message": sanitize_document(m)})
+                for m in sent
+            ))
+
+        return {"sent": len(sent), "failed": len(results) - len(sent), "results": results}
+
+    @staticmethod
+    async def ensure_conversations():
+        """
+        Builds the conversation summaries on the first start after upgrade,
+        so the inbox is never empty just because nobody ran
+        `python -m app.cli rebuild-conversations`.
+        """
+        try:
+            if await ConversationRepository.is_empty():
+                count = await ConversationRepository.rebuild()
+                print(f"Backfilled {count} conversation summaries")
+        except Exception as e:
+            print("Could not backfill conversation summaries:", e)
+
+    @staticmethod
+    async def get_conversation(user1: str, user2: str, limit: int = None, before: str = None, after: str = None):
+        """
+        Returns a conversation in chronological order. With neither a limit
+        nor a cursor it is the whole history, as before paging existed;
+        given a limit it is the latest page and prev_cursor pages back
+        through older history. next_cursor always points at the newest
+        message returned, so a client polls with after=next_cursor to
+        fetch only what it has not seen yet.
+        """
+        if before and after:
+            raise InvalidCursor("Use either before or after, not both")
+
+        limit = requested_limit(limit, before or after)
+        docs = await MessageRepository.find_conversation(user1, user2, fetch_limit(limit), before, after)
+        has_more = bool(limit) and len(docs) > limit
+        if has_more:
+            docs = docs[:limit]
+        if not after:
+            docs.reverse()
+
+        next_cursor = after
+        if docs:
+            next_cursor = encode_cursor(docs[-1]["created_at"], docs[-1]["_id"])
+        prev_cursor = None
+        if docs and (before or not after) and has_more:
+            prev_cursor = encode_cursor(docs[0]["created_at"], docs[0]["_id"])
+
+        return Page([sanitize_document(m) for m in docs], next_cursor, prev_cursor)
+
+    @staticmethod
+    def avatar_color(user_id: str) -> str:
+        try:
+            return MessageService.AVATAR_COLORS[int(user_id[:2], 16) % len(MessageService.AVATAR_COLORS)]
+        except ValueError:
+            return MessageService.AVATAR_COLORS[0]
 
     @staticmethod
     async def get_conversations_for_recruiter(recruiter_id: str):
-        pipeline = [
-            {
-                "$match": {
-                    "$or": [
-                        {"sender_id": recruiter_id},
-                        {"receiver_id": recruiter_id}
-                    ]
-                }
-            },
-            {
-                "$sort": {"created_at": -1}
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$cond": [
-                            {"$eq": ["$sender_id", recruiter_id]},
-                            "$receiver_id",
-                            "$sender_id"
-                        ]
-                    },
-                    "lastMessage": {"$first": "$content"},
-                    "lastMessageTime": {"$first": "$created_at"},
-                    "unreadCount": {
-                        "$sum": {
-                            "$cond": [
-                                {
-                                    "$and": [
-                                        {"$eq": ["$receiver_id", recruiter_id]},
-                                        {"$eq": ["$isOpened", False]}
-                                    ]
-                                },
-                                1,
-                                0
-                            ]
-                        }
-                    }
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "jobseekers",
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "jobseekerData"
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "recruiters",
-                    "localField": "_id",
-                    "foreignField": "_id",
-                    "as": "recruiterData"
-                }
-            },
-            {
-                "$project": {
-                    "_id": 1,
-                    "participantName": {
-                        "$cond": [
-                            {"$gt": [{"$size": "$jobseekerData"}, 0]},
-                            {"$arrayElemAt": ["$jobseekerData.full_name", 0]},
-                            {"$arrayElemAt": ["$recruiterData.company_name", 0]}
-                        ]
-                    },
-                    "lastMessage": 1,
-                    "timestamp": "$lastMessageTime",
-                    "unread": {"$gt": ["$unreadCount", 0]},
-                    "jobTitle": {
-                        "$cond": [
-                            {"$gt": [{"$size": "$jobseekerData"}, 0]},
-                            "Job Seeker",
-                            "Recruiter"
-                        ]
-                    },
-                    "avatarColor": {
-                        "$arrayElemAt": [
-                            ["#3b82f6", "#ec4899", "#8b5cf6", "#f59e0b", "#10b981"],
-                            {"$mod": [{"$toInt": {"$substr": ["$_id", 0, 2]}}, 5]}
-                        ]
-                    }
-                }
-            },
-            {
-                "$sort": {"timestamp": -1}
-            }
-        ]
+        conversations = await ConversationRepository.find_for_user(recruiter_id, stale_ok=True)
+        others = [next((p for p in c["participants"] if p != recruiter_id), recruiter_id) for c in conversations]
+        users = await UserRepository.find_by_ids(others, {"name": 1, "company": 1, "role": 1}, stale_ok=True)
+        users_by_id = {str(u["_id"]): u for u in users}
 
-        result = await MessageRepository.aggregate(pipeline)
+        result = []
+        for other_id, conv in zip(others, conversations):
+            user = users_by_id.get(other_id, {})
+            is_jobseeker = user.get("role") == "jobseeker"
+            unread = conv.get("unread", {}).get(recruiter_id, 0)
+            result.append({
+                "id": other_id,
+                "participantName": user.get("name") if is_jobseeker else user.get("company") or user.get("name"),
+                "lastMessage": conv.get("last_message"),
+                "timestamp": conv.get("last_message_at"),
+                "unread": unread > 0,
+                "unreadCount": unread,
+                "jobTitle": "Job Seeker" if is_jobseeker else "Recruiter",
+                "avatarColor": MessageService.avatar_color(other_id)
+            })
         return [sanitize_document(conv) for conv in result]
 
     @staticmethod
@@ -120,9 +174,23 @@ class MessageService:
             "isOpened": False
         }
         
+        opened_at = datetime.utcnow()
         update_data = {
-            "$set": {"isOpened": True, "opened_at": datetime.utcnow()}
+            "$set": {"isOpened": True, "opened_at": opened_at}
         }
 
         result = await MessageRepository.update_many(filter_query, update_data)
+        if result["modified_count"]:
+            try:
+                await ConversationRepository.mark_read(receiver_id, sender_id, result["modified_count"])
+            except Exception as e:
+                # The messages are marked read; `python -m app.cli rebuild-conversations` repairs the summary
+                print("Could not update conversation summary:", e)
+            await MessageEvents.publish([sender_id, receiver_id], {
+                "type": "read",
+                "sender_id": sender_id,
+                "receiver_id": receiver_id,
+                "opened_at": opened_at.isoformat(),
+                "count": result["modified_count"]
+            })
         return result
\ No newline at end of file
@@ -0,0 +1,83 @@
+import os
+import hashlib
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from app.database import get_database
+from app.repository.resume_repository import ResumeRepository
+
+
+class ResumeStorageConflictError(RuntimeError):
+    pass
+
+
+class ResumeStorage:
+    """
+    Content-addressed resume storage on top of GridFS.
+    Identical uploads share one GridFS file and its extracted text;
+    a reference count keeps the file alive while any application uses it.
+    The shared file is named after its content, never after whoever
+    uploaded it first; each application keeps its own resume_filename.
+    """
+
+    STORE_ATTEMPTS = 3
+
+    @staticmethod
+    async def bucket():
+        db = await get_database()
+        return AsyncIOMotorGridFSBucket(db)
+
+    @staticmethod
+    def fingerprint(file_bytes: bytes):
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    @staticmethod
+    async def store(file_bytes: bytes, filename: str):
+        sha256 = ResumeStorage.fingerprint(file_bytes)
+
+        blob = await ResumeRepository.acquire(sha256)
+        if blob:
+            return blob
+
+        fs = await ResumeStorage.bucket()
+        # The extension keeps the content type; the uploader's name stays off the shared file
+        stored_name = sha256 + os.path.splitext(filename or "")[1].lower()
+        file_id = await fs.upload_from_stream(stored_name, file_bytes, metadata={"sha256": sha256})
+        for _ in range(ResumeStorage.STORE_ATTEMPTS):
+            try:
+                return await ResumeRepository.insert(sha256, str(file_id), len(file_bytes))
+            except DuplicateKeyError:
+                pass
+
+            # Another request stored the same bytes first, reuse theirs; if it
+            # was released again in the meantime, try our own file once more
+            blob = await ResumeRepository.acquire(sha256)
+            if blob:
+                await fs.delete(file_id)
+                return blob
+
+        await fs.delete(file_id)
+        raise ResumeStorageConflictError("Could not store the resume, please try again")
+
+    @staticmethod
+    async def release(file_id: str):
+        if not file_id:
+            return
+
+        fs = await ResumeStorage.bucket()
+        blob = await ResumeRepository.release(file_id)
+
+        # Files uploaded before deduplication have no blob record
+        if blob is None:
+            await ResumeStorage.delete_file(fs, file_id)
+            return
+
+        if blob["ref_count"] <= 0 and await ResumeRepository.delete_if_unreferenced(blob["_id"]):
+            await ResumeStorage.delete_file(fs, file_id)
+
+    @staticmethod
+    async def delete_file(fs, file_id: str):
+        try:
+            await fs.delete(ObjectId(file_id))
+        except Exception as e:
+            print(f"Could not delete resume file {file_id}:", e)
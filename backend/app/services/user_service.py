@@ -1,11 +1,13 @@
 from bson import ObjectId
 from datetime import datetime, date
-from app.utils.mongo import sanitize_document
+from app.utils.mongo import sanitize_document, expose_document
 from app.models.user_factory import UserFactory
 from app.repository.user_repository import UserRepository
 from app.database import get_database
 from app.utils.jwt_utils import create_access_token
-import bcrypt
+from app.utils.pagination import clamp_limit, build_page
+from app.utils.projection import parse_fields
+from app.utils.hashing import PasswordHasher
 
 
 def convert_dates(obj):
@@ -26,7 +28,7 @@ class UserService:
         if existing:
             raise ValueError("Email already registered")
 
-        hashed_password = bcrypt.hashpw(payload.password.encode(), bcrypt.gensalt()).decode()
+        hashed_password = await PasswordHasher.hash(payload.password)
 
         user_data = payload.dict()
         user_data["password"] = hashed_password
@@ -62,7 +64,7 @@ class UserService:
         if not user:
             return None
 
-        if not bcrypt.checkpw(password.encode(), user["password"].encode()):
+        if not await PasswordHasher.verify(password, user.get("password")):
             return None
 
         token = create_access_token({
@@ -80,7 +82,7 @@ class UserService:
 
     @staticmethod
     async def get_user_by_id(user_id: str):
-        user = await UserRepository.find_by_id(user_id)
+        user = await UserRepository.find_by_id(user_id, UserRepository.PROFILE_PROJECTION)
         if user:
             sanitized = sanitize_document(user)
             if "password" in sanitized:
@@ -126,16 +128,15 @@ class UserService:
         if filters.get("location"):
             query["location"] = {"$regex": filters["location"], "$options": "i"}
 
-        page = filters.get("page", 1)
-        limit = filters.get("limit", 10)
-        skip = (page - 1) * limit
-
-        jobseekers = await UserRepository.find_jobseekers(query, skip, limit)
-        total = await UserRepository.count_jobseekers(query)
+        limit = clamp_limit(filters.get("limit"))
+        projection = parse_fields(filters.get("fields"), UserRepository.FIELDS)
+        jobseekers = await UserRepository.find_jobseekers(query, limit + 1, filters.get("cursor"), projection, stale_ok=True)
+        jobseekers, next_cursor = build_page(jobseekers, limit, "_id")
+        total = await UserRepository.count_jobseekers(query, stale_ok=True)
 
         return {
-            "data": [sanitize_document(js) for js in jobseekers],
+            "data": expose_document(jobseekers),
             "total": total,
-            "page": page,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
\ No newline at end of file
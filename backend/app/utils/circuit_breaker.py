@@ -0,0 +1,103 @@
+import os
+import time
+import random
+
+
+class CircuitBreaker:
+    """
+    Health state for a single provider key.
+    CLOSED keys are used normally, OPEN keys are skipped until a jittered
+    cool-down expires, then one HALF_OPEN trial decides whether to close again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+    BASE_COOLDOWN = float(os.getenv("BREAKER_BASE_COOLDOWN", "30"))
+    AUTH_COOLDOWN = float(os.getenv("BREAKER_AUTH_COOLDOWN", "900"))
+    MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", "900"))
+    JITTER = float(os.getenv("BREAKER_JITTER", "0.2"))
+    LATENCY_ALPHA = 0.3
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = self.BASE_COOLDOWN
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.ewma_latency = None
+        self.last_status = None
+        self.successes = 0
+        self.trips = 0
+
+    def _refresh(self):
+        if self.state == self.OPEN and self.clock() >= self.open_until:
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+
+    def available(self):
+        self._refresh()
+        if self.state == self.HALF_OPEN:
+            return not self.trial_in_flight
+        return self.state == self.CLOSED
+
+    def acquire(self):
+        if not self.available():
+            return False
+        if self.state == self.HALF_OPEN:
+            self.trial_in_flight = True
+        return True
+
+    def release(self):
+        self.trial_in_flight = False
+
+    def record_success(self, latency: float):
+        self.successes += 1
+        self.failures = 0
+        self.state = self.CLOSED
+        self.cooldown = self.BASE_COOLDOWN
+        self.trial_in_flight = False
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = self.LATENCY_ALPHA * latency + (1 - self.LATENCY_ALPHA) * self.ewma_latency
+
+    def record_failure(self, status: int = None, timed_out: bool = False, retry_after: float = None):
+        self.last_status = "timeout" if timed_out else status
+        self.trial_in_flight = False
+
+        if status in (401, 403):
+            self.trip(self.AUTH_COOLDOWN)
+            return
+
+        if status == 429:
+            self.trip(retry_after or self.cooldown)
+            return
+
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.FAILURE_THRESHOLD:
+            self.trip(self.cooldown)
+
+    def trip(self, cooldown: float):
+        if self.state == self.HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.MAX_COOLDOWN)
+            cooldown = max(cooldown, self.cooldown)
+        jitter = random.uniform(-self.JITTER, self.JITTER)
+        self.state = self.OPEN
+        self.open_until = self.clock() + cooldown * (1 + jitter)
+        self.trips += 1
+
+    def snapshot(self):
+        self._refresh()
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "successes": self.successes,
+            "last_status": self.last_status,
+            "ewma_latency": self.ewma_latency,
+            "retry_in": max(0.0, self.open_until - self.clock()) if self.state == self.OPEN else 0.0
+        }
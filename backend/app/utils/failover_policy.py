@@ -0,0 +1,29 @@
+import os
+
+
+class FailoverPolicy:
+    """
+    Tunables for hedged provider failover in LLMService.
+    Every value can be overridden per instance or through the environment.
+    """
+
+    def __init__(
+        self,
+        attempt_timeout: float = None,
+        sla_budget: float = None,
+        hedge_percentile: float = None,
+        hedge_default_delay: float = None,
+        hedge_min_delay: float = None,
+        hedge_min_samples: int = None,
+        max_parallel: int = None,
+    ):
+        self.attempt_timeout = attempt_timeout if attempt_timeout is not None else float(os.getenv("LLM_ATTEMPT_TIMEOUT", "15"))
+        self.sla_budget = sla_budget if sla_budget is not None else float(os.getenv("LLM_SLA_BUDGET", "25"))
+        self.hedge_percentile = hedge_percentile if hedge_percentile is not None else float(os.getenv("LLM_HEDGE_PERCENTILE", "0.9"))
+        self.hedge_default_delay = hedge_default_delay if hedge_default_delay is not None else float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "4"))
+        self.hedge_min_delay = hedge_min_delay if hedge_min_delay is not None else float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+        self.hedge_min_samples = hedge_min_samples if hedge_min_samples is not None else int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "5"))
+        self.max_parallel = max_parallel if max_parallel is not None else int(os.getenv("LLM_MAX_PARALLEL", "3"))
+
+    def to_dict(self):
+        return dict(self.__dict__)
@@ -1,12 +1,114 @@
-from passlib.context import CryptContext
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
 
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto"
-)
 
-def hash_password(password: str):
-    return pwd_context.hash(password)
+class PasswordHasherBusyError(RuntimeError):
+    pass
 
-def verify_password(raw_password: str, hashed_password: str):
-    return pwd_context.verify(raw_password, hashed_password)
+
+class PasswordHasher:
+    """
+    The single place passwords are hashed and checked. bcrypt is slow on
+    purpose and releases the GIL, so it runs in a small thread pool instead
+    of on the event loop; a login burst queues there while other requests
+    keep flowing. Callers get PasswordHasherBusyError once MAX_PENDING
+    operations are queued or running.
+    """
+
+    MAX_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+    _executor = None
+    _pending = 0
+    completed = 0
+    rejected = 0
+    queue_seconds = 0.0
+    max_queue_seconds = 0.0
+    hash_seconds = 0.0
+
+    @staticmethod
+    def executor() -> ThreadPoolExecutor:
+        if PasswordHasher._executor is None:
+            PasswordHasher._executor = ThreadPoolExecutor(
+                max_workers=PasswordHasher.MAX_WORKERS, thread_name_prefix="bcrypt"
+            )
+        return PasswordHasher._executor
+
+    @staticmethod
+    def _timed(fn, *args):
+        # Runs on a pool thread; timings go back to the loop, which owns the counters
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started, time.perf_counter()
+
+    @staticmethod
+    async def run(fn, *args):
+        if PasswordHasher._pending >= PasswordHasher.MAX_PENDING:
+            PasswordHasher.rejected += 1
+            raise PasswordHasherBusyError("Too many sign-ins in progress, try again shortly")
+
+        PasswordHasher._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(
+                PasswordHasher.executor(), PasswordHasher._timed, fn, *args
+            )
+        finally:
+            PasswordHasher._pending -= 1
+
+        waited = started - submitted
+        PasswordHasher.completed += 1
+        PasswordHasher.queue_seconds += waited
+        PasswordHasher.max_queue_seconds = max(PasswordHasher.max_queue_seconds, waited)
+        PasswordHasher.hash_seconds += finished - started
+        return result
+
+    @staticmethod
+    def hash_sync(password: str) -> str:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(PasswordHasher.ROUNDS)).decode()
+
+    @staticmethod
+    def verify_sync(password: str, hashed_password: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode(), hashed_password.encode())
+        except ValueError:
+            # Malformed or non-bcrypt stored hash
+            return False
+
+    @staticmethod
+    async def hash(password: str) -> str:
+        return await PasswordHasher.run(PasswordHasher.hash_sync, password)
+
+    @staticmethod
+    async def verify(password: str, hashed_password: str) -> bool:
+        if not hashed_password:
+            return False
+        return await PasswordHasher.run(PasswordHasher.verify_sync, password, hashed_password)
+
+    @staticmethod
+    def shutdown():
+        executor = PasswordHasher._executor
+        PasswordHasher._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def stats():
+        completed = PasswordHasher.completed
+        return {
+            "workers": PasswordHasher.MAX_WORKERS,
+            "max_pending": PasswordHasher.MAX_PENDING,
+            "rounds": PasswordHasher.ROUNDS,
+            "in_flight": PasswordHasher._pending,
+            "queued": max(PasswordHasher._pending - PasswordHasher.MAX_WORKERS, 0),
+            "completed": completed,
+            "rejected": PasswordHasher.rejected,
+            "avg_queue_ms": round(PasswordHasher.queue_seconds / completed * 1000, 2) if completed else 0.0,
+            "max_queue_ms": round(PasswordHasher.max_queue_seconds * 1000, 2),
+            "avg_hash_ms": round(PasswordHasher.hash_seconds / completed * 1000, 2) if completed else 0.0
+        }
@@ -0,0 +1,58 @@
+import os
+import httpx
+
+
+class HttpClientPool:
+    """
+    Long-lived HTTP/2 connection pools, one per LLM provider.
+    Opened on app startup, closed on shutdown and shared by every adapter
+    so keep-alive connections are reused instead of re-handshaking per call.
+    """
+
+    PROVIDERS = ("openrouter", "huggingface")
+
+    MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+    KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "60"))
+    CONNECT_TIMEOUT = float(os.getenv("HTTP_POOL_CONNECT_TIMEOUT", "5"))
+    HTTP2 = os.getenv("HTTP_POOL_HTTP2", "true").lower() == "true"
+
+    _clients = {}
+
+    @staticmethod
+    def _create(provider: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=HttpClientPool.MAX_CONNECTIONS,
+            max_keepalive_connections=HttpClientPool.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HttpClientPool.KEEPALIVE_EXPIRY
+        )
+        timeout = httpx.Timeout(30, connect=HttpClientPool.CONNECT_TIMEOUT)
+        return httpx.AsyncClient(http2=HttpClientPool.HTTP2, limits=limits, timeout=timeout)
+
+    @staticmethod
+    def get(provider: str) -> httpx.AsyncClient:
+        client = HttpClientPool._clients.get(provider)
+        if client is None or client.is_closed:
+            client = HttpClientPool._create(provider)
+            HttpClientPool._clients[provider] = client
+        return client
+
+    @staticmethod
+    def retry_after(response):
+        try:
+            return float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    async def startup():
+        for provider in HttpClientPool.PROVIDERS:
+            HttpClientPool.get(provider)
+        print(f"Opened HTTP pools for {', '.join(HttpClientPool.PROVIDERS)} (http2={HttpClientPool.HTTP2})")
+
+    @staticmethod
+    async def shutdown():
+        clients = list(HttpClientPool._clients.values())
+        HttpClientPool._clients = {}
+        for client in clients:
+            await client.aclose()
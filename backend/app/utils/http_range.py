@@ -0,0 +1,78 @@
+import mimetypes
+from urllib.parse import quote
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def content_type_for(filename: str):
+    name = (filename or "").lower()
+    for extension, content_type in CONTENT_TYPES.items():
+        if name.endswith(extension):
+            return content_type
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def content_disposition(filename: str):
+    # filename* carries names that are not plain ASCII; filename is the fallback
+    fallback = "".join(c if c.isascii() and c.isprintable() and c not in '"\\' else "_" for c in filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def parse_range(header: str, size: int):
+    """
+    Parses a single "bytes=start-end" range into inclusive offsets.
+    Returns None when the header is absent or not something we serve
+    partially (multiple ranges, other units), so the full body is sent.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise RangeNotSatisfiable(header)
+            return max(0, size - suffix), size - 1
+
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+
+    return start, min(end, size - 1)
+
+
+def http_date(value: datetime):
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(if_none_match: str, if_modified_since: str, etag: str, last_modified: datetime):
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+
+    return False
@@ -1,5 +1,6 @@
-import httpx
 import os
+import httpx
+from app.utils.http_client import HttpClientPool
 
 class HuggingFaceAdapter:
     """
@@ -9,9 +10,14 @@ class HuggingFaceAdapter:
 
     MODEL = os.getenv("HUGGINGFACE_MODEL", "HuggingFaceH4/zephyr-7b-beta")
     BASE_URL = f"https://api-inference.huggingface.co/models/{MODEL}"
+    TIMEOUT = 20
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client=None):
         self.api_key = api_key
+        self.last_status = None
+        self.timed_out = False
+        self.retry_after = None
+        self.client = client or HttpClientPool.get("huggingface")
 
     async def generate(self, prompt: str):
         headers = {"Authorization": f"Bearer {self.api_key}"}
@@ -19,9 +25,10 @@ class HuggingFaceAdapter:
 
         try:
             print("HuggingFace Request Sent")
-            async with httpx.AsyncClient(timeout=20) as client:
-                r = await client.post(self.BASE_URL, headers=headers, json=payload)
+            r = await self.client.post(self.BASE_URL, headers=headers, json=payload, timeout=self.TIMEOUT)
             print("HuggingFace Status:", r.status_code)
+            self.last_status = r.status_code
+            self.retry_after = HttpClientPool.retry_after(r)
 
             if r.status_code != 200:
                 print("HuggingFace ERROR TEXT:", r.text)
@@ -32,4 +39,5 @@ class HuggingFaceAdapter:
 
         except Exception as e:
             print("HuggingFace Exception:", e)
+            self.timed_out = isinstance(e, httpx.TimeoutException)
             return None
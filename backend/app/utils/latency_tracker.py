@@ -0,0 +1,36 @@
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent successful call latencies per provider.
+    Used to pick the hedging delay from a latency percentile.
+    """
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._samples = {}
+
+    def record(self, provider: str, seconds: float):
+        samples = self._samples.setdefault(provider, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def count(self, provider: str):
+        return len(self._samples.get(provider, ()))
+
+    def percentile(self, provider: str, q: float):
+        samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[idx]
+
+    def snapshot(self):
+        return {
+            provider: {
+                "samples": len(samples),
+                "p50": self.percentile(provider, 0.5),
+                "p90": self.percentile(provider, 0.9)
+            }
+            for provider, samples in self._samples.items()
+        }
@@ -1,31 +1,78 @@
 from bson import ObjectId
+from bson.decimal128 import Decimal128
 from datetime import datetime
 
-def sanitize_document(doc: dict):
-    if not isinstance(doc, dict):
-        return doc
+CONVERTERS = {
+    ObjectId: str,
+    datetime: datetime.isoformat,
+}
 
-    clean = {}
-    for key, value in doc.items():
 
-        if isinstance(value, ObjectId):
-            clean[key] = str(value)
+def _sanitize_value(value):
+    kind = type(value)
+    if kind is dict:
+        return sanitize_document(value)
+    if kind is list:
+        return [_sanitize_value(v) for v in value]
 
-        elif isinstance(value, datetime):
-            clean[key] = value.isoformat()
+    convert = CONVERTERS.get(kind)
+    if convert is not None:
+        return convert(value)
 
-        elif isinstance(value, list):
-            clean[key] = [sanitize_document(v) for v in value]
+    # Subclasses miss the exact-type lookup above
+    if isinstance(value, dict):
+        return sanitize_document(value)
+    if isinstance(value, list):
+        return [_sanitize_value(v) for v in value]
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
 
-        elif isinstance(value, dict):
-            clean[key] = sanitize_document(value)
 
-        else:
-            clean[key] = value
+def sanitize_document(doc: dict):
+    if not isinstance(doc, dict):
+        return doc
+
+    clean = {key: _sanitize_value(value) for key, value in doc.items()}
 
     # Convert MongoDB _id → id
     if "_id" in clean:
-        clean["id"] = clean["_id"]
-        del clean["_id"]
+        clean["id"] = clean.pop("_id")
 
     return clean
+
+
+def expose_document(doc):
+    """
+    Renames _id to id wherever it occurs and leaves every other value,
+    ObjectId and datetime included, for the response encoder. Only the
+    dicts and lists on the way to an _id are copied; everything else is
+    passed through as it is, and the caller's documents are never modified.
+    """
+    if isinstance(doc, list):
+        exposed = [expose_document(item) for item in doc]
+        return doc if all(new is old for new, old in zip(exposed, doc)) else exposed
+
+    if not isinstance(doc, dict):
+        return doc
+
+    exposed = None
+    for key, value in doc.items():
+        new = expose_document(value)
+        if new is not value:
+            exposed = exposed or dict(doc)
+            exposed[key] = new
+    if "_id" in doc:
+        exposed = exposed or dict(doc)
+        exposed["id"] = exposed.pop("_id")
+    return doc if exposed is None else exposed
+
+
+def json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
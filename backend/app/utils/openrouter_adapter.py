@@ -1,15 +1,21 @@
-import httpx
 import os
+import httpx
 import re
 import json
+from app.utils.http_client import HttpClientPool
 
 class OpenRouterAdapter:
 
     MODEL = os.getenv("OPENROUTER_MODEL", "google/gemini-flash-1.5")
     BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
+    TIMEOUT = 30
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client=None):
         self.api_key = api_key
+        self.last_status = None
+        self.timed_out = False
+        self.retry_after = None
+        self.client = client or HttpClientPool.get("openrouter")
 
     def extract_json(self, text: str):
         if not text:
@@ -54,9 +60,10 @@ class OpenRouterAdapter:
 
         try:
             print("OpenRouter Request Sent")
-            async with httpx.AsyncClient(timeout=30) as client:
-                r = await client.post(self.BASE_URL, headers=headers, json=payload)
+            r = await self.client.post(self.BASE_URL, headers=headers, json=payload, timeout=self.TIMEOUT)
             print("OpenRouter Status:", r.status_code)
+            self.last_status = r.status_code
+            self.retry_after = HttpClientPool.retry_after(r)
 
             if r.status_code != 200:
                 print("OpenRouter ERROR TEXT:", r.text)
@@ -79,4 +86,5 @@ class OpenRouterAdapter:
 
         except Exception as e:
             print("OpenRouter Exception:", e)
+            self.timed_out = isinstance(e, httpx.TimeoutException)
             return None
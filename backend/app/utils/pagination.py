@@ -0,0 +1,144 @@
+import os
+import json
+import base64
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class Page(list):
+    """
+    A list of results that also carries the continuation token for the
+    next page (and, for feeds read in both directions, the previous one).
+    Serialises exactly like a plain list.
+    """
+
+    def __init__(self, items=(), next_cursor: str = None, prev_cursor: str = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def clamp_limit(limit: int = None):
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def requested_limit(limit: int = None, cursor: str = None):
+    """
+    Page size for a listing that pages only on request: 0 (unpaged, the
+    original behaviour) when the caller sent neither a limit nor a cursor.
+    """
+    if not limit and not cursor:
+        return 0
+    return clamp_limit(limit)
+
+
+def fetch_limit(limit: int):
+    """One extra row tells build_page whether another page exists; 0 stays unlimited."""
+    return limit + 1 if limit else 0
+
+
+def encode_cursor(value, _id) -> str:
+    if isinstance(value, datetime):
+        tagged = {"d": value.isoformat()}
+    elif isinstance(value, ObjectId):
+        tagged = {"o": str(value)}
+    else:
+        tagged = {"v": value}
+    raw = json.dumps([tagged, str(_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        tagged, _id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if "d" in tagged:
+            value = datetime.fromisoformat(tagged["d"])
+        elif "o" in tagged:
+            value = ObjectId(tagged["o"])
+        else:
+            value = tagged["v"]
+        return value, ObjectId(_id)
+    except (ValueError, TypeError, KeyError, InvalidId) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def keyset_filter(field: str, direction: int, cursor: str):
+    """
+    Builds the filter that resumes a (field, _id) ordered scan strictly
+    after the document the cursor points at. Nulls sort last when
+    descending, so they stay reachable after the last non-null value.
+    """
+    value, oid = decode_cursor(cursor)
+    op = "$lt" if direction < 0 else "$gt"
+
+    if field == "_id":
+        return {"_id": {op: oid}}
+
+    clauses = [{field: value, "_id": {op: oid}}]
+    if value is not None:
+        clauses.append({field: {op: value}})
+        if direction < 0:
+            clauses.append({field: None})
+    elif direction > 0:
+        clauses.append({field: {"$ne": None}})
+
+    return {"$or": clauses}
+
+
+def with_cursor(query: dict, field: str, direction: int, cursor: str = None):
+    if not cursor:
+        return query
+    return {"$and": [query, keyset_filter(field, direction, cursor)]}
+
+
+def sort_spec(field: str, direction: int):
+    if field == "_id":
+        return [("_id", direction)]
+    return [(field, direction), ("_id", direction)]
+
+
+def field_value(doc: dict, field: str):
+    value = doc
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def build_page(docs: list, limit: int, field: str):
+    """
+    Trims the limit + 1 documents a repository fetched down to one page and
+    derives the next cursor from the last document kept.
+    """
+    if not limit:
+        return docs, None
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = None
+    if has_more and docs:
+        last = docs[-1]
+        next_cursor = encode_cursor(field_value(last, field), last["_id"])
+    return docs, next_cursor
+
+
+def page_headers(page):
+    headers = {}
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    prev_cursor = getattr(page, "prev_cursor", None)
+    if prev_cursor:
+        headers["X-Prev-Cursor"] = prev_cursor
+    return headers or None
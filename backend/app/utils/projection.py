@@ -0,0 +1,34 @@
+from typing import Dict, Iterable, Optional
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def include(*fields: str) -> Dict[str, int]:
+    # MongoDB rejects a projection naming both a field and one of its sub-paths
+    fields = set(fields)
+    return {
+        field: 1 for field in sorted(fields)
+        if not any(field.startswith(parent + ".") for parent in fields)
+    }
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], required: Iterable[str] = ()) -> Optional[Dict[str, int]]:
+    """
+    Turns a comma separated ?fields= value into an inclusion projection.
+    Returns None when nothing was requested so callers fall back to their
+    default view. Fields the pagination cursor depends on are always kept.
+    """
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    if not requested:
+        return None
+
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+
+    return include(*requested, *required)
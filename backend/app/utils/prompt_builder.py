@@ -1,8 +1,12 @@
 class PromptBuilder:
     """
     Builds a structured prompt for LLM-based matching.
+    Bump PROMPT_VERSION whenever the prompt wording changes so cached
+    match results from the old prompt are not reused.
     """
 
+    PROMPT_VERSION = "1"
+
     @staticmethod
     def build_match_prompt(resume_text: str, job_description: str):
         return f"""
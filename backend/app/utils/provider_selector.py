@@ -1,11 +1,49 @@
+import random
+from app.utils.circuit_breaker import CircuitBreaker
+
+
 class ProviderSelector:
     """
-    Provides sequential failover across multiple keys/providers.
+    Picks provider keys for failover.
+    Keys with an open circuit breaker are skipped and the rest are ordered
+    by a weighted shuffle that favours keys with lower recent latency.
     """
 
+    _breakers = {}
+
+    @staticmethod
+    def breaker(provider: str, key: str) -> CircuitBreaker:
+        breaker = ProviderSelector._breakers.get((provider, key))
+        if breaker is None:
+            breaker = CircuitBreaker()
+            ProviderSelector._breakers[(provider, key)] = breaker
+        return breaker
+
+    @staticmethod
+    def rank_keys(provider: str, keys: list):
+        candidates = [k for k in keys if ProviderSelector.breaker(provider, k).available()]
+        if not candidates:
+            return []
+
+        latencies = [ProviderSelector.breaker(provider, k).ewma_latency for k in candidates]
+        known = [l for l in latencies if l]
+        default = sum(known) / len(known) if known else 1.0
+
+        def sort_key(pair):
+            key, latency = pair
+            weight = 1.0 / (latency or default)
+            return random.random() ** (1.0 / weight)
+
+        ranked = sorted(zip(candidates, latencies), key=sort_key, reverse=True)
+        return [key for key, _ in ranked]
+
+    @staticmethod
+    def mask(key: str):
+        return f"{key[:6]}...{key[-4:]}"
+
     @staticmethod
-    def next_key(keys: list, index_ref: dict):
-        idx = index_ref["i"]
-        key = keys[idx]
-        index_ref["i"] = (idx + 1) % len(keys)
-        return key
+    def snapshot():
+        state = {}
+        for (provider, key), breaker in ProviderSelector._breakers.items():
+            state.setdefault(provider, {})[ProviderSelector.mask(key)] = breaker.snapshot()
+        return state
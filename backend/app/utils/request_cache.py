@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+_cache: ContextVar[Optional[dict]] = ContextVar("request_cache", default=None)
+
+
+class RequestCache:
+    """
+    Memoises lookups for the lifetime of one HTTP request so a controller
+    and the services it calls never fetch the same document twice.
+    Outside a request (background workers, CLI) every call goes straight
+    to the loader.
+    """
+
+    @staticmethod
+    def begin():
+        return _cache.set({})
+
+    @staticmethod
+    def end(token) -> None:
+        _cache.reset(token)
+
+    @staticmethod
+    async def get_or_load(key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        cache = _cache.get()
+        if cache is None:
+            return await loader()
+        if key not in cache:
+            cache[key] = await loader()
+        return cache[key]
+
+    @staticmethod
+    def discard(key: Hashable) -> None:
+        cache = _cache.get()
+        if cache is not None:
+            cache.pop(key, None)
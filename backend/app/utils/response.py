@@ -1,11 +1,26 @@
+import orjson
 from starlette.responses import JSONResponse
+from app.utils.mongo import json_default
 
 
-def api_response(status: int, message: str, data=None):
-    return JSONResponse(
+class BSONJSONResponse(JSONResponse):
+    """
+    Encodes with orjson, which handles datetime natively and falls back to
+    json_default for ObjectId, so documents need no pre-conversion pass.
+    """
+
+    OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=json_default, option=self.OPTIONS)
+
+
+def api_response(status: int, message: str, data=None, headers: dict = None):
+    return BSONJSONResponse(
         status_code=status,
         content={
             "message": message,
             "data": data
-        }
+        },
+        headers=headers
     )
@@ -0,0 +1,171 @@
+import io
+import os
+import signal
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
+import docx
+
+
+class ResumeTooLargeError(ValueError):
+    pass
+
+
+class ResumeParserBusyError(RuntimeError):
+    pass
+
+
+class ResumeParseTimeoutError(TimeoutError):
+    pass
+
+
+def iter_pdf_pages(source, max_pages: int = 0):
+    """
+    Yields the text of one PDF page at a time straight from memory.
+    Accepts raw bytes or an already open binary stream.
+    """
+    stream = source if hasattr(source, "read") else io.BytesIO(source)
+    resources = PDFResourceManager(caching=True)
+    laparams = LAParams()
+
+    for page in PDFPage.get_pages(stream, maxpages=max_pages):
+        out = io.StringIO()
+        device = TextConverter(resources, out, laparams=laparams)
+        try:
+            PDFPageInterpreter(resources, device).process_page(page)
+        finally:
+            device.close()
+        yield out.getvalue()
+
+
+def parse_pdf(file_bytes: bytes, max_pages: int, max_chars: int = 0) -> str:
+    pages = []
+    size = 0
+    for text in iter_pdf_pages(file_bytes, max_pages):
+        pages.append(text)
+        size += len(text)
+        if max_chars and size >= max_chars:
+            break
+    return "".join(pages)[:max_chars or None]
+
+
+def parse_docx(file_bytes: bytes, max_pages: int, max_chars: int = 0) -> str:
+    doc = docx.Document(io.BytesIO(file_bytes))
+    return "\n".join([p.text for p in doc.paragraphs])[:max_chars or None]
+
+
+def run_with_deadline(parser, timeout: float, *args):
+    """
+    Runs a parser inside a pool worker with a SIGALRM deadline, so a
+    pathological document is interrupted in the worker and the worker
+    stays usable for the next parse.
+    """
+    if not timeout or not hasattr(signal, "SIGALRM"):
+        return parser(*args)
+
+    def expire(signum, frame):
+        raise ResumeParseTimeoutError(f"Parsing took longer than {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parser(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ResumeParser:
+    """
+    Extracts resume text in a bounded process pool so pdfminer and
+    python-docx never run on the event loop. Documents are parsed from
+    memory; PDFs are read page by page and stop once enough text is found.
+    Oversized uploads are rejected, parses are capped by page count and time,
+    and callers get ResumeParserBusyError once the pool queue is full.
+    Each worker enforces the time limit on itself; the pool is only
+    rebuilt when a worker dies or ignores its deadline.
+    """
+
+    PARSERS = {
+        ".pdf": parse_pdf,
+        ".docx": parse_docx
+    }
+
+    MAX_WORKERS = int(os.getenv("RESUME_PARSER_WORKERS", "2"))
+    MAX_PENDING = int(os.getenv("RESUME_PARSER_MAX_PENDING", "8"))
+    MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+    MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+    MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_TEXT_CHARS", "100000"))
+    TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "30"))
+    # Extra time the parent waits past TIMEOUT before giving up on the worker
+    TIMEOUT_GRACE = float(os.getenv("RESUME_PARSE_TIMEOUT_GRACE", "5"))
+
+    _executor = None
+    _pending = 0
+
+    @staticmethod
+    def executor() -> ProcessPoolExecutor:
+        if ResumeParser._executor is None:
+            ResumeParser._executor = ProcessPoolExecutor(max_workers=ResumeParser.MAX_WORKERS)
+        return ResumeParser._executor
+
+    @staticmethod
+    def parser_for(filename: str):
+        extension = os.path.splitext((filename or "").lower())[1]
+        return ResumeParser.PARSERS.get(extension)
+
+    @staticmethod
+    def check_size(file_bytes: bytes):
+        if len(file_bytes) > ResumeParser.MAX_BYTES:
+            raise ResumeTooLargeError(f"Resume exceeds {ResumeParser.MAX_BYTES} bytes")
+
+    @staticmethod
+    async def extract(file_bytes: bytes, filename: str) -> str:
+        parser = ResumeParser.parser_for(filename)
+        if parser is None:
+            return ""
+
+        ResumeParser.check_size(file_bytes)
+
+        if ResumeParser._pending >= ResumeParser.MAX_PENDING:
+            raise ResumeParserBusyError("Resume parser is saturated, try again shortly")
+
+        ResumeParser._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                ResumeParser.executor(), run_with_deadline, parser, ResumeParser.TIMEOUT,
+                file_bytes, ResumeParser.MAX_PAGES, ResumeParser.MAX_TEXT_CHARS
+            )
+            return await asyncio.wait_for(future, ResumeParser.TIMEOUT + ResumeParser.TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            ResumeParser.recycle()
+            raise ResumeParseTimeoutError(f"Parsing {filename} took longer than {ResumeParser.TIMEOUT}s")
+        except BrokenProcessPool:
+            ResumeParser.recycle()
+            raise
+        finally:
+            ResumeParser._pending -= 1
+
+    @staticmethod
+    def recycle():
+        """
+        Swaps in a fresh pool after a worker died or ignored its deadline.
+        In-flight parses on the old pool fail and are retried by the match
+        queue; its workers exit once their current task returns.
+        """
+        executor = ResumeParser._executor
+        ResumeParser._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def shutdown():
+        executor = ResumeParser._executor
+        ResumeParser._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
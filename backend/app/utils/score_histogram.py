@@ -0,0 +1,45 @@
+import os
+from typing import Dict, List
+
+BUCKET_WIDTH = int(os.getenv("SCORE_HISTOGRAM_BUCKET", "10"))
+
+# $bucket upper bounds are exclusive, so the last edge sits just past 100
+BOUNDARIES = list(range(0, 100, BUCKET_WIDTH)) + [100.000001]
+
+PERCENTILES = (50, 75, 90, 99)
+
+
+def fill_buckets(buckets: List[Dict]) -> List[Dict]:
+    """
+    $bucket omits empty ranges; expand them so charts always get the same
+    number of bars.
+    """
+    counts = {bucket["_id"]: bucket["count"] for bucket in buckets}
+    return [
+        {"min": low, "max": min(high, 100), "count": counts.get(low, 0)}
+        for low, high in zip(BOUNDARIES, BOUNDARIES[1:])
+    ]
+
+
+def percentiles(histogram: List[Dict], total: int) -> Dict[str, float]:
+    """
+    Estimates percentiles from the bucket counts by interpolating inside
+    the bucket each rank falls in. Accurate to within one bucket width and
+    independent of how many applications were scored.
+    """
+    if not total:
+        return {f"p{q}": None for q in PERCENTILES}
+
+    result = {}
+    for q in PERCENTILES:
+        rank = q / 100 * total
+        seen = 0
+        for bucket in histogram:
+            if bucket["count"] and seen + bucket["count"] >= rank:
+                fraction = (rank - seen) / bucket["count"]
+                result[f"p{q}"] = round(bucket["min"] + fraction * (bucket["max"] - bucket["min"]), 2)
+                break
+            seen += bucket["count"]
+        else:
+            result[f"p{q}"] = histogram[-1]["max"]
+    return result
@@ -9,9 +9,16 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from app.main import app
+from app.services.job_cache import JobCache
 
 @pytest_asyncio.fixture
 async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
\ No newline at end of file
+        yield ac
+
+@pytest.fixture(autouse=True)
+def clear_job_cache():
+    JobCache._memory.clear()
+    yield
+    JobCache._memory.clear()
@@ -1,8 +1,28 @@
+import asyncio
+import io
+import docx
+import tempfile
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock, call
+from reportlab.pdfgen import canvas
 from app.services.application_service import ApplicationService
 from app.services.job_service import JobService
 from app.services.matching_strategy import LLMMatchingStrategy
+from app.services.match_worker import MatchWorker
+from app.repository.match_job_repository import MatchJobRepository
+from app.utils.resume_parser import ResumeParser, ResumeTooLargeError, ResumeParserBusyError, ResumeParseTimeoutError, iter_pdf_pages, parse_pdf, run_with_deadline
+from concurrent.futures.process import BrokenProcessPool
+from app.services.resume_storage import ResumeStorage, ResumeStorageConflictError
+from app.repository.resume_repository import ResumeRepository
+from app.utils.http_range import parse_range, RangeNotSatisfiable
+from app.utils.projection import parse_fields, InvalidFields
+from app.repository.application_repository import ApplicationRepository
+from app.repository.job_repository import JobRepository
+from app.utils.request_cache import RequestCache
+from app.services.job_cache import JobCache
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from datetime import datetime
 
 @pytest.mark.asyncio
 async def test_create_application_success(client, monkeypatch):
@@ -89,4 +109,551 @@ async def test_create_application_answer_mismatch(client, monkeypatch):
     response = await client.post("/applications/", data=data, files=files)
 
     assert response.status_code == 400   
-    assert "Incorrect number of answers" in response.json()["detail"]
\ No newline at end of file
+    assert "Incorrect number of answers" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_get_match_status(client, monkeypatch):
+    app_id = str(ObjectId())
+    monkeypatch.setattr(
+        ApplicationService,
+        "get_match_status",
+        AsyncMock(return_value={
+            "application_id": app_id,
+            "status": "pending",
+            "attempts": 0,
+            "last_error": None,
+            "match_result": {"status": "pending", "score": None}
+        })
+    )
+
+    response = await client.get(f"/applications/{app_id}/match-status/")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_match_status_reads_only_the_match_result(monkeypatch):
+    app_id = str(ObjectId())
+    find = AsyncMock(return_value={"_id": ObjectId(app_id), "match_result": {"status": "pending"}})
+    monkeypatch.setattr(ApplicationRepository, "find_by_id", find)
+    monkeypatch.setattr(MatchJobRepository, "find_latest_by_application_id", AsyncMock(return_value=None))
+
+    status = await ApplicationService.get_match_status(app_id)
+
+    find.assert_awaited_once_with(app_id, {"match_result": 1})
+    assert status["status"] == "pending"
+
+
+@pytest.mark.asyncio
+async def test_match_worker_retries_then_fails(monkeypatch):
+    monkeypatch.setattr(ApplicationService, "process_match", AsyncMock(side_effect=RuntimeError("boom")))
+    monkeypatch.setattr(ApplicationService, "mark_match_failed", AsyncMock())
+    monkeypatch.setattr(MatchJobRepository, "retry", AsyncMock(return_value=True))
+    monkeypatch.setattr(MatchJobRepository, "fail", AsyncMock(return_value=True))
+
+    await MatchWorker.process({"_id": "job1", "application_id": "app1", "attempts": 1})
+    MatchJobRepository.retry.assert_awaited_once()
+    MatchJobRepository.fail.assert_not_awaited()
+
+    last = {"_id": "job1", "application_id": "app1", "attempts": MatchWorker.MAX_ATTEMPTS}
+    await MatchWorker.process(last)
+    MatchJobRepository.fail.assert_awaited_once_with(last, "boom")
+    ApplicationService.mark_match_failed.assert_awaited_once_with("app1", "boom")
+
+
+@pytest.mark.asyncio
+async def test_match_worker_completes_job(monkeypatch):
+    monkeypatch.setattr(ApplicationService, "process_match", AsyncMock())
+    monkeypatch.setattr(MatchJobRepository, "complete", AsyncMock(return_value=True))
+    job = {"_id": "job2", "application_id": "app2", "attempts": 1}
+
+    await MatchWorker.process(job)
+
+    ApplicationService.process_match.assert_awaited_once_with("app2")
+    MatchJobRepository.complete.assert_awaited_once_with(job)
+
+
+@pytest.mark.asyncio
+async def test_match_job_updates_require_the_current_lease(monkeypatch):
+    match_jobs = Mock()
+    match_jobs.update_one = AsyncMock(return_value=Mock(matched_count=0))
+    monkeypatch.setattr("app.repository.match_job_repository.get_database", AsyncMock(return_value=Mock(match_jobs=match_jobs)))
+    job = {"_id": "job3", "application_id": "app3", "attempts": 2, "worker_id": "worker-a"}
+
+    assert await MatchJobRepository.fail(job, "boom") is False
+    assert match_jobs.update_one.await_args.args[0] == {
+        "_id": "job3", "status": MatchJobRepository.RUNNING, "worker_id": "worker-a", "attempts": 2
+    }
+
+
+@pytest.mark.asyncio
+async def test_match_worker_with_lost_lease_does_not_mark_failed(monkeypatch):
+    monkeypatch.setattr(ApplicationService, "process_match", AsyncMock(side_effect=RuntimeError("boom")))
+    monkeypatch.setattr(ApplicationService, "mark_match_failed", AsyncMock())
+    monkeypatch.setattr(MatchJobRepository, "fail", AsyncMock(return_value=False))
+
+    await MatchWorker.process({"_id": "job4", "application_id": "app4", "attempts": MatchWorker.MAX_ATTEMPTS})
+
+    ApplicationService.mark_match_failed.assert_not_awaited()
+
+
+def make_docx_bytes(*paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_docx_runs_in_process_pool():
+    file_bytes = make_docx_bytes("Python developer", "FastAPI and MongoDB")
+
+    text = await ApplicationService.extract_text_from_resume(file_bytes, "resume.docx")
+
+    assert text == "Python developer\nFastAPI and MongoDB"
+    assert ResumeParser._executor is not None
+    ResumeParser.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_rejects_oversized_resume(monkeypatch):
+    monkeypatch.setattr(ResumeParser, "MAX_BYTES", 10)
+
+    with pytest.raises(ResumeTooLargeError):
+        await ResumeParser.extract(b"x" * 11, "resume.pdf")
+
+
+@pytest.mark.asyncio
+async def test_extract_text_applies_backpressure(monkeypatch):
+    monkeypatch.setattr(ResumeParser, "MAX_PENDING", 0)
+
+    with pytest.raises(ResumeParserBusyError):
+        await ResumeParser.extract(b"%PDF", "resume.pdf")
+
+
+def make_pdf_bytes(pages):
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for text in pages:
+        pdf.drawString(100, 750, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_pdf_pages_stream_from_memory(monkeypatch):
+    file_bytes = make_pdf_bytes(["Python developer", "FastAPI", "MongoDB"])
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", Mock(side_effect=AssertionError("no temp files")))
+
+    pages = list(iter_pdf_pages(file_bytes, max_pages=2))
+
+    assert [p.strip() for p in pages] == ["Python developer", "FastAPI"]
+    assert parse_pdf(file_bytes, max_pages=0).split() == ["Python", "developer", "FastAPI", "MongoDB"]
+    assert parse_pdf(file_bytes, max_pages=0, max_chars=6) == "Python"
+
+
+@pytest.mark.asyncio
+async def test_resume_storage_reuses_existing_blob(monkeypatch):
+    blob = {"_id": "abc", "file_id": "file1", "ref_count": 2, "resume_text": "cached text"}
+    bucket = Mock(upload_from_stream=AsyncMock())
+    monkeypatch.setattr(ResumeRepository, "acquire", AsyncMock(return_value=blob))
+    monkeypatch.setattr(ResumeStorage, "bucket", AsyncMock(return_value=bucket))
+
+    stored = await ResumeStorage.store(b"same bytes", "resume.pdf")
+
+    assert stored is blob
+    ResumeRepository.acquire.assert_awaited_once_with(ResumeStorage.fingerprint(b"same bytes"))
+    bucket.upload_from_stream.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_resume_storage_names_shared_file_by_content(monkeypatch):
+    bucket = Mock(upload_from_stream=AsyncMock(return_value=ObjectId()))
+    monkeypatch.setattr(ResumeStorage, "bucket", AsyncMock(return_value=bucket))
+    monkeypatch.setattr(ResumeRepository, "acquire", AsyncMock(return_value=None))
+    insert = AsyncMock(return_value={"_id": "abc"})
+    monkeypatch.setattr(ResumeRepository, "insert", insert)
+
+    await ResumeStorage.store(b"cv bytes", "Ada Lovelace.PDF")
+
+    sha256 = ResumeStorage.fingerprint(b"cv bytes")
+    assert bucket.upload_from_stream.await_args.args[0] == sha256 + ".pdf"
+    assert insert.await_args.args[2] == len(b"cv bytes")
+
+
+@pytest.mark.asyncio
+async def test_resume_storage_retries_when_winning_blob_was_released(monkeypatch):
+    bucket = Mock(upload_from_stream=AsyncMock(return_value=ObjectId()), delete=AsyncMock())
+    monkeypatch.setattr(ResumeStorage, "bucket", AsyncMock(return_value=bucket))
+    monkeypatch.setattr(ResumeRepository, "acquire", AsyncMock(return_value=None))
+    stored = {"_id": "abc", "file_id": "ours", "ref_count": 1}
+    insert = AsyncMock(side_effect=[DuplicateKeyError("E11000"), stored])
+    monkeypatch.setattr(ResumeRepository, "insert", insert)
+
+    assert await ResumeStorage.store(b"same bytes", "resume.pdf") is stored
+    assert insert.await_count == 2
+    bucket.delete.assert_not_awaited()
+
+    insert.side_effect = DuplicateKeyError("E11000")
+    with pytest.raises(ResumeStorageConflictError):
+        await ResumeStorage.store(b"same bytes", "resume.pdf")
+    bucket.delete.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resume_storage_keeps_file_while_referenced(monkeypatch):
+    bucket = Mock(delete=AsyncMock())
+    monkeypatch.setattr(ResumeStorage, "bucket", AsyncMock(return_value=bucket))
+    monkeypatch.setattr(ResumeRepository, "release", AsyncMock(return_value={"_id": "abc", "ref_count": 1}))
+    monkeypatch.setattr(ResumeRepository, "delete_if_unreferenced", AsyncMock(return_value=True))
+
+    await ResumeStorage.release(str(ObjectId()))
+    bucket.delete.assert_not_awaited()
+
+    monkeypatch.setattr(ResumeRepository, "release", AsyncMock(return_value={"_id": "abc", "ref_count": 0}))
+    await ResumeStorage.release(str(ObjectId()))
+    bucket.delete.assert_awaited_once()
+
+
+class FakeGridOut:
+    def __init__(self, data: bytes, chunk_size: int = 4):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.length = len(data)
+        self._id = ObjectId()
+        self.filename = "resume.docx"
+        self.metadata = {"sha256": "abc123"}
+        self.upload_date = datetime(2024, 1, 1, 12, 0, 0)
+
+    def seek(self, position):
+        self.position = position
+
+    async def readchunk(self):
+        chunk = self.data[self.position:self.position + self.chunk_size]
+        self.position += len(chunk)
+        return chunk
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=100-", 100)
+
+
+@pytest.mark.asyncio
+async def test_get_resume_streams_full_file(client, monkeypatch):
+    monkeypatch.setattr(ApplicationService, "open_resume", AsyncMock(return_value=FakeGridOut(b"0123456789")))
+
+    response = await client.get(f"/applications/resume/{ObjectId()}/")
+
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["etag"] == '"abc123"'
+    assert response.headers["content-type"].startswith("application/vnd.openxmlformats-officedocument")
+
+
+@pytest.mark.asyncio
+async def test_get_resume_serves_byte_range(client, monkeypatch):
+    monkeypatch.setattr(ApplicationService, "open_resume", AsyncMock(return_value=FakeGridOut(b"0123456789")))
+
+    response = await client.get(f"/applications/resume/{ObjectId()}/", headers={"Range": "bytes=3-8"})
+
+    assert response.status_code == 206
+    assert response.content == b"345678"
+    assert response.headers["content-range"] == "bytes 3-8/10"
+
+
+@pytest.mark.asyncio
+async def test_application_resume_uses_the_applicants_filename(client, monkeypatch):
+    app_id = ObjectId()
+    grid_out = FakeGridOut(b"0123456789")
+    grid_out.filename = "abc123.docx"
+    monkeypatch.setattr(ApplicationRepository, "find_by_id", AsyncMock(return_value={
+        "_id": app_id, "resume_file_id": str(grid_out._id), "resume_filename": "Grace Hopper CV.docx"
+    }))
+    open_resume = AsyncMock(return_value=grid_out)
+    monkeypatch.setattr(ApplicationService, "open_resume", open_resume)
+
+    response = await client.get(f"/applications/{app_id}/resume/")
+
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    open_resume.assert_awaited_once_with(str(grid_out._id))
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="Grace Hopper CV.docx"; filename*=UTF-8\'\'Grace%20Hopper%20CV.docx'
+    )
+
+    monkeypatch.setattr(ApplicationRepository, "find_by_id", AsyncMock(return_value=None))
+    assert (await client.get(f"/applications/{app_id}/resume/")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_resume_not_modified(client, monkeypatch):
+    monkeypatch.setattr(ApplicationService, "open_resume", AsyncMock(return_value=FakeGridOut(b"0123456789")))
+
+    response = await client.get(f"/applications/resume/{ObjectId()}/", headers={"If-None-Match": '"abc123"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_parse_fields_builds_inclusion_projection():
+    projection = parse_fields("application_status, match_result, match_result.score", ApplicationRepository.FIELDS, required=("created_at",))
+
+    assert projection == {"application_status": 1, "created_at": 1, "match_result": 1}
+    assert parse_fields(None, ApplicationRepository.FIELDS) is None
+    with pytest.raises(InvalidFields):
+        parse_fields("resume_text", ApplicationRepository.FIELDS)
+
+
+@pytest.mark.asyncio
+async def test_applications_by_jobseeker_use_summary_projection(client, monkeypatch):
+    find = AsyncMock(return_value=[{"_id": ObjectId(), "job_id": "j1", "created_at": datetime(2024, 1, 1)}])
+    monkeypatch.setattr(ApplicationRepository, "find_by_jobseeker_id", find)
+
+    response = await client.get("/applications/jobseeker/js1/", params={"fields": "job_id,application_status"})
+
+    assert response.status_code == 200
+    assert find.await_args.args[3] == {"application_status": 1, "created_at": 1, "job_id": 1}
+
+    response = await client.get("/applications/jobseeker/js1/", params={"fields": "resume_text"})
+    assert response.status_code == 400
+    assert "resume_text" not in ApplicationRepository.SUMMARY_PROJECTION
+
+
+@pytest.mark.asyncio
+async def test_add_note_is_single_atomic_push(monkeypatch):
+    app_id = str(ObjectId())
+    push = AsyncMock(return_value={"_id": ObjectId(app_id), "notes": [{"note_id": "n1", "note": "Strong"}]})
+    find = AsyncMock()
+    monkeypatch.setattr(ApplicationRepository, "push_note", push)
+    monkeypatch.setattr(ApplicationRepository, "find_by_id", find)
+
+    result = await ApplicationService.add_note(app_id, {"recruiter_id": "r1", "note": "Strong"})
+
+    find.assert_not_awaited()
+    note = push.await_args.args[1]
+    assert (note["recruiter_id"], note["note"]) == ("r1", "Strong")
+    assert push.await_args.args[2] == {"resume_text": 0}
+    assert result["id"] == app_id
+
+
+@pytest.mark.asyncio
+async def test_update_missing_note_returns_404(client, monkeypatch):
+    monkeypatch.setattr(ApplicationRepository, "set_note", AsyncMock(return_value=None))
+
+    response = await client.put(f"/recruiters/applications/{ObjectId()}/notes/n404", json={"note": "Updated"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_notes_paginates(client, monkeypatch):
+    created = datetime(2024, 2, 1)
+    find = AsyncMock(return_value={"total": 12, "notes": [{"note_id": "n12", "note": "Latest", "created_at": created}]})
+    monkeypatch.setattr(ApplicationRepository, "find_notes", find)
+
+    response = await client.get(f"/applications/{ObjectId()}/notes/", params={"offset": 10, "limit": 1})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "notes": [{"note_id": "n12", "note": "Latest", "created_at": created.isoformat()}],
+        "total": 12,
+        "offset": 10,
+        "limit": 1
+    }
+    assert find.await_args.args[1:] == (10, 1)
+
+
+def upload(name="resume.pdf", content=b"%PDF resume"):
+    resume = Mock()
+    resume.filename = name
+    resume.read = AsyncMock(return_value=content)
+    return resume
+
+
+@pytest.mark.asyncio
+async def test_create_application_replaces_pending_in_one_upsert(monkeypatch):
+    old_id = ObjectId()
+    monkeypatch.setattr(ResumeStorage, "store", AsyncMock(return_value={"_id": "sha", "file_id": "new-file", "resume_text": None}))
+    release = AsyncMock()
+    monkeypatch.setattr(ResumeStorage, "release", release)
+    upsert = AsyncMock(return_value={"_id": old_id, "resume_file_id": "old-file"})
+    monkeypatch.setattr(ApplicationRepository, "find_submitted", AsyncMock(return_value=None))
+    monkeypatch.setattr(ApplicationRepository, "upsert_pending", upsert)
+    calls = Mock()
+    monkeypatch.setattr(MatchJobRepository, "supersede", AsyncMock(side_effect=lambda *a: calls.supersede(*a)))
+    monkeypatch.setattr(MatchJobRepository, "enqueue", AsyncMock(side_effect=lambda *a: calls.enqueue(*a)))
+
+    result = await ApplicationService.create_application("job1", "js1", [], [], "APPLIED", upload())
+
+    assert upsert.await_count == 1
+    assert result["id"] == str(old_id)
+    release.assert_awaited_once_with("old-file")
+    assert calls.mock_calls == [call.supersede(str(old_id)), call.enqueue(str(old_id))]
+
+
+@pytest.mark.asyncio
+async def test_supersede_retires_queued_and_running_jobs(monkeypatch):
+    match_jobs = Mock()
+    match_jobs.update_many = AsyncMock(return_value=Mock(modified_count=1))
+    monkeypatch.setattr("app.repository.match_job_repository.get_database", AsyncMock(return_value=Mock(match_jobs=match_jobs)))
+
+    assert await MatchJobRepository.supersede("app5") == 1
+    query, update = match_jobs.update_many.await_args.args
+    assert query == {"application_id": "app5", "status": {"$in": [MatchJobRepository.QUEUED, MatchJobRepository.RUNNING]}}
+    assert update["$set"]["status"] == MatchJobRepository.SUPERSEDED
+
+
+@pytest.mark.asyncio
+async def test_create_application_rejects_existing_submission(monkeypatch):
+    monkeypatch.setattr(ResumeStorage, "store", AsyncMock(return_value={"_id": "sha", "file_id": "new-file"}))
+    release = AsyncMock()
+    monkeypatch.setattr(ResumeStorage, "release", release)
+    monkeypatch.setattr(ApplicationRepository, "find_submitted", AsyncMock(return_value=None))
+    monkeypatch.setattr(ApplicationRepository, "upsert_pending", AsyncMock(side_effect=DuplicateKeyError("E11000")))
+    enqueue = AsyncMock()
+    monkeypatch.setattr(MatchJobRepository, "enqueue", enqueue)
+
+    result = await ApplicationService.create_application("job1", "js1", [], [], "APPLIED", upload())
+
+    assert result == {"error": True, "message": "You have already applied to this job"}
+    release.assert_awaited_once_with("new-file")
+    enqueue.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_lookup_is_cached_per_request(monkeypatch):
+    find = AsyncMock(return_value={"_id": ObjectId(), "title": "Dev"})
+    monkeypatch.setattr(JobRepository, "find_by_id", find)
+    monkeypatch.setattr(JobCache, "ENABLED", False)
+
+    token = RequestCache.begin()
+    try:
+        await JobService.get_job_by_id("job1")
+        await JobService.get_job_by_id("job1")
+    finally:
+        RequestCache.end(token)
+    await JobService.get_job_by_id("job1")
+
+    assert find.await_count == 2
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.mark.asyncio
+async def test_job_cache_serves_repeat_reads_and_invalidates(monkeypatch):
+    job_id = str(ObjectId())
+    shared = FakeRedis()
+    monkeypatch.setattr(JobCache, "_redis", shared)
+    find = AsyncMock(return_value={"_id": ObjectId(job_id), "title": "Dev", "status": "OPEN"})
+    monkeypatch.setattr(JobRepository, "find_by_id", find)
+    monkeypatch.setattr(JobRepository, "update_by_id", AsyncMock(return_value={"_id": ObjectId(job_id), "status": "CLOSED"}))
+
+    assert (await JobService.get_job_by_id(job_id))["title"] == "Dev"
+    assert (await JobService.get_job_by_id(job_id))["title"] == "Dev"
+    assert find.await_count == 1
+    assert "job:" + job_id in shared.store
+
+    # Another worker with a cold memory tier is filled from the shared tier
+    JobCache._memory.clear()
+    assert (await JobService.get_job_by_id(job_id))["id"] == job_id
+    assert find.await_count == 1
+
+    await JobService.update_job_status(Mock(job_id=job_id, status="CLOSED"))
+
+    assert shared.published == [(JobCache.CHANNEL, job_id)]
+    assert "job:" + job_id not in shared.store
+    await JobService.get_job_by_id(job_id)
+    assert find.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_application_rejects_oversized_resume_before_storing(monkeypatch):
+    monkeypatch.setattr(ResumeParser, "MAX_BYTES", 10)
+    store = AsyncMock()
+    monkeypatch.setattr(ResumeStorage, "store", store)
+
+    with pytest.raises(ResumeTooLargeError):
+        await ApplicationService.create_application("job1", "js1", [], [], "APPLIED", upload(content=b"x" * 11))
+
+    store.assert_not_awaited()
+
+
+def test_parse_deadline_interrupts_inside_worker():
+    def stuck(*args):
+        while True:
+            pass
+
+    with pytest.raises(ResumeParseTimeoutError):
+        run_with_deadline(stuck, 0.05)
+    assert run_with_deadline(lambda *a: "text", 1, b"", 1, 0) == "text"
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_rebuilt(monkeypatch):
+    broken = Mock()
+    monkeypatch.setattr(ResumeParser, "_executor", broken)
+    loop = asyncio.get_running_loop()
+    failed = loop.create_future()
+    failed.set_exception(BrokenProcessPool("worker died"))
+    monkeypatch.setattr(loop, "run_in_executor", Mock(return_value=failed))
+
+    with pytest.raises(BrokenProcessPool):
+        await ResumeParser.extract(b"%PDF", "resume.pdf")
+
+    broken.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+    assert ResumeParser._executor is None
+
+
+@pytest.mark.asyncio
+async def test_create_application_releases_blob_when_write_fails(monkeypatch):
+    monkeypatch.setattr(ResumeStorage, "store", AsyncMock(return_value={"_id": "sha", "file_id": "new-file"}))
+    release = AsyncMock()
+    monkeypatch.setattr(ResumeStorage, "release", release)
+    monkeypatch.setattr(ApplicationRepository, "find_submitted", AsyncMock(return_value=None))
+    monkeypatch.setattr(ApplicationRepository, "upsert_pending", AsyncMock(side_effect=RuntimeError("primary stepped down")))
+
+    with pytest.raises(RuntimeError):
+        await ApplicationService.create_application("job1", "js1", [], [], "APPLIED", upload())
+
+    release.assert_awaited_once_with("new-file")
+
+
+@pytest.mark.asyncio
+async def test_create_application_checks_for_submitted_application_before_upsert(monkeypatch):
+    monkeypatch.setattr(ApplicationRepository, "find_submitted", AsyncMock(return_value={"_id": ObjectId()}))
+    store = AsyncMock()
+    monkeypatch.setattr(ResumeStorage, "store", store)
+    upsert = AsyncMock()
+    monkeypatch.setattr(ApplicationRepository, "upsert_pending", upsert)
+
+    result = await ApplicationService.create_application("job1", "js1", [], [], "APPLIED", upload())
+
+    assert result == {"error": True, "message": "You have already applied to this job"}
+    store.assert_not_awaited()
+    upsert.assert_not_awaited()
@@ -1,6 +1,9 @@
 import pytest
+import threading
 from unittest.mock import AsyncMock
 from app.services.user_service import UserService
+from app.repository.user_repository import UserRepository
+from app.utils.hashing import PasswordHasher
 
 @pytest.mark.asyncio
 async def test_login_success(client, monkeypatch):
@@ -36,3 +39,38 @@ async def test_login_failure(client, monkeypatch):
 
     assert response.status_code == 401
     assert response.json()["message"] == "Invalid email or password"
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(PasswordHasher, "ROUNDS", 4)
+    loop_thread = threading.get_ident()
+    threads = []
+    original = PasswordHasher.verify_sync
+
+    def verify_sync(password, hashed):
+        threads.append(threading.get_ident())
+        return original(password, hashed)
+
+    monkeypatch.setattr(PasswordHasher, "verify_sync", verify_sync)
+
+    hashed = await PasswordHasher.hash("s3cret")
+    assert await PasswordHasher.verify("s3cret", hashed)
+    assert not await PasswordHasher.verify("wrong", hashed)
+    assert not await PasswordHasher.verify("s3cret", "not-a-bcrypt-hash")
+    assert threads and loop_thread not in threads
+    assert PasswordHasher.stats()["completed"] >= 4
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_rejects_when_saturated(client, monkeypatch):
+    monkeypatch.setattr(PasswordHasher, "_pending", PasswordHasher.MAX_PENDING)
+    monkeypatch.setattr(UserRepository, "find_by_email", AsyncMock(return_value={"_id": "1", "password": "$2b$04$x"}))
+
+    response = await client.post("/auth/login", json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+
+    assert response.status_code == 503
+    assert PasswordHasher.stats()["rejected"] >= 1
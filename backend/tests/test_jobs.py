@@ -1,7 +1,15 @@
+import re
 import pytest
 from unittest.mock import AsyncMock
 from app.services.job_service import JobService
 from app.services.user_service import UserService
+from app.repository.job_repository import JobRepository
+from app.schemas.job_schema import FilterRequest
+from app.repository.application_repository import ApplicationRepository
+from app.utils.score_histogram import fill_buckets, percentiles
+from app.utils.pagination import encode_cursor, decode_cursor, keyset_filter, InvalidCursor
+from bson import ObjectId
+from datetime import datetime
 
 @pytest.mark.asyncio
 async def test_create_job_success(client, monkeypatch):
@@ -128,3 +136,146 @@ async def test_search_jobs(client, monkeypatch):
 
     assert response.status_code == 200
     assert len(response.json()["data"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_jobs_uses_text_index_for_keyword(monkeypatch):
+    text_search = AsyncMock(return_value=[{"_id": "1", "title": "Python Dev", "relevance": 2.5}])
+    monkeypatch.setattr(JobRepository, "text_search", text_search)
+
+    result = await JobService.search_jobs(FilterRequest(keyword='"machine learning" python', location="Remote (US)", search_mode="text"))
+
+    query = text_search.await_args.args[0]
+    assert query["$text"] == {"$search": '"machine learning" python'}
+    assert query["location"]["$regex"] == re.escape("Remote (US)")
+    assert result["results"][0]["relevance"] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_search_jobs_regex_mode_escapes_input(monkeypatch):
+    find = AsyncMock(return_value=[])
+    monkeypatch.setattr(JobRepository, "find_with_filters", find)
+
+    await JobService.search_jobs(FilterRequest(keyword="(a+)+$", search_mode="regex"))
+
+    query = find.await_args.args[0]
+    assert query["$or"][0]["title"]["$regex"] == re.escape("(a+)+$")
+
+
+@pytest.mark.asyncio
+async def test_search_jobs_defaults_to_substring_matching(monkeypatch):
+    find = AsyncMock(return_value=[])
+    monkeypatch.setattr(JobRepository, "find_with_filters", find)
+
+    await JobService.search_jobs(FilterRequest(keyword="Back"))
+
+    query = find.await_args.args[0]
+    assert "$text" not in query
+    assert query["$or"][0]["title"] == {"$regex": "Back", "$options": "i"}
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_jobs(client, monkeypatch):
+    find = AsyncMock(return_value=[{"_id": "1", "title": "Python Developer"}])
+    monkeypatch.setattr(JobRepository, "find_by_term_prefix", find)
+
+    response = await client.get("/jobs/autocomplete", params={"q": "senior Pyt"})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"id": "1", "title": "Python Developer"}]
+    assert find.await_args.args[0] == "^pyt"
+
+
+def test_cursor_round_trip_and_keyset_filter():
+    created = datetime(2024, 5, 1, 12, 30)
+    oid = ObjectId()
+
+    assert decode_cursor(encode_cursor(created, oid)) == (created, oid)
+
+    clause = keyset_filter("created_at", -1, encode_cursor(created, oid))
+    assert {"created_at": {"$lt": created}} in clause["$or"]
+    assert {"created_at": created, "_id": {"$lt": oid}} in clause["$or"]
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_jobs_by_recruiter_returns_next_cursor(client, monkeypatch):
+    docs = [
+        {"_id": ObjectId(), "title": f"Job {i}", "created_at": datetime(2024, 1, 10 - i)}
+        for i in range(3)
+    ]
+    find = AsyncMock(return_value=docs)
+    monkeypatch.setattr(JobRepository, "find_by_recruiter", find)
+
+    response = await client.get("/jobs/rec1", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 2
+    assert find.await_args.args[1] == 3
+    value, oid = decode_cursor(response.headers["X-Next-Cursor"])
+    assert (value, oid) == (docs[1]["created_at"], docs[1]["_id"])
+
+    find.side_effect = InvalidCursor("Invalid pagination cursor")
+    response = await client.get("/jobs/rec1", params={"cursor": "bogus"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_listings_stay_unpaged_without_limit_or_cursor(client, monkeypatch):
+    docs = [{"_id": ObjectId(), "title": f"Job {i}", "created_at": datetime(2024, 1, 1)} for i in range(60)]
+    find = AsyncMock(return_value=docs)
+    monkeypatch.setattr(JobRepository, "find_by_recruiter", find)
+
+    response = await client.get("/jobs/rec1")
+
+    assert find.await_args.args[1] == 0
+    assert len(response.json()["data"]) == 60
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_top_candidates_returns_ranking_and_distribution(client, monkeypatch):
+    rank = AsyncMock(return_value={
+        "candidates": [{"_id": ObjectId(), "match_result": {"score": 91}}],
+        "histogram": [{"_id": 40, "count": 2}, {"_id": 90, "count": 2}],
+        "summary": [{"_id": None, "scored": 4, "mean": 67.5, "min": 42, "max": 96}],
+        "total": [{"count": 5}]
+    })
+    monkeypatch.setattr(ApplicationRepository, "rank_by_job_id", rank)
+    monkeypatch.setattr(JobService, "get_job_by_id", AsyncMock(return_value={"id": "job1"}))
+
+    response = await client.get("/jobs/job1/top-candidates", params={"limit": 1, "min_score": 50, "status": "shortlisted"})
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert rank.await_args.args[1] == 1
+    assert rank.await_args.args[3:5] == (50, "SHORTLISTED")
+    assert len(data["candidates"]) == 1
+    assert (data["total"], data["scored"]) == (5, 4)
+    assert len(data["histogram"]) == 10
+    assert data["histogram"][4] == {"min": 40, "max": 50, "count": 2}
+    assert data["summary"]["p50"] == 50
+    assert data["summary"]["p90"] == 98
+
+
+@pytest.mark.asyncio
+async def test_top_candidates_ranks_everyone_without_a_limit(client, monkeypatch):
+    rank = AsyncMock(return_value={"candidates": [], "histogram": [], "summary": [], "total": []})
+    monkeypatch.setattr(ApplicationRepository, "rank_by_job_id", rank)
+    monkeypatch.setattr(JobService, "get_job_by_id", AsyncMock(return_value={"id": "job1"}))
+
+    response = await client.get("/jobs/job1/top-candidates")
+
+    assert response.status_code == 200
+    assert rank.await_args.args[1] == 0
+
+    monkeypatch.setattr(JobService, "get_job_by_id", AsyncMock(return_value=None))
+    response = await client.get("/jobs/missing/top-candidates")
+
+    assert response.status_code == 404
+
+
+def test_percentiles_without_scores():
+    assert percentiles(fill_buckets([]), 0)["p50"] is None
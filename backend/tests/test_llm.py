@@ -0,0 +1,264 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.utils.http_client import HttpClientPool
+from app.utils.openrouter_adapter import OpenRouterAdapter
+from app.utils.huggingface_adapter import HuggingFaceAdapter
+from app.utils.ttl_cache import TTLCache
+from app.services.match_cache import MatchCache
+from app.services.matching_strategy import LLMMatchingStrategy
+from app.repository.match_cache_repository import MatchCacheRepository
+from app.models.match_result_model import MatchResult
+from app.services.llm_service import LLMService
+from app.utils.failover_policy import FailoverPolicy
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.provider_selector import ProviderSelector
+
+
+@pytest.mark.asyncio
+async def test_adapters_share_pooled_client():
+    first = OpenRouterAdapter(api_key="key-1")
+    second = OpenRouterAdapter(api_key="key-2")
+    hf = HuggingFaceAdapter(api_key="key-3")
+
+    assert first.client is second.client
+    assert first.client is HttpClientPool.get("openrouter")
+    assert hf.client is HttpClientPool.get("huggingface")
+    assert hf.client is not first.client
+
+    await HttpClientPool.shutdown()
+    assert HttpClientPool.get("openrouter") is not first.client
+    await HttpClientPool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_openrouter_generate_uses_injected_client():
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        "choices": [{"message": {"content": '{"score": 80, "matched_skills": []}'}}]
+    }
+    client = Mock(post=AsyncMock(return_value=response))
+
+    adapter = OpenRouterAdapter(api_key="key-1", client=client)
+    out = await adapter.generate("prompt")
+
+    assert out == '{"score": 80, "matched_skills": []}'
+    client.post.assert_awaited_once()
+    assert client.post.await_args.kwargs["timeout"] == OpenRouterAdapter.TIMEOUT
+
+
+def test_ttl_cache_evicts_least_recently_used(monkeypatch):
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.ttl_cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+    now[0] += 6
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_match_cache_key_ignores_whitespace_changes():
+    first = MatchCache.make_key("Python  developer\n", "Backend role", "m", "1")
+    second = MatchCache.make_key(" Python developer", "Backend   role", "m", "1")
+    other_prompt = MatchCache.make_key("Python developer", "Backend role", "m", "2")
+
+    assert first == second
+    assert first != other_prompt
+
+
+@pytest.mark.asyncio
+async def test_generate_match_served_from_cache(monkeypatch):
+    monkeypatch.setattr(MatchCache, "_memory", TTLCache(max_size=10, ttl=60))
+    monkeypatch.setattr(MatchCacheRepository, "find_by_key", AsyncMock(return_value=None))
+    monkeypatch.setattr(MatchCacheRepository, "upsert", AsyncMock())
+
+    llm_result = MatchResult(
+        score=88,
+        matched_skills=["python"],
+        missing_skills=[],
+        transferable_skills=[],
+        explanation="Strong match",
+        provider="openrouter",
+        model="openrouter-model"
+    )
+    run_llm = AsyncMock(return_value=llm_result)
+    monkeypatch.setattr(LLMMatchingStrategy, "run_llm", run_llm)
+
+    first = await LLMMatchingStrategy.generate_match("resume", "job")
+    second = await LLMMatchingStrategy.generate_match("resume", "job")
+
+    assert run_llm.await_count == 1
+    assert second.score == first.score == 88
+    MatchCacheRepository.upsert.assert_awaited_once()
+
+
+VALID_JSON = '{"score": 75, "matched_skills": [], "missing_skills": [], "transferable_skills": [], "explanation": "ok"}'
+
+
+def make_llm_service(monkeypatch, or_keys, hf_keys, **policy):
+    monkeypatch.setattr(LLMService, "_instance", None)
+    monkeypatch.setattr(ProviderSelector, "_breakers", {})
+    service = LLMService(policy=FailoverPolicy(**policy))
+    service.or_keys = or_keys
+    service.hf_keys = hf_keys
+    monkeypatch.setattr(LLMService, "_instance", None)
+    return service
+
+
+def fake_generate(behaviour: dict):
+    async def generate(self, prompt):
+        delay, out = behaviour[self.api_key]
+        await asyncio.sleep(delay)
+        return out
+    return generate
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_over_slow_provider(monkeypatch):
+    service = make_llm_service(
+        monkeypatch, ["or-slow-key-000000000"], ["hf-fast-key-000000000"],
+        attempt_timeout=5, sla_budget=5, hedge_default_delay=0.05
+    )
+    monkeypatch.setattr(OpenRouterAdapter, "generate", fake_generate({"or-slow-key-000000000": (2, VALID_JSON)}))
+    monkeypatch.setattr(HuggingFaceAdapter, "generate", fake_generate({"hf-fast-key-000000000": (0.01, VALID_JSON)}))
+
+    started = asyncio.get_running_loop().time()
+    raw = await service.generate_match("prompt", "resume", "job")
+
+    assert raw["provider"] == "huggingface"
+    assert asyncio.get_running_loop().time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_response_triggers_next_provider(monkeypatch):
+    service = make_llm_service(
+        monkeypatch, ["or-bad-key-0000000000"], ["hf-good-key-000000000"],
+        attempt_timeout=5, sla_budget=5, hedge_default_delay=3
+    )
+    monkeypatch.setattr(OpenRouterAdapter, "generate", fake_generate({"or-bad-key-0000000000": (0, "not json")}))
+    monkeypatch.setattr(HuggingFaceAdapter, "generate", fake_generate({"hf-good-key-000000000": (0, VALID_JSON)}))
+
+    raw = await service.generate_match("prompt", "resume", "job")
+
+    assert raw == {"provider": "huggingface", "model": "huggingface-model", "text": VALID_JSON}
+
+
+@pytest.mark.asyncio
+async def test_sla_budget_falls_back_to_rule_based(monkeypatch):
+    service = make_llm_service(
+        monkeypatch, ["or-hung-key-000000000"], [],
+        attempt_timeout=5, sla_budget=0.1, hedge_default_delay=0.05
+    )
+    monkeypatch.setattr(OpenRouterAdapter, "generate", fake_generate({"or-hung-key-000000000": (5, VALID_JSON)}))
+
+    raw = await service.generate_match("prompt", "python developer", "python role")
+
+    assert raw["provider"] == "local-fallback"
+    assert raw["json"]["provider"] == "local-fallback"
+
+
+def test_breaker_opens_after_repeated_failures_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(clock=lambda: now[0])
+
+    for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+        breaker.record_failure(status=503)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.acquire()
+
+    now[0] += CircuitBreaker.BASE_COOLDOWN * (1 + CircuitBreaker.JITTER) + 1
+    assert breaker.acquire()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.acquire()
+
+    breaker.record_success(0.4)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.ewma_latency == 0.4
+
+
+def test_breaker_trips_immediately_on_revoked_key():
+    breaker = CircuitBreaker(clock=lambda: 0.0)
+    breaker.record_failure(status=401)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()["last_status"] == 401
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_key_is_not_attempted(monkeypatch):
+    service = make_llm_service(
+        monkeypatch, ["or-dead-key-000000000", "or-live-key-000000000"], [],
+        attempt_timeout=5, sla_budget=5, hedge_default_delay=3
+    )
+    ProviderSelector.breaker("openrouter", "or-dead-key-000000000").record_failure(status=429)
+    generate = AsyncMock(return_value=VALID_JSON)
+    monkeypatch.setattr(OpenRouterAdapter, "generate", generate)
+
+    raw = await service.generate_match("prompt", "resume", "job")
+
+    assert raw["provider"] == "openrouter"
+    assert service.plan_attempts() == [("openrouter", "or-live-key-000000000")]
+    assert generate.await_count == 1
+
+
+def test_hedge_delay_without_samples_uses_default(monkeypatch):
+    service = make_llm_service(
+        monkeypatch, [], [], hedge_min_samples=0, hedge_min_delay=0.5, hedge_default_delay=2
+    )
+
+    assert service.hedge_delay("openrouter") == 2
+
+    service.latency.record("openrouter", 0.1)
+    assert service.hedge_delay("openrouter") == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_half_open_slot(monkeypatch):
+    service = make_llm_service(monkeypatch, ["or-probe-key-00000000"], [], attempt_timeout=5)
+    breaker = ProviderSelector.breaker("openrouter", "or-probe-key-00000000")
+    breaker.state = CircuitBreaker.HALF_OPEN
+    monkeypatch.setattr(OpenRouterAdapter, "generate", fake_generate({"or-probe-key-00000000": (5, VALID_JSON)}))
+
+    task = asyncio.create_task(service.attempt("openrouter", "or-probe-key-00000000", "prompt"))
+    await asyncio.sleep(0.01)
+    assert breaker.trial_in_flight
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.trial_in_flight
+    assert breaker.successes == 0 and breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedge_does_not_release_another_attempts_probe(monkeypatch):
+    service = make_llm_service(monkeypatch, ["or-shared-key-0000000"], [], attempt_timeout=5)
+    breaker = ProviderSelector.breaker("openrouter", "or-shared-key-0000000")
+    monkeypatch.setattr(OpenRouterAdapter, "generate", fake_generate({"or-shared-key-0000000": (5, VALID_JSON)}))
+
+    task = asyncio.create_task(service.attempt("openrouter", "or-shared-key-0000000", "prompt"))
+    await asyncio.sleep(0.01)
+    # The key trips and half-opens while the closed-state attempt is still running
+    breaker.state = CircuitBreaker.HALF_OPEN
+    assert breaker.acquire()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert breaker.trial_in_flight
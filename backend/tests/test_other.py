@@ -7,6 +7,26 @@ from app.services.matching_strategy import LLMMatchingStrategy
 from app.services.message_service import MessageService
 from bson import ObjectId
 from datetime import datetime
+from pymongo.errors import OperationFailure, BulkWriteError
+from app.repository import index_registry
+from app.repository.index_registry import IndexRegistry
+from app import database
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from app.repository.job_repository import JobRepository
+from app.schemas.job_schema import FilterRequest
+from app.utils.mongo import sanitize_document, expose_document
+from app.utils.response import api_response
+import json
+from collections import defaultdict
+from app.utils.pagination import encode_cursor, decode_cursor
+from starlette.testclient import TestClient
+from app.main import app
+from app.repository.message_repository import MessageRepository
+from app.repository.conversation_repository import ConversationRepository
+from app.repository.user_repository import UserRepository
+from app.services.connection_registry import ConnectionRegistry
+from app.services.message_backplane import MessageEvents, InProcessBackplane
 
 
 @pytest.mark.asyncio
@@ -465,10 +485,16 @@ async def test_get_top_candidates(client, monkeypatch):
     monkeypatch.setattr(
         JobService,
         "get_top_candidates",
-        AsyncMock(return_value=[
-            {"jobseeker_id": "user1", "score": 95},
-            {"jobseeker_id": "user2", "score": 88}
-        ])
+        AsyncMock(return_value={
+            "candidates": [
+                {"jobseeker_id": "user1", "match_result": {"score": 95}},
+                {"jobseeker_id": "user2", "match_result": {"score": 88}}
+            ],
+            "total": 5,
+            "scored": 2,
+            "histogram": [{"min": 80, "max": 90, "count": 1}, {"min": 90, "max": 100, "count": 1}],
+            "summary": {"mean": 91.5, "min": 88, "max": 95, "p50": 88, "p75": 95, "p90": 95, "p99": 95}
+        })
     )
 
     response = await client.get("/jobs/job123/top-candidates")
@@ -476,4 +502,464 @@ async def test_get_top_candidates(client, monkeypatch):
     assert response.status_code == 200
     json_data = response.json()
     assert json_data["message"] == "Top candidates retrieved"
-    assert len(json_data["data"]) == 2
\ No newline at end of file
+    data = json_data["data"]
+    assert set(data) == {"candidates", "total", "scored", "histogram", "summary"}
+    assert len(data["candidates"]) == 2
+    assert data["total"] == 5
+    assert data["summary"]["mean"] == 91.5
+
+
+class FakeCollection:
+    def __init__(self, stats=None, fail=()):
+        self.stats = stats or []
+        self.fail = fail
+        self.created = []
+
+    async def create_indexes(self, indexes):
+        name = indexes[0].document["name"]
+        if name in self.fail:
+            raise OperationFailure("Index with name already exists with different options", 85)
+        self.created.append(name)
+
+    def aggregate(self, pipeline):
+        cursor = Mock()
+        cursor.to_list = AsyncMock(return_value=self.stats)
+        return cursor
+
+
+@pytest.mark.asyncio
+async def test_index_registry_apply_continues_past_conflicts(monkeypatch):
+    collections = {name: FakeCollection() for name in IndexRegistry.INDEXES}
+    collections["users"].fail = ("users_email_unique",)
+    monkeypatch.setattr(index_registry, "get_database", AsyncMock(return_value=collections))
+
+    result = await IndexRegistry.apply()
+
+    assert result["failed"] == ["users.users_email_unique"]
+    assert "jobs.jobs_text_search" in result["ensured"]
+    assert collections["users"].created == ["users_role"]
+
+
+@pytest.mark.asyncio
+async def test_index_registry_report(monkeypatch):
+    collections = {name: FakeCollection() for name in IndexRegistry.INDEXES}
+    collections["users"].stats = [
+        {"name": "_id_", "accesses": {"ops": 0}},
+        {"name": "users_email_unique", "accesses": {"ops": 12}},
+        {"name": "email_1", "accesses": {"ops": 0}},
+    ]
+    monkeypatch.setattr(index_registry, "get_database", AsyncMock(return_value=collections))
+
+    report = await IndexRegistry.report()
+
+    assert report["users"] == {"missing": ["users_role"], "undeclared": ["email_1"], "unused": ["email_1"]}
+
+
+def test_sanitize_document_converts_nested_values():
+    oid, created = ObjectId(), datetime(2024, 3, 1, 9, 30)
+    doc = {"_id": oid, "created_at": created, "notes": [{"_id": oid, "ids": [oid]}], "meta": {"at": created}}
+
+    assert sanitize_document(doc) == {
+        "created_at": created.isoformat(),
+        "notes": [{"ids": [str(oid)], "id": str(oid)}],
+        "meta": {"at": created.isoformat()},
+        "id": str(oid)
+    }
+
+
+def test_api_response_encodes_bson_values_like_sanitize_document():
+    oid, created = ObjectId(), datetime(2024, 3, 1, 9, 30, 15, 250)
+    doc = {"_id": oid, "job_id": oid, "created_at": created, "notes": [{"_id": oid, "at": created}]}
+    expected = sanitize_document(doc)
+
+    response = api_response(200, "ok", expose_document(doc))
+
+    assert json.loads(response.body) == {"message": "ok", "data": expected}
+    assert doc["_id"] == oid and doc["notes"][0]["_id"] == oid
+
+
+def test_expose_document_copies_only_what_it_renames():
+    oid = ObjectId()
+    skills, meta = ["python"], {"at": datetime(2024, 3, 1)}
+    doc = {"_id": oid, "skills": skills, "meta": meta, "notes": [{"_id": oid}]}
+
+    exposed = expose_document(doc)
+
+    assert exposed == {"id": oid, "skills": skills, "meta": meta, "notes": [{"id": oid}]}
+    assert exposed["skills"] is skills and exposed["meta"] is meta
+    assert doc["notes"][0] == {"_id": oid}
+
+
+def test_max_staleness_below_minimum_is_raised_with_a_warning(capsys):
+    assert database.max_staleness_seconds(120) == 120
+    assert capsys.readouterr().out == ""
+
+    assert database.max_staleness_seconds(30) == 90
+    assert "MONGO_MAX_STALENESS_SECONDS=30" in capsys.readouterr().out
+
+
+def test_client_options_skip_unavailable_compressors(monkeypatch):
+    monkeypatch.setattr(database, "COMPRESSOR_MODULES", {"zstd": "module_that_is_not_installed", "snappy": "json", "zlib": None})
+
+    assert database.available_compressors("zstd,snappy,zlib,lz4") == ["snappy", "zlib"]
+    assert database.client_options()["compressors"] == "snappy,zlib"
+
+
+@pytest.mark.asyncio
+async def test_connect_database_warms_pool(monkeypatch):
+    db = Mock()
+    db.command = AsyncMock(return_value={"ok": 1})
+    monkeypatch.setattr(database, "get_database", AsyncMock(return_value=db))
+    monkeypatch.setattr(database, "MIN_POOL_SIZE", 4)
+
+    await database.connect_database()
+
+    assert db.command.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_stale_ok_reads_route_to_secondaries(monkeypatch):
+    db = AsyncIOMotorClient("mongodb://localhost:1", connect=False)["matchwise"]
+    monkeypatch.setattr(database, "get_database", AsyncMock(return_value=db))
+
+    primary = await database.get_collection("jobs")
+    stale = await database.get_collection("jobs", stale_ok=True)
+
+    assert primary.read_preference.mode == ReadPreference.PRIMARY.mode
+    assert stale.read_preference.mongos_mode == "secondaryPreferred"
+    assert stale.read_preference.max_staleness == database.MAX_STALENESS_SECONDS
+
+    monkeypatch.setattr(database, "STALE_READS_ENABLED", False)
+    assert (await database.get_collection("jobs", stale_ok=True)).read_preference.mode == ReadPreference.PRIMARY.mode
+
+
+@pytest.mark.asyncio
+async def test_search_jobs_reads_from_secondaries(monkeypatch):
+    find = AsyncMock(return_value=[])
+    monkeypatch.setattr(JobRepository, "find_with_filters", find)
+
+    await JobService.search_jobs(FilterRequest(title="Backend"))
+
+    assert find.await_args.kwargs["stale_ok"] is True
+
+
+class FakeSocket:
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    async def send_text(self, payload):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(json.loads(payload))
+
+
+@pytest.fixture
+def realtime(monkeypatch):
+    monkeypatch.setattr(ConnectionRegistry, "_connections", defaultdict(set))
+    monkeypatch.setattr(MessageEvents, "_backplane", InProcessBackplane())
+    return ConnectionRegistry
+
+
+@pytest.mark.asyncio
+async def test_send_message_pushes_to_both_participants(realtime, monkeypatch):
+    monkeypatch.setattr(MessageRepository, "insert_one", AsyncMock(return_value=ObjectId()))
+    monkeypatch.setattr(ConversationRepository, "record", AsyncMock())
+    sender, receiver, other = FakeSocket(), FakeSocket(), FakeSocket()
+    realtime.connect("user1", sender)
+    realtime.connect("user2", receiver)
+    realtime.connect("user3", other)
+
+    saved = await MessageService.send_message({"sender_id": "user1", "receiver_id": "user2", "content": "Hi"})
+    await MessageEvents.stop()
+
+    assert receiver.sent == [{"type": "message", "message": json.loads(json.dumps(saved, default=str))}]
+    assert sender.sent[0]["message"]["id"] == saved["id"]
+    assert other.sent == []
+
+
+@pytest.mark.asyncio
+async def test_mark_read_sends_receipt_only_when_messages_change(realtime, monkeypatch):
+    update = AsyncMock(return_value={"modified_count": 2, "matched_count": 2})
+    monkeypatch.setattr(MessageRepository, "update_many", update)
+    monkeypatch.setattr(ConversationRepository, "mark_read", AsyncMock())
+    sender = FakeSocket()
+    realtime.connect("user1", sender)
+
+    await MessageService.mark_messages_as_read("user1", "user2")
+    update.return_value = {"modified_count": 0, "matched_count": 0}
+    await MessageService.mark_messages_as_read("user1", "user2")
+    await MessageEvents.stop()
+
+    assert len(sender.sent) == 1
+    assert sender.sent[0]["type"] == "read"
+    assert sender.sent[0]["receiver_id"] == "user2"
+    assert sender.sent[0]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_drops_failing_sockets(realtime):
+    healthy, broken = FakeSocket(), FakeSocket(fail=True)
+    realtime.connect("user1", healthy)
+    realtime.connect("user1", broken)
+
+    await realtime.deliver(["user1"], {"type": "ping"})
+
+    assert healthy.sent == [{"type": "ping"}]
+    assert realtime._connections["user1"] == {healthy}
+
+
+def test_message_socket_answers_ping(realtime):
+    with TestClient(app).websocket_connect("/messages/ws?user_id=user9") as ws:
+        assert realtime.is_connected("user9")
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+    assert not realtime.is_connected("user9")
+
+
+def test_message_socket_rejects_malformed_frames(realtime):
+    with TestClient(app).websocket_connect("/messages/ws?user_id=user9") as ws:
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json([1, 2])
+        assert ws.receive_json()["type"] == "error"
+        ws.send_bytes(b"\x00")
+        assert ws.receive_json()["type"] == "error"
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+@pytest.mark.asyncio
+async def test_send_message_updates_conversation_summary(monkeypatch):
+    monkeypatch.setattr(MessageRepository, "insert_one", AsyncMock(return_value=ObjectId()))
+    monkeypatch.setattr(MessageEvents, "publish", AsyncMock())
+    conversations = Mock()
+    conversations.update_one = AsyncMock()
+    monkeypatch.setattr("app.repository.conversation_repository.get_database", AsyncMock(return_value=Mock(conversations=conversations)))
+
+    await MessageService.send_message({"sender_id": "u2", "receiver_id": "u1", "content": "Hi"})
+
+    query, update = conversations.update_one.await_args.args
+    assert query == {"_id": "u1:u2"}
+    assert update["$set"]["participants"] == ["u1", "u2"]
+    assert update["$set"]["last_message"] == "Hi"
+    assert update["$inc"] == {"unread.u1": 1, "unread.u2": 0}
+    assert conversations.update_one.await_args.kwargs["upsert"] is True
+
+
+@pytest.mark.asyncio
+async def test_mark_read_decrements_unread_counter(monkeypatch):
+    monkeypatch.setattr(MessageRepository, "update_many", AsyncMock(return_value={"modified_count": 3, "matched_count": 3}))
+    monkeypatch.setattr(MessageEvents, "publish", AsyncMock())
+    mark_read = AsyncMock()
+    monkeypatch.setattr(ConversationRepository, "mark_read", mark_read)
+
+    await MessageService.mark_messages_as_read("sender1", "reader1")
+
+    mark_read.assert_awaited_once_with("reader1", "sender1", 3)
+
+
+@pytest.mark.asyncio
+async def test_mark_read_survives_a_summary_failure(monkeypatch):
+    monkeypatch.setattr(MessageRepository, "update_many", AsyncMock(return_value={"modified_count": 2, "matched_count": 2}))
+    publish = AsyncMock()
+    monkeypatch.setattr(MessageEvents, "publish", publish)
+    monkeypatch.setattr(ConversationRepository, "mark_read", AsyncMock(side_effect=RuntimeError("down")))
+
+    result = await MessageService.mark_messages_as_read("sender1", "reader1")
+
+    assert result["modified_count"] == 2
+    publish.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_recruiter_inbox_reads_conversation_summaries(monkeypatch):
+    seeker_id, recruiter_id = str(ObjectId()), str(ObjectId())
+    monkeypatch.setattr(ConversationRepository, "find_for_user", AsyncMock(return_value=[{
+        "_id": ConversationRepository.conversation_id(seeker_id, recruiter_id),
+        "participants": sorted([seeker_id, recruiter_id]),
+        "last_message": "See you Monday",
+        "last_message_at": datetime(2024, 5, 1, 9, 30),
+        "unread": {recruiter_id: 2, seeker_id: 0}
+    }]))
+    find_users = AsyncMock(return_value=[{"_id": ObjectId(seeker_id), "name": "Ada", "role": "jobseeker"}])
+    monkeypatch.setattr(UserRepository, "find_by_ids", find_users)
+
+    inbox = await MessageService.get_conversations_for_recruiter(recruiter_id)
+
+    assert find_users.await_args.args[0] == [seeker_id]
+    assert inbox == [{
+        "id": seeker_id,
+        "participantName": "Ada",
+        "lastMessage": "See you Monday",
+        "timestamp": "2024-05-01T09:30:00",
+        "unread": True,
+        "unreadCount": 2,
+        "jobTitle": "Job Seeker",
+        "avatarColor": MessageService.avatar_color(seeker_id)
+    }]
+
+
+def test_cli_rebuilds_conversations(monkeypatch):
+    from app import cli
+    rebuild = AsyncMock(return_value=4)
+    monkeypatch.setattr(ConversationRepository, "rebuild", rebuild)
+    monkeypatch.setattr(cli, "close_database", AsyncMock())
+
+    assert cli.main(["rebuild-conversations"]) == 0
+    rebuild.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_mark_read_floors_unread_counter_at_zero(monkeypatch):
+    conversations = Mock()
+    conversations.find_one_and_update = AsyncMock()
+    monkeypatch.setattr("app.repository.conversation_repository.get_database", AsyncMock(return_value=Mock(conversations=conversations)))
+
+    await ConversationRepository.mark_read("u2", "u1", 3)
+
+    query, update = conversations.find_one_and_update.await_args.args
+    assert query == {"_id": "u1:u2"}
+    merged = update[0]["$set"]["unread"]["$mergeObjects"]
+    entry = merged[1]["$arrayToObject"][0][0]
+    assert entry["k"] == "u2"
+    assert entry["v"]["$max"][0] == 0
+    assert entry["v"]["$max"][1]["$subtract"][1] == 3
+
+
+@pytest.mark.asyncio
+async def test_conversations_backfilled_only_when_empty(monkeypatch):
+    rebuild = AsyncMock(return_value=2)
+    monkeypatch.setattr(ConversationRepository, "rebuild", rebuild)
+
+    monkeypatch.setattr(ConversationRepository, "is_empty", AsyncMock(return_value=False))
+    await MessageService.ensure_conversations()
+    rebuild.assert_not_awaited()
+
+    monkeypatch.setattr(ConversationRepository, "is_empty", AsyncMock(return_value=True))
+    await MessageService.ensure_conversations()
+    rebuild.assert_awaited_once()
+
+
+def conversation_docs(count):
+    start = datetime(2024, 5, 1)
+    return [
+        {"_id": ObjectId(), "sender_id": "u1", "receiver_id": "u2", "content": f"m{i}", "created_at": start.replace(minute=i)}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_conversation_latest_page_is_chronological(monkeypatch):
+    docs = conversation_docs(4)
+    find = AsyncMock(return_value=list(reversed(docs)))
+    monkeypatch.setattr(MessageRepository, "find_conversation", find)
+
+    page = await MessageService.get_conversation("u1", "u2", limit=3)
+
+    assert find.await_args.args == ("u1", "u2", 4, None, None)
+    assert [m["content"] for m in page] == ["m1", "m2", "m3"]
+    assert decode_cursor(page.prev_cursor) == (docs[1]["created_at"], docs[1]["_id"])
+    assert decode_cursor(page.next_cursor) == (docs[3]["created_at"], docs[3]["_id"])
+
+
+@pytest.mark.asyncio
+async def test_conversation_without_cursor_returns_full_history(monkeypatch):
+    docs = conversation_docs(60)
+    find = AsyncMock(return_value=list(reversed(docs)))
+    monkeypatch.setattr(MessageRepository, "find_conversation", find)
+
+    page = await MessageService.get_conversation("u1", "u2")
+
+    assert find.await_args.args == ("u1", "u2", 0, None, None)
+    assert [m["content"] for m in page] == [d["content"] for d in docs]
+    assert page.prev_cursor is None
+    assert decode_cursor(page.next_cursor)[1] == docs[-1]["_id"]
+
+
+@pytest.mark.asyncio
+async def test_conversation_delta_returns_only_newer_messages(monkeypatch):
+    docs = conversation_docs(2)
+    since = encode_cursor(datetime(2024, 4, 30), ObjectId())
+    find = AsyncMock(return_value=docs)
+    monkeypatch.setattr(MessageRepository, "find_conversation", find)
+
+    page = await MessageService.get_conversation("u1", "u2", limit=10, after=since)
+
+    assert find.await_args.args == ("u1", "u2", 11, None, since)
+    assert [m["content"] for m in page] == ["m0", "m1"]
+    assert page.prev_cursor is None
+    assert decode_cursor(page.next_cursor)[1] == docs[1]["_id"]
+
+    find.return_value = []
+    assert (await MessageService.get_conversation("u1", "u2", after=since)).next_cursor == since
+
+
+@pytest.mark.asyncio
+async def test_conversation_endpoint_pages_with_headers(client, monkeypatch):
+    monkeypatch.setattr(MessageRepository, "find_conversation", AsyncMock(return_value=list(reversed(conversation_docs(3)))))
+
+    response = await client.get("/messages/u1/u2?limit=2")
+
+    assert response.status_code == 200
+    assert [m["content"] for m in response.json()["data"]] == ["m1", "m2"]
+    assert response.headers["X-Prev-Cursor"]
+    assert response.headers["X-Next-Cursor"]
+
+    both = await client.get(f"/messages/u1/u2?before={response.headers['X-Prev-Cursor']}&after={response.headers['X-Next-Cursor']}")
+    assert both.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_send_bulk_renders_template_and_inserts_unordered(monkeypatch):
+    messages = Mock()
+    messages.insert_many = AsyncMock(side_effect=BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "document too large"}]}))
+    monkeypatch.setattr("app.repository.message_repository.get_database", AsyncMock(return_value=Mock(messages=messages)))
+    record_many = AsyncMock(return_value=0)
+    monkeypatch.setattr(ConversationRepository, "record_many", record_many)
+    publish = AsyncMock()
+    monkeypatch.setattr(MessageEvents, "publish", publish)
+
+    outcome = await MessageService.send_bulk({
+        "sender_id": "r1",
+        "content": "Hi $name, thanks for applying",
+        "recipients": [
+            {"receiver_id": "u1", "variables": {"name": "Ada"}},
+            {"receiver_id": "u2", "variables": {"name": "Grace"}},
+            {"receiver_id": "u3", "variables": {}},
+            {"receiver_id": "u4", "variables": {"name": "Linus"}}
+        ]
+    })
+
+    inserted = messages.insert_many.await_args.args[0]
+    assert messages.insert_many.await_args.kwargs["ordered"] is False
+    assert [m["content"] for m in inserted] == ["Hi Ada, thanks for applying", "Hi Grace, thanks for applying", "Hi Linus, thanks for applying"]
+    assert outcome["sent"] == 2 and outcome["failed"] == 2
+    assert [r["status"] for r in outcome["results"]] == ["sent", "failed", "failed", "sent"]
+    assert outcome["results"][1]["error"] == "document too large"
+    assert "name" in outcome["results"][2]["error"]
+    assert outcome["results"][3]["message_id"] == str(inserted[2]["_id"])
+    assert [m["receiver_id"] for m in record_many.await_args.args[0]] == ["u1", "u4"]
+    assert publish.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_reports_partial_failure(client, monkeypatch):
+    outcome = {"sent": 1, "failed": 1, "results": [
+        {"receiver_id": "u1", "status": "sent", "message_id": "m1"},
+        {"receiver_id": "u2", "status": "failed", "error": "Template error: 'name'"}
+    ]}
+    send_bulk = AsyncMock(return_value=outcome)
+    monkeypatch.setattr(MessageService, "send_bulk", send_bulk)
+    payload = {"sender_id": "r1", "content": "Hi $name", "recipients": [{"receiver_id": "u1", "variables": {"name": "Ada"}}, {"receiver_id": "u2"}]}
+
+    response = await client.post("/messages/bulk", json=payload)
+    assert response.status_code == 207
+    assert response.json()["data"] == outcome
+
+    send_bulk.return_value = {"sent": 2, "failed": 0, "results": []}
+    assert (await client.post("/messages/bulk", json=payload)).status_code == 201
+
+    send_bulk.side_effect = ValueError("At most 200 recipients per request")
+    assert (await client.post("/messages/bulk", json=payload)).status_code == 400
@@ -23,10 +23,14 @@ export const API_ENDPOINTS = {
     `${API_BASE_URL}/applications/${id}/`,
   GET_APPLICATIONS_BY_JOBSEEKER: (id: string) =>
     `${API_BASE_URL}/applications/jobseeker/${id}/`,
+  GET_MATCH_STATUS: (id: string) =>
+    `${API_BASE_URL}/applications/${id}/match-status/`,
   UPDATE_APPLICATION_STATUS: (id: string) =>
     `${API_BASE_URL}/applications/${id}/`,
   GET_RESUME: (fileId: string) =>
     `${API_BASE_URL}/applications/resume/${fileId}/`,
+  GET_APPLICATION_RESUME: (id: string) =>
+    `${API_BASE_URL}/applications/${id}/resume/`,
 
   GET_JOBSEEKER_PROFILE: (id: string) =>
     `${API_BASE_URL}/jobseekers/${id}`,
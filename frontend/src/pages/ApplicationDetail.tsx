@@ -230,7 +230,7 @@ const ApplicationDetail = () => {
     if (!application) return
     
     try {
-      const response = await apiRequest(API_ENDPOINTS.GET_RESUME(application.resume_file_id))
+      const response = await apiRequest(API_ENDPOINTS.GET_APPLICATION_RESUME(applicationId!))
       if (response.ok) {
         const blob = await response.blob()
         const url = window.URL.createObjectURL(blob)
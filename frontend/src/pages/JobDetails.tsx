@@ -44,7 +44,7 @@ const JobDetails = () => {
       }
       
       if (candidatesResponse.ok && candidatesData.data) {
-        setApplicationsCount(candidatesData.data.length)
+        setApplicationsCount(candidatesData.data.total ?? 0)
       }
     } catch (error) {
       console.error('Failed to fetch job details:', error)
@@ -25,6 +25,7 @@ interface Job {
 }
 
 interface MatchResult {
+  status?: 'pending' | 'completed' | 'failed'
   score: number
   matched_skills?: string[]
   missing_skills?: string[]
@@ -121,6 +122,20 @@ const JobSeekerJobDetail = () => {
     }
   }
 
+  const waitForMatchResult = async (id: string): Promise<MatchResult | null> => {
+    for (let attempt = 0; attempt < 60; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 2000))
+      const response = await apiRequest(API_ENDPOINTS.GET_MATCH_STATUS(id))
+      if (!response.ok) continue
+
+      const data = await response.json()
+      const status = data.data?.status
+      if (status === 'completed') return data.data.match_result
+      if (status === 'failed') return null
+    }
+    return null
+  }
+
   const handleAnalyzeResume = async () => {
     if (!resumeFile) {
       setError('Please upload a resume first')
@@ -163,10 +178,18 @@ const JobSeekerJobDetail = () => {
         setApplicationId(applicationData.id || applicationData._id)
         setExistingApplicationStatus('PENDING')
 
-        if (applicationData.match_result) {
-          setMatchResult(applicationData.match_result)
+        let result = applicationData.match_result
+        if (result?.status === 'pending') {
+          result = await waitForMatchResult(applicationData.id || applicationData._id)
+        }
+
+        if (!result) {
+          setError('Resume analysis is taking longer than expected. Check your applications later.')
+          setStage('upload')
+          return
         }
 
+        setMatchResult(result)
         setStage('result')
       } else {
         let errorMessage = 'Failed to analyze resume'
@@ -53,15 +53,12 @@ const RecruiterDashboard = () => {
               const candidatesData = await candidatesRes.json()
               
               if (candidatesRes.ok && candidatesData.data) {
-                const applications = candidatesData.data
-                const avgScore = applications.length > 0
-                  ? applications.reduce((sum: number, app: any) => sum + (app.match_result?.score || 0), 0) / applications.length
-                  : 0
+                const ranking = candidatesData.data
                 
                 return {
                   ...job,
-                  applications_count: applications.length,
-                  avgMatchScore: avgScore
+                  applications_count: ranking.total ?? 0,
+                  avgMatchScore: ranking.summary?.mean ?? 0
                 }
               }
             } catch {
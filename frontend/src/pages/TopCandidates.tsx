@@ -79,7 +79,7 @@ const TopCandidates = () => {
       }
 
       if (candidatesResponse.ok && candidatesData.data) {
-        const candidatesList = candidatesData.data
+        const candidatesList = candidatesData.data.candidates ?? []
 
         const candidatesWithJobseekerInfo = await Promise.all(
           candidatesList.map(async (candidate: Candidate) => {
@@ -164,15 +164,15 @@ const TopCandidates = () => {
     navigate(`/recruiter/applications/${candidateId}`)
   }
 
-  const handleDownloadResume = async (fileId: string) => {
+  const handleDownloadResume = async (candidateId: string) => {
   try {
-    const response = await apiRequest(API_ENDPOINTS.GET_RESUME(fileId))
+    const response = await apiRequest(API_ENDPOINTS.GET_APPLICATION_RESUME(candidateId))
     if (response.ok) {
       const blob = await response.blob()
       const url = window.URL.createObjectURL(blob)
       const a = document.createElement('a')
       a.href = url
-      a.download = `resume_${fileId}.pdf`
+      a.download = `resume_${candidateId}.pdf`
       a.click()
       window.URL.revokeObjectURL(url)
     }
@@ -325,7 +325,7 @@ const TopCandidates = () => {
                 </button>
                 <button
                   className={styles.btnSecondary}
-                  onClick={() => handleDownloadResume(candidate.resume_file_id)}
+                  onClick={() => handleDownloadResume(candidate.id)}
                 >
                   Download Resume
                 </button>
@@ -41,7 +41,7 @@ const ViewJobs = () => {
             const candidatesRes = await apiRequest(API_ENDPOINTS.GET_TOP_CANDIDATES(job.id))
             const candidatesData = await candidatesRes.json()
             if (candidatesRes.ok && candidatesData.data) {
-              counts[job.id] = candidatesData.data.length
+              counts[job.id] = candidatesData.data.total ?? 0
             }
           } catch {
             counts[job.id] = 0